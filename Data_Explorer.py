@@ -1,14 +1,31 @@
 import streamlit as st
-import streamlit.components.v1 as components
-import tempfile, os
+import copy
+import os
 import json
+# Before polars: out-of-core mode sets the streaming engine's memory budget.
+import out_of_core
 import polars as pl
+import time
 import datetime
-import math
-import html
+from prediction_store import attach_predictions, predictions_paths
+from query_engine import COLLECT_OPTIONS, DISPLAY_COLUMNS, ROW_DATA_COLUMNS, ROW_ID_COLUMN, apply_filters_and_sort, PageCursors, scan_source
+from similar_projects import StaleIndexError, fetch_rows, index_path as similar_index_path, load_index as load_similarity_index
+from query_runner import QuerySuperseded, collect_latest, next_query_generation
+from query_scheduler import INTERACTIVE, QUERY_TIMEOUT_SECONDS, scheduler as query_scheduler
+from query_service import QueryServiceClient
+from query_backends import PolarsBackend, load_backend
+from project_index import load_project_index
+from client_snapshot import encode_snapshot, snapshot_query
+from resident_store import load_resident
+from explorer_config import build_filter_config, declare_html_component, load_filter_config
+from export import EXPORT_FORMATS, start_export
+from instrumentation import RerunProfile
+from olap_cube import CUBE_PATH, DIMENSIONS as CUBE_DIMENSIONS, TIME_DIMENSIONS as CUBE_TIME_DIMENSIONS, explorer_slices, load_cube
 
 PAGE_SIZE = 10
 
+rerun_profile = RerunProfile()
+
 st.set_page_config(
     layout="wide",
     page_icon="📊",
@@ -31,11 +48,7 @@ st.markdown(
 )
 
 def generate_component(name, template="", script=""):
-    dir = f"{tempfile.gettempdir()}/{name}"
-    if not os.path.isdir(dir): os.mkdir(dir)
-    fname = f'{dir}/index.html'
-    with open(fname, 'w') as f:
-        f.write(f"""
+    page_html = f"""
             <!DOCTYPE html>
             <html lang="en">
             <head>
@@ -84,118 +97,121 @@ def generate_component(name, template="", script=""):
                 {script}
             </script>
             </html>
-        """)
-
-    _component_func = components.declare_component(name, path=str(dir))
+        """
+    _component_func = declare_html_component(name, page_html)
 
     def component_wrapper(component_data, key=None, default=None):
         component_value = _component_func(component_data=component_data, key=key, default=default)
         return component_value
     return component_wrapper
 
-parquet_source_path = "data.parquet"
+# Either a parquet file/directory or an uncompressed Arrow IPC/Feather file
+# (.arrow/.feather/.ipc), which is memory-mapped instead of decompressed.
+parquet_source_path = os.environ.get("EXPLORER_DATA_PATH", "data.parquet")
+# When set, queries go to a shared `query_service.py` process over this Unix socket.
+query_socket_path = os.environ.get("EXPLORER_QUERY_SOCKET")
+# 'polars' (default), 'duckdb' or 'sqlite'; see `query_backends.py`.
+query_backend_name = os.environ.get("EXPLORER_QUERY_BACKEND", "polars").lower()
 filter_metadata_path = "filter_metadata.json"
 
-filter_options = {
-    'categories': ['All Categories'],
-    'countries': ['All Countries'],
-    'states': ['All States'],
-    'date_ranges': [
-        'All Time', 'Last Month', 'Last 6 Months', 'Last Year',
-        'Last 5 Years', 'Last 10 Years'
-    ]
-}
-category_subcategory_map = {'All Categories': ['All Subcategories']}
-min_max_values = {
-    'pledged': {'min': 0, 'max': 1000},
-    'goal': {'min': 0, 'max': 10000},
-    'raised': {'min': 0, 'max': 500}
-}
-
 if not os.path.exists(filter_metadata_path):
     st.error(f"Filter metadata file not found at '{filter_metadata_path}'. Please run `database_download.py` first.")
     st.stop()
-else:
-    try:
-        with open(filter_metadata_path, 'r', encoding='utf-8') as f:
-            loaded_metadata = json.load(f)
-
-        filter_options['categories'] = loaded_metadata.get('categories') or ['All Categories']
-        filter_options['countries'] = loaded_metadata.get('countries') or ['All Countries']
-        filter_options['states'] = loaded_metadata.get('states') or ['All States']
-        filter_options['date_ranges'] = loaded_metadata.get('date_ranges', filter_options['date_ranges'])
-
-        category_subcategory_map = loaded_metadata.get('category_subcategory_map', {'All Categories': ['All Subcategories']})
-        if 'All Categories' not in category_subcategory_map:
-            category_subcategory_map['All Categories'] = ['All Subcategories']
-        if category_subcategory_map['All Categories'] and 'All Subcategories' not in category_subcategory_map['All Categories']:
-             category_subcategory_map['All Categories'].insert(0, 'All Subcategories')
-
-        all_subs = set(loaded_metadata.get('subcategories', ['All Subcategories']))
-        all_cats_subs = set(category_subcategory_map.get('All Categories', []))
-        missing_subs = all_subs - all_cats_subs
-        if missing_subs:
-             category_subcategory_map['All Categories'].extend(sorted(list(missing_subs)))
-             category_subcategory_map['All Categories'] = sorted(list(set(category_subcategory_map['All Categories'])), key=lambda x: (x != 'All Subcategories', x))
-
-        loaded_min_max = loaded_metadata.get('min_max_values', {})
-        min_max_values['pledged'] = loaded_min_max.get('pledged', min_max_values['pledged'])
-        min_max_values['goal'] = loaded_min_max.get('goal', min_max_values['goal'])
-        min_max_values['raised'] = loaded_min_max.get('raised', min_max_values['raised'])
-
-    except json.JSONDecodeError:
-        st.error(f"Error decoding JSON from '{filter_metadata_path}'. File might be corrupted. Using default filters.")
-    except Exception as e:
-        st.error(f"Error loading filter metadata from '{filter_metadata_path}': {e}. Using default filters.")
-
-min_pledged = min_max_values['pledged']['min']
-max_pledged = min_max_values['pledged']['max']
-min_goal = min_max_values['goal']['min']
-max_goal = min_max_values['goal']['max']
-min_raised = min_max_values['raised']['min']
-max_raised = min_max_values['raised']['max']
-
-DEFAULT_FILTERS = {
-    'search': '',
-    'categories': ['All Categories'],
-    'subcategories': ['All Subcategories'],
-    'countries': ['All Countries'],
-    'states': ['All States'],
-    'date': 'All Time',
-    'ranges': {
-        'pledged': {'min': min_pledged, 'max': max_pledged},
-        'goal': {'min': min_goal, 'max': max_goal},
-        'raised': {'min': min_raised, 'max': max_raised}
-    }
-}
+
+predictions_available = os.path.exists(predictions_paths(parquet_source_path)[0])
+similarity_enabled = os.path.exists(similar_index_path(parquet_source_path))
+cube_path = os.environ.get("EXPLORER_CUBE_PATH", CUBE_PATH)
+export_dir = os.environ.get("EXPLORER_EXPORT_DIR") or None
+profile_log_enabled = os.environ.get("EXPLORER_PROFILE_LOG", "").lower() in ("1", "true", "yes")
+metrics_path = os.environ.get("EXPLORER_METRICS_PATH")
+resident_enabled = os.environ.get("EXPLORER_RESIDENT", "").lower() in ("1", "true", "yes")
+if resident_enabled and out_of_core.OUT_OF_CORE_ENABLED:
+    print("Warning: EXPLORER_RESIDENT is ignored in out-of-core mode; queries scan the source instead.")
+    resident_enabled = False
+debug_overlay_enabled = st.query_params.get("debug") == "1"
+# Results of at most this many rows are sent to the browser whole and filtered,
+# sorted and paged there until a change needs rows outside them (0 disables).
+client_side_max_rows = int(os.environ.get("EXPLORER_CLIENT_SIDE_ROWS", "2000"))
+
+try:
+    filter_config = load_filter_config(filter_metadata_path, predictions_available)
+except json.JSONDecodeError:
+    st.error(f"Error decoding JSON from '{filter_metadata_path}'. File might be corrupted. Using default filters.")
+    filter_config = build_filter_config({}, predictions_available)
+except Exception as e:
+    st.error(f"Error loading filter metadata from '{filter_metadata_path}': {e}. Using default filters.")
+    filter_config = build_filter_config({}, predictions_available)
+# Shared by every session; copied before anything is changed.
+filter_options = filter_config.filter_options
+category_subcategory_map = filter_config.category_subcategory_map
+min_max_values = filter_config.min_max_values
+DEFAULT_FILTERS = filter_config.default_filters
+
 DEFAULT_COMPONENT_STATE = {
     "page": 1,
     "filters": DEFAULT_FILTERS,
-    "sort_order": 'popularity'
+    "sort_order": 'popularity',
+    "selected_row": None
 }
 
+def component_state_json(state):
+    # The component sends whole-number range bounds as JSON ints while validated
+    # filters hold floats; compare them as floats so 0 and 0.0 are the same state.
+    # Its render timing and snapshot reports are not part of the state.
+    if isinstance(state, dict):
+        state = {key: value for key, value in state.items() if key not in ("render_timing", "snapshot_id")}
+    if isinstance(state, dict) and isinstance(state.get("filters"), dict) and isinstance(state["filters"].get("ranges"), dict):
+        ranges = {
+            key: {bound: float(value) if isinstance(value, (int, float)) else value for bound, value in range_.items()} if isinstance(range_, dict) else range_
+            for key, range_ in state["filters"]["ranges"].items()
+        }
+        state = {**state, "filters": {**state["filters"], "ranges": ranges}}
+    return json.dumps(state, sort_keys=True)
+
 if 'filters' not in st.session_state:
-    st.session_state.filters = DEFAULT_FILTERS.copy()
+    st.session_state.filters = copy.deepcopy(DEFAULT_FILTERS)
 if 'sort_order' not in st.session_state:
     st.session_state.sort_order = DEFAULT_COMPONENT_STATE['sort_order']
 if 'current_page' not in st.session_state:
     st.session_state.current_page = DEFAULT_COMPONENT_STATE['page']
+if 'selected_row' not in st.session_state:
+    st.session_state.selected_row = DEFAULT_COMPONENT_STATE['selected_row']
+if 'export_job' not in st.session_state:
+    st.session_state.export_job = None
+if 'page_cursors' not in st.session_state:
+    st.session_state.page_cursors = PageCursors()
 if 'total_rows' not in st.session_state:
     st.session_state.total_rows = 0
 if 'kickstarter_state_value' not in st.session_state:
     st.session_state.kickstarter_state_value = None
+if 'client_snapshot' not in st.session_state:
+    st.session_state.client_snapshot = None
+if 'facet_counts' not in st.session_state:
+    st.session_state.facet_counts = None
+if 'last_render_timing' not in st.session_state:
+    st.session_state.last_render_timing = None
 if 'state_sent_to_component' not in st.session_state:
-    st.session_state.state_sent_to_component = DEFAULT_COMPONENT_STATE.copy()
+    st.session_state.state_sent_to_component = copy.deepcopy(DEFAULT_COMPONENT_STATE)
 
-if 'base_lf' not in st.session_state:
+if resident_enabled:
+    # One compact frame per process, shared by every session.
+    try:
+        with rerun_profile.stage('load_source'):
+            resident_dataset = load_resident(parquet_source_path, filter_metadata_path)
+            base_lf = resident_dataset.lazy()
+    except Exception as e:
+        st.error(f"Error loading resident dataset from '{parquet_source_path}': {e}")
+        st.stop()
+elif 'base_lf' not in st.session_state:
     if not os.path.exists(parquet_source_path):
-        st.error(f"Parquet data source not found at '{parquet_source_path}'. Please ensure the file/directory exists.")
+        st.error(f"Data source not found at '{parquet_source_path}'. Please ensure the file/directory exists.")
         st.stop()
 
     try:
-        base_lf = pl.scan_parquet(parquet_source_path)
-        st.session_state.base_lf = base_lf
-        schema = st.session_state.base_lf.collect_schema()
+        with rerun_profile.stage('load_source'):
+            base_lf = attach_predictions(scan_source(parquet_source_path), parquet_source_path)
+            st.session_state.base_lf = base_lf
+            schema = st.session_state.base_lf.collect_schema()
         if len(schema) == 0:
              st.error(f"Loaded data from '{parquet_source_path}' has no columns.")
              st.stop()
@@ -208,154 +224,44 @@ if 'base_lf' not in st.session_state:
              st.stop()
 
     except Exception as e:
-        st.error(f"Error scanning Parquet or initial processing: {e}")
+        st.error(f"Error scanning data source or initial processing: {e}")
         if hasattr(e, 'context'):
             st.error(f"Context: {e.context()}")
         st.stop()
 
-def apply_filters_and_sort(lf: pl.LazyFrame, filters: dict, sort_order: str) -> pl.LazyFrame:
-    column_names = lf.collect_schema().names()
-
-    search_term = filters.get('search', '')
-    if search_term:
-        search_cols = ['Project Name', 'Creator', 'Category', 'Subcategory']
-        valid_search_cols = [col for col in search_cols if col in column_names]
-        if valid_search_cols:
-            search_expr = None
-            for col in valid_search_cols:
-                 current_expr = pl.col(col).cast(pl.Utf8).str.contains(f"(?i){search_term}")
-                 if search_expr is None:
-                     search_expr = current_expr
-                 else:
-                     search_expr = search_expr | current_expr
-            if search_expr is not None:
-                 lf = lf.filter(search_expr)
-
-    if 'Category' in column_names and filters['categories'] != ['All Categories']:
-        lf = lf.filter(pl.col('Category').is_in(filters['categories']))
-    if 'Subcategory' in column_names and filters['subcategories'] != ['All Subcategories']:
-        lf = lf.filter(pl.col('Subcategory').is_in(filters['subcategories']))
-    if 'Country' in column_names and filters['countries'] != ['All Countries']:
-        lf = lf.filter(pl.col('Country').is_in(filters['countries']))
-
-    if 'State' in column_names and filters['states'] != ['All States']:
-        lf = lf.filter(pl.col('State').cast(pl.Utf8).str.to_lowercase().is_in([s.lower() for s in filters['states']]))
-
-    ranges = filters.get('ranges', {})
-    if 'Raw Pledged' in column_names and 'pledged' in ranges:
-        min_p, max_p = ranges['pledged']['min'], ranges['pledged']['max']
-        lf = lf.filter((pl.col('Raw Pledged') >= min_p) & (pl.col('Raw Pledged') <= max_p))
-    if 'Raw Goal' in column_names and 'goal' in ranges:
-        min_g, max_g = ranges['goal']['min'], ranges['goal']['max']
-        lf = lf.filter((pl.col('Raw Goal') >= min_g) & (pl.col('Raw Goal') <= max_g))
-    if 'Raw Raised' in column_names and 'raised' in ranges:
-        min_r, max_r = ranges['raised']['min'], ranges['raised']['max']
-        lf = lf.filter((pl.col('Raw Raised') >= min_r) & (pl.col('Raw Raised') <= max_r))
-
-
-    date_filter = filters.get('date', 'All Time')
-    if date_filter != 'All Time' and 'Raw Date' in column_names:
-        now = datetime.datetime.now()
-        compare_date = None
-        if date_filter == 'Last Month':
-            compare_date = now - datetime.timedelta(days=30)
-        elif date_filter == 'Last 6 Months':
-            compare_date = now - datetime.timedelta(days=182)
-        elif date_filter == 'Last Year':
-            compare_date = now - datetime.timedelta(days=365)
-        elif date_filter == 'Last 5 Years':
-            compare_date = now - datetime.timedelta(days=5*365)
-        elif date_filter == 'Last 10 Years':
-            compare_date = now - datetime.timedelta(days=10*365)
-
-        if compare_date:
-             lf = lf.with_columns(pl.col("Raw Date").cast(pl.Datetime, strict=False).alias("Raw Date_dt"))
-             lf = lf.filter(pl.col('Raw Date_dt') >= compare_date).drop("Raw Date_dt")
-
-    sort_descending = True
-    sort_col = 'Popularity Score'
-
-    if sort_order == 'newest':
-        sort_col = 'Raw Date'
-        sort_descending = True
-    elif sort_order == 'oldest':
-        sort_col = 'Raw Date'
-        sort_descending = False
-    elif sort_order == 'mostfunded':
-        sort_col = 'Raw Pledged'
-        sort_descending = True
-    elif sort_order == 'mostbacked':
-        sort_col = 'Backer Count'
-        sort_descending = True
-    elif sort_order == 'enddate':
-        sort_col = 'Raw Deadline'
-        sort_descending = True
-
-    if sort_col in column_names:
-        lf = lf.sort(sort_col, descending=sort_descending, nulls_last=True)
-    else:
-        print(f"Warning: Sort column '{sort_col}' not found in LazyFrame.")
+# How the component renders each displayed column's cell; other columns are plain text.
+COLUMN_KINDS = {'Link': 'link', 'State': 'state'}
+TABLE_COLUMNS = [{"name": column, "kind": COLUMN_KINDS.get(column, 'text')} for column in DISPLAY_COLUMNS]
 
-    return lf
-
-def generate_table_html_for_page(df_page: pl.DataFrame):
-    visible_columns = ['Project Name', 'Creator', 'Pledged Amount', 'Link', 'Country', 'State']
-    header_html = ''.join(f'<th scope="col">{column}</th>' for column in visible_columns)
+def generate_table_rows_for_page(df_page: pl.DataFrame):
+    # Rows keyed by Row ID, with one display value per column, so the component
+    # can reuse the row nodes it already has and patch only the changed cells.
+    visible_columns = DISPLAY_COLUMNS
 
     if df_page.is_empty():
-        colspan = len(visible_columns) if visible_columns else 1
-        return header_html, f'<tr><td colspan="{colspan}">No projects match the current filters.</td></tr>'
+        return [], "No projects match the current filters."
 
-    required_data_cols = [
-        'Category', 'Subcategory', 'Raw Pledged', 'Raw Goal', 'Raw Raised',
-        'Raw Date', 'Raw Deadline', 'Backer Count', 'Popularity Score'
-    ]
-    all_needed_cols = list(set(visible_columns + required_data_cols + ['State']))
+    all_needed_cols = list(set(visible_columns + ROW_DATA_COLUMNS + [ROW_ID_COLUMN]))
 
     missing_cols = [col for col in all_needed_cols if col not in df_page.columns]
     if missing_cols:
         st.error(f"FATAL: Missing required columns in fetched data page: {missing_cols}. Check base Parquet schema and processing.")
-        colspan = len(visible_columns) if visible_columns else 1
-        header_html_error = ''.join(f'<th scope="col">{col}</th>' for col in visible_columns if col in df_page.columns)
-        return header_html_error, f'<tr><td colspan="{colspan}">Error: Missing critical data columns: {missing_cols}.</td></tr>'
-
-    rows_html = ''
+        return [], f"Error: Missing critical data columns: {missing_cols}."
 
     try:
         data_dicts = df_page.to_dicts()
     except Exception as e:
         st.error(f"Error converting page DataFrame to dictionaries: {e}")
-        return header_html, f'<tr><td colspan="{len(visible_columns)}">Error rendering rows.</td></tr>'
+        return [], "Error rendering rows."
 
+    rows = []
     for row in data_dicts:
-        state_value = row.get('State')
-        state_value_str = str(state_value) if state_value is not None else 'unknown'
-        state_class = state_value_str.lower().replace(' ', '-') if state_value_str != 'unknown' else 'unknown'
-        styled_state_html = f'<div class="state_cell state-{html.escape(state_class)}">{html.escape(state_value_str)}</div>' if state_value is not None else '<div class="state_cell state-unknown">unknown</div>'
-
-        raw_date = row.get('Raw Date')
-        raw_deadline = row.get('Raw Deadline')
-        raw_date_str = raw_date.strftime('%Y-%m-%d') if raw_date else 'N/A'
-        raw_deadline_str = raw_deadline.strftime('%Y-%m-%d') if raw_deadline else 'N/A'
-        data_attrs = f'''
-            data-category="{html.escape(str(row.get('Category', 'N/A')))}"
-            data-subcategory="{html.escape(str(row.get('Subcategory', 'N/A')))}"
-            data-pledged="{row.get('Raw Pledged', 0.0):.2f}"
-            data-goal="{row.get('Raw Goal', 0.0):.2f}"
-            data-raised="{row.get('Raw Raised', 0.0):.2f}"
-            data-date="{raw_date_str}"
-            data-deadline="{raw_deadline_str}"
-            data-backers="{row.get('Backer Count', 0)}"
-            data-popularity="{row.get('Popularity Score', 0.0):.6f}"
-        '''
-        visible_cells = ''
+        cells = []
         for col in visible_columns:
             value = row.get(col)
 
             if col == 'Link':
-                url = str(value) if value else '#'
-                display_url = url if len(url) < 60 else url[:57] + '...'
-                visible_cells += f'<td><a href="{html.escape(url)}" target="_blank" title="{html.escape(url)}">{html.escape(display_url)}</a></td>'
+                cells.append(str(value) if value else '#')
             elif col == 'Pledged Amount':
                  raw_pledged_val = row.get('Raw Pledged')
                  formatted_value = 'N/A'
@@ -365,16 +271,30 @@ def generate_table_html_for_page(df_page: pl.DataFrame):
                          formatted_value = f"${amount:,}"
                      except (ValueError, TypeError):
                          pass
-                 visible_cells += f'<td>{html.escape(formatted_value)}</td>'
+                 cells.append(formatted_value)
             elif col == 'State':
-                 visible_cells += f'<td>{styled_state_html}</td>'
+                 cells.append(str(value) if value is not None else None)
             else:
-                display_value = str(value) if value is not None else 'N/A'
-                visible_cells += f'<td>{html.escape(display_value)}</td>'
-
-        rows_html += f'<tr class="table-row" {data_attrs}>{visible_cells}</tr>'
-
-    return header_html, rows_html
+                cells.append(str(value) if value is not None else 'N/A')
+
+        rows.append({"id": row[ROW_ID_COLUMN], "cells": cells})
+
+    return rows, None
+
+def project_detail_payload(df_project: pl.DataFrame):
+    project = df_project.row(0, named=True)
+    fields = []
+    for col, value in project.items():
+        if value is None:
+            text = 'N/A'
+        elif isinstance(value, datetime.datetime):
+            text = value.strftime('%Y-%m-%d %H:%M')
+        elif isinstance(value, float):
+            text = f"{value:,.2f}"
+        else:
+            text = str(value)
+        fields.append([col, text])
+    return {"title": str(project.get('Project Name') or f"Project {project.get(ROW_ID_COLUMN)}"), "fields": fields}
 
 css = """
 <style>
@@ -470,6 +390,76 @@ css = """
         text-align: center;
     }
 
+    tr.table-row {
+        cursor: pointer;
+    }
+
+    tr.table-row.selected td {
+        background: #F0EDFF;
+    }
+
+    .detail-drawer {
+        position: absolute;
+        top: 0; right: 0; bottom: 0;
+        width: 360px;
+        max-width: 100%;
+        padding: 16px 20px;
+        background: #ffffff;
+        box-shadow: -4px 0 16px rgba(0, 0, 0, 0.15);
+        overflow-y: auto;
+        z-index: 50;
+        font-family: 'Poppins';
+        font-size: 13px;
+        transition: transform 0.2s ease;
+    }
+
+    .detail-drawer.hidden {
+        transform: translateX(110%);
+        visibility: hidden;
+    }
+
+    .detail-header {
+        display: flex;
+        justify-content: space-between;
+        align-items: flex-start;
+        gap: 10px;
+        margin-bottom: 12px;
+    }
+
+    .detail-title {
+        font-family: 'Playfair Display';
+        font-size: 18px;
+        font-weight: bold;
+        color: #2A5D4E;
+        overflow-wrap: anywhere;
+    }
+
+    .detail-close {
+        border: none;
+        background: transparent;
+        font-size: 22px;
+        line-height: 1;
+        cursor: pointer;
+        color: #2A5D4E;
+    }
+
+    .detail-fields {
+        margin: 0;
+    }
+
+    .detail-fields dt {
+        margin-top: 8px;
+        color: #65897F;
+        font-size: 11px;
+        text-transform: uppercase;
+    }
+
+    .detail-fields dd {
+        margin: 2px 0 0;
+        overflow-wrap: anywhere;
+        white-space: pre-wrap;
+    }
+
     .state_cell {
         width: 100px;
         max-width: 100px;
@@ -942,6 +932,79 @@ css = """
         padding-bottom: 12px;
     }
 
+    .multi-select-content.virtual-options {
+        max-height: none;
+        overflow: hidden;
+    }
+
+    .option-search {
+        width: 100%;
+        box-sizing: border-box;
+        margin-bottom: 6px;
+        padding: 6px 10px;
+        border: 1px solid #ddd;
+        border-radius: 4px;
+        font-family: 'Poppins';
+        font-size: 12px;
+    }
+
+    .option-viewport {
+        position: relative;
+        overflow-y: auto;
+        overscroll-behavior: contain;
+    }
+
+    .option-window {
+        position: absolute;
+        top: 0;
+        left: 0;
+        right: 0;
+        will-change: transform;
+    }
+
+    /* Fixed-height rows: the list's scroll offset maps straight to the first row in view. */
+    .option-window > div {
+        display: flex;
+        align-items: center;
+        justify-content: space-between;
+        gap: 12px;
+        height: 30px;
+        margin: 0 0 2px;
+        padding: 0 12px;
+        box-sizing: border-box;
+        white-space: nowrap;
+        transition: none;
+    }
+
+    .option-window > div[hidden] {
+        display: none;
+    }
+
+    .option-label {
+        overflow: hidden;
+        text-overflow: ellipsis;
+    }
+
+    .option-count {
+        color: #888;
+        font-size: 11px;
+    }
+
+    .option-window > div.selected .option-count {
+        color: inherit;
+    }
+
+    .option-window > div.no-matches:not(.selected) {
+        color: #aaa;
+    }
+
+    .option-empty {
+        padding: 8px 12px;
+        color: #888;
+        font-family: 'Poppins';
+        font-size: 12px;
+    }
+
     body { 
         font-family: 'Poppins', 
         sans-serif; margin: 0; 
@@ -991,6 +1054,313 @@ function debounce(func, wait) {
     };
 }
 
+// Filters, sorts and pages a whole-result snapshot from `client_snapshot.py`
+// with the rules of `query_engine.apply_filters`. Filters equal to the ones the
+// snapshot was taken with are already applied and are skipped. Runs in a Web
+// Worker (see listen) or, where workers are unavailable, on the main thread.
+function clientFilterEngine() {
+    let snapshot = null;
+    const lowered = {};
+    const caseFolds = {
+        'ς': 'σ', 'ϐ': 'β', 'ϑ': 'θ', 'ϕ': 'φ', 'ϖ': 'π', 'ϰ': 'κ', 'ϱ': 'ρ', 'ϵ': 'ε',
+        'ſ': 's', 'ẛ': 'ṡ', '\u0345': 'ι', '\u1fbe': 'ι'
+    };
+
+    // Lower-cased like the server's case-insensitive regex, which also matches
+    // final sigma, long s and the Greek symbol forms as their plain letters.
+    function foldCase(text) {
+        return String(text).toLowerCase().replace(/[ςϐϑϕϖϰϱϵſẛ\u0345\u1fbe]/g, c => caseFolds[c]);
+    }
+
+    function decode(column) {
+        if (Array.isArray(column)) return column;
+        if (column.labels) return column.codes.map(code => column.labels[code]);
+        return column.values.map(value => value === null ? null : column.prefix + value);
+    }
+
+    function load(data) {
+        snapshot = data;
+        snapshot.values = {};
+        for (const [name, column] of Object.entries(data.columns)) {
+            snapshot.values[name] = decode(column);
+        }
+        snapshot.cells = data.cells.map(decode);
+        for (const name in lowered) delete lowered[name];
+    }
+
+    function lowerColumn(name) {
+        if (!lowered[name]) {
+            lowered[name] = snapshot.values[name].map(value => value === null ? null : foldCase(value));
+        }
+        return lowered[name];
+    }
+
+    function sameBounds(a, b) {
+        return Boolean(a && b) && a.min === b.min && a.max === b.max;
+    }
+
+    function rowTests(filters) {
+        const base = snapshot.filters, registry = snapshot.registry, values = snapshot.values;
+        const float32 = new Set(snapshot.float32_columns);
+        const tests = [];
+        if (filters.search && filters.search !== base.search) {
+            const term = foldCase(filters.search);
+            const columns = registry.search.filter(name => values[name]).map(lowerColumn);
+            tests.push({ key: 'search', test: i => columns.some(column => column[i] !== null && column[i].includes(term)) });
+        }
+        for (const [key, [name, allOption]] of Object.entries(registry.lists)) {
+            const selected = filters[key];
+            if (!values[name] || !selected || (selected.length === 1 && selected[0] === allOption)) continue;
+            if (JSON.stringify(selected) === JSON.stringify(base[key])) continue;
+            const column = values[name];
+            if (key === 'states') {
+                const allowed = new Set(selected.map(state => state.toLowerCase()));
+                tests.push({ key, test: i => column[i] !== null && allowed.has(String(column[i]).toLowerCase()) });
+            } else {
+                const allowed = new Set(selected);
+                tests.push({ key, test: i => allowed.has(column[i]) });
+            }
+        }
+        for (const [key, name] of Object.entries(registry.ranges)) {
+            const bounds = filters.ranges?.[key];
+            if (!bounds || !values[name] || sameBounds(bounds, base.ranges?.[key])) continue;
+            const column = values[name];
+            // Polars compares Float32 columns in single precision.
+            const round = float32.has(name) ? Math.fround : (x => x);
+            const min = round(bounds.min), max = round(bounds.max);
+            if (key === 'predicted') {
+                if (bounds.min <= 0 && bounds.max >= 100) continue;
+                tests.push({ key, test: i => column[i] !== null && round(column[i] * 100) >= min && round(column[i] * 100) <= max });
+            } else {
+                tests.push({ key, test: i => column[i] !== null && column[i] >= min && column[i] <= max });
+            }
+        }
+        const cutoff = snapshot.date_cutoffs[filters.date];
+        if (filters.date !== base.date && cutoff !== undefined && cutoff !== null && values[registry.date]) {
+            const column = values[registry.date];
+            tests.push({ key: 'date', test: i => column[i] !== null && column[i] >= cutoff });
+        }
+        return tests;
+    }
+
+    function query(request) {
+        const { filters, sort_order, page, page_size } = request;
+        const tests = rowTests(filters);
+        // A facet's counts ignore its own filter, so they need every row that
+        // filter alone rejects; the snapshot has them only if it was taken
+        // without that filter.
+        const facets = {};
+        for (const key of snapshot.registry.facets || []) {
+            const [name, allOption] = snapshot.registry.lists[key];
+            const base = snapshot.filters[key];
+            if (snapshot.values[name] && (!base || (base.length === 1 && base[0] === allOption))) {
+                facets[key] = { column: snapshot.values[name], counts: {} };
+            }
+        }
+        const facetList = Object.entries(facets);
+        const matches = [];
+        for (let i = 0; i < snapshot.row_ids.length; i++) {
+            let failures = 0, failedKey = null;
+            for (const { key, test } of tests) {
+                if (!test(i)) {
+                    failedKey = key;
+                    if (++failures > 1) break;
+                }
+            }
+            if (failures === 0) {
+                matches.push(i);
+                for (const [, facet] of facetList) facet.counts[facet.column[i]] = (facet.counts[facet.column[i]] || 0) + 1;
+            } else if (failures === 1 && facets[failedKey]) {
+                const facet = facets[failedKey];
+                facet.counts[facet.column[i]] = (facet.counts[facet.column[i]] || 0) + 1;
+            }
+        }
+        // Snapshot rows are in Row ID order, so comparing positions breaks ties by Row ID.
+        const [sortColumn, descending] = snapshot.registry.sorts[sort_order] || snapshot.registry.sorts.popularity;
+        const keys = snapshot.values[sortColumn];
+        if (keys) {
+            matches.sort((a, b) => {
+                const x = keys[a], y = keys[b];
+                if (x === null || y === null) return x === y ? a - b : (x === null ? 1 : -1);
+                if (x !== y) return descending ? (x < y ? 1 : -1) : (x < y ? -1 : 1);
+                return a - b;
+            });
+        }
+        const totalPages = Math.max(1, Math.ceil(matches.length / page_size));
+        const currentPage = Math.max(1, Math.min(page, totalPages));
+        const rows = matches.slice((currentPage - 1) * page_size, currentPage * page_size).map(i => ({
+            id: snapshot.row_ids[i],
+            cells: snapshot.cells.map(column => column[i])
+        }));
+        const facetCounts = {};
+        for (const [key, facet] of facetList) {
+            delete facet.counts[null];
+            facetCounts[key] = facet.counts;
+        }
+        return { id: request.id, total: matches.length, page: currentPage, rows, facet_counts: facetCounts };
+    }
+
+    function listen(scope) {
+        scope.onmessage = (event) => {
+            if (event.data.type === 'load') load(event.data.snapshot);
+            else scope.postMessage(query(event.data.request));
+        };
+    }
+
+    return { load, query, listen, foldCase };
+}
+
+const foldCase = clientFilterEngine().foldCase;
+
+// Lower-cased, without accents, so "cote" finds "Côte d'Ivoire".
+function foldText(text) {
+    return text.normalize('NFD').replace(/[\\u0300-\\u036f]/g, '').toLowerCase();
+}
+
+function optionWords(text) {
+    return foldText(text).split(/[^\\p{L}\\p{N}]+/u).filter(Boolean);
+}
+
+// Every word of every option, sorted, so the options with a word starting with
+// some text are found by one binary search and a scan over just those words.
+function buildPrefixIndex(options) {
+    const entries = [];
+    options.forEach((option, position) => {
+        for (const word of optionWords(option)) entries.push([word, position]);
+    });
+    entries.sort((a, b) => (a[0] < b[0] ? -1 : a[0] > b[0] ? 1 : a[1] - b[1]));
+    return { words: entries.map(entry => entry[0]), positions: Int32Array.from(entries, entry => entry[1]) };
+}
+
+// Positions, in option order, of the options with a word starting with each
+// word of the query; null when the query has no words.
+function matchPrefixIndex(index, query) {
+    let matched = null;
+    for (const term of optionWords(query)) {
+        let lo = 0, hi = index.words.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (index.words[mid] < term) lo = mid + 1; else hi = mid;
+        }
+        const positions = new Set();
+        for (let i = lo; i < index.words.length && index.words[i].startsWith(term); i++) positions.add(index.positions[i]);
+        matched = matched === null ? positions : new Set([...matched].filter(position => positions.has(position)));
+    }
+    return matched === null ? null : Array.from(matched).sort((a, b) => a - b);
+}
+
+const OPTION_ROW_HEIGHT = 32;
+const OPTION_VISIBLE_ROWS = 8;
+const OPTION_OVERSCAN_ROWS = 4;
+
+// A multi-select's option list with only the rows in view (plus a few either
+// side) in the DOM. The same row elements are refilled as the list scrolls or
+// is filtered, so opening, scrolling and typing cost the same for 10 options
+// or 10,000. Clicks reach TableManager's one delegated handler by data-value.
+class VirtualOptionList {
+    constructor(container, type, allValue) {
+        this.type = type;
+        this.allValue = allValue;
+        this.options = [];
+        this.optionsKey = null;
+        this.index = null;
+        this.visible = [];
+        this.selected = new Set([allValue]);
+        this.counts = null;
+        this.frame = null;
+
+        container.classList.add('virtual-options');
+        container.innerHTML = `
+            <div class="${type}-option" data-value="${allValue}"></div>
+            <input type="search" class="option-search" placeholder="Type to filter" aria-label="Filter ${type} options" autocomplete="off">
+            <div class="option-viewport" style="max-height: ${OPTION_VISIBLE_ROWS * OPTION_ROW_HEIGHT}px">
+                <div class="option-spacer"></div>
+                <div class="option-window"></div>
+            </div>
+            <div class="option-empty" hidden>No matches</div>`;
+        this.allRow = container.firstElementChild;
+        this.allRow.textContent = allValue;
+        this.searchInput = container.querySelector('.option-search');
+        this.viewport = container.querySelector('.option-viewport');
+        this.spacer = container.querySelector('.option-spacer');
+        this.emptyMessage = container.querySelector('.option-empty');
+        const windowElement = container.querySelector('.option-window');
+        this.windowElement = windowElement;
+        this.rows = [];
+        for (let i = 0; i < OPTION_VISIBLE_ROWS + 2 * OPTION_OVERSCAN_ROWS; i++) {
+            const row = document.createElement('div');
+            row.className = `${type}-option`;
+            row.innerHTML = '<span class="option-label"></span><span class="option-count"></span>';
+            row.hidden = true;
+            windowElement.appendChild(row);
+            this.rows.push(row);
+        }
+
+        this.viewport.addEventListener('scroll', () => this.scheduleRender(), { passive: true });
+        this.searchInput.addEventListener('input', () => this.applySearch());
+    }
+
+    setOptions(options) {
+        const key = options.join('\\u0000');
+        if (key === this.optionsKey) return;
+        this.optionsKey = key;
+        this.options = options;
+        this.index = buildPrefixIndex(options);
+        this.applySearch();
+    }
+
+    setSelected(selected) {
+        this.selected = selected;
+        this.allRow.classList.toggle('selected', selected.has(this.allValue));
+        this.render();
+    }
+
+    // option -> projects it matches, or null to show no counts.
+    setCounts(counts) {
+        this.counts = counts;
+        this.render();
+    }
+
+    applySearch() {
+        const matched = matchPrefixIndex(this.index, this.searchInput.value);
+        this.visible = matched ?? this.options.map((_, position) => position);
+        this.spacer.style.height = `${this.visible.length * OPTION_ROW_HEIGHT}px`;
+        this.emptyMessage.hidden = this.visible.length > 0;
+        this.viewport.scrollTop = 0;
+        this.render();
+    }
+
+    scheduleRender() {
+        if (this.frame !== null) return;
+        this.frame = requestAnimationFrame(() => {
+            this.frame = null;
+            this.render();
+        });
+    }
+
+    render() {
+        const first = Math.max(0, Math.floor(this.viewport.scrollTop / OPTION_ROW_HEIGHT) - OPTION_OVERSCAN_ROWS);
+        this.windowElement.style.transform = `translateY(${first * OPTION_ROW_HEIGHT}px)`;
+        this.rows.forEach((row, offset) => {
+            const position = this.visible[first + offset];
+            if (position === undefined) {
+                row.hidden = true;
+                return;
+            }
+            const value = this.options[position];
+            const count = this.counts ? (this.counts[value] ?? 0) : null;
+            row.hidden = false;
+            if (row.dataset.value !== value) {
+                row.dataset.value = value;
+                row.firstElementChild.textContent = value;
+            }
+            row.lastElementChild.textContent = count === null ? '' : count.toLocaleString();
+            row.classList.toggle('selected', this.selected.has(value));
+            row.classList.toggle('no-matches', count === 0);
+        });
+    }
+}
+
 class TableManager {
     constructor(initialData) {
         this.componentRoot = document.getElementById('component-root');
@@ -1007,6 +1377,7 @@ class TableManager {
         this.filterOptions = initialData.filter_options || {};
         this.categorySubcategoryMap = initialData.category_subcategory_map || {};
         this.minMaxValues = initialData.min_max_values || {};
+        this.selectedRow = initialData.selected_row ?? null;
 
         this.subcategoryParentMap = {};
         for (const category in this.categorySubcategoryMap) {
@@ -1023,22 +1394,42 @@ class TableManager {
         this.hideDropdownTimeout = null;
         this._boundHandleScroll = this._handleScroll.bind(this); 
         this.filterWrapperElement = null;
-
-        this.renderHTMLStructure(initialData.header_html);
+        this.columns = initialData.columns || [];
+        // Row ID -> <tr> currently in the table body, reused across pages.
+        this.rowNodes = new Map();
+        this.pendingRender = null;
+        this.renderFrame = null;
+        this.renderSeq = 0;
+        this.lastRenderTiming = null;
+        // Snapshot of a small result (id, filters, registry, date cutoffs; the rows
+        // live in the filter engine) and local state the server has not seen yet.
+        this.snapshot = null;
+        this.filterEngine = null;
+        this.serverFacetCounts = null;
+        this.localQueryId = 0;
+        this.unsyncedState = null;
+
+        this.renderHTMLStructure();
         this.bindStaticElements(); 
         this.updateUIState(initialData); 
-        this.updateTableContent(initialData.rows_html);
+        this.updateTableContent(initialData.rows, initialData.table_message);
+        this.updateClientSnapshot(initialData.client_snapshot_id, initialData.client_snapshot);
+        this.updateDetailDrawer(initialData.project_detail);
         this.updatePagination();
         this.adjustHeight();
     }
 
-    renderHTMLStructure(headerHtml) {
+    renderHTMLStructure() {
+        const headerHtml = this.columns.map(column => `<th scope="col">${column.name}</th>`).join('');
         const minPledged = this.minMaxValues?.pledged?.min ?? 0;
         const maxPledged = this.minMaxValues?.pledged?.max ?? 1000;
         const minGoal = this.minMaxValues?.goal?.min ?? 0;
         const maxGoal = this.minMaxValues?.goal?.max ?? 10000;
         const minRaised = this.minMaxValues?.raised?.min ?? 0;
         const maxRaised = this.minMaxValues?.raised?.max ?? 500;
+        const hasPredicted = Boolean(this.minMaxValues?.predicted);
+        const minPredicted = this.minMaxValues?.predicted?.min ?? 0;
+        const maxPredicted = this.minMaxValues?.predicted?.max ?? 100;
 
         this.componentRoot.innerHTML = `
             <div class="title-wrapper">
@@ -1056,23 +1447,19 @@ class TableManager {
                             <span class="filter-label">Explore</span>
                             <div class="multi-select-dropdown">
                                 <button id="categoryFilterBtn" class="filter-select multi-select-btn">Categories</button>
-                                <div class="multi-select-content" id="categoryOptionsContainer">
+                                <div class="multi-select-content" id="categoryOptionsContainer" data-type="category">
                                     ${(this.filterOptions.categories || []).map(opt => `<div class="category-option" data-value="${opt}">${opt}</div>`).join('')}
                                 </div>
                             </div>
                             <span class="filter-label">&</span>
                             <div class="multi-select-dropdown">
                                 <button id="subcategoryFilterBtn" class="filter-select multi-select-btn">Subcategories</button>
-                                <div class="multi-select-content" id="subcategoryOptionsContainer">
-                                    <!-- Populated dynamically -->
-                                </div>
+                                <div class="multi-select-content" id="subcategoryOptionsContainer" data-type="subcategory"></div>
                             </div>
                             <span class="filter-label">Projects On</span>
                             <div class="multi-select-dropdown">
                                 <button id="countryFilterBtn" class="filter-select multi-select-btn">Countries</button>
-                                <div class="multi-select-content" id="countryOptionsContainer">
-                                    ${ (this.filterOptions.countries || []).map(opt => `<div class="country-option" data-value="${opt}">${opt}</div>`).join('')}
-                                </div>
+                                <div class="multi-select-content" id="countryOptionsContainer" data-type="country"></div>
                             </div>
                             <span class="filter-label">Sorted By</span>
                             <select id="sortFilter" class="filter-select">
@@ -1082,13 +1469,14 @@ class TableManager {
                                 <option value="mostfunded">Most Funded</option>
                                 <option value="mostbacked">Most Backed</option>
                                 <option value="enddate">End Date</option>
+                                ${hasPredicted ? '<option value="predicted">Most Likely to Succeed</option>' : ''}
                             </select>
                         </div>
                         <div class="filter-row">
                             <span class="filter-label">More Flexible, Dynamic Search:</span>
                             <div class="multi-select-dropdown">
                                 <button id="stateFilterBtn" class="filter-select multi-select-btn">States</button>
-                                <div class="multi-select-content" id="stateOptionsContainer">
+                                <div class="multi-select-content" id="stateOptionsContainer" data-type="state">
                                     ${ (this.filterOptions.states || []).map(opt => `<div class="state-option" data-value="${opt}">${opt}</div>`).join('')}
                                 </div>
                             </div>
@@ -1155,6 +1543,28 @@ class TableManager {
                                     </div>
                                 </div>
                             </div>
+                            ${hasPredicted ? `
+                            <div class="range-dropdown">
+                                <button class="filter-select">Predicted Success Range</button>
+                                <div class="range-content">
+                                    <div class="range-container">
+                                        <div class="sliders-control">
+                                            <input id="predictedFromSlider" type="range" value="${minPredicted}" min="${minPredicted}" max="${maxPredicted}"/>
+                                            <input id="predictedToSlider" type="range" value="${maxPredicted}" min="${minPredicted}" max="${maxPredicted}"/>
+                                        </div>
+                                        <div class="form-control">
+                                            <div class="form-control-container">
+                                                <span class="form-control-label">Min %</span>
+                                                <input class="form-control-input" type="number" id="predictedFromInput" value="${minPredicted}" min="${minPredicted}" max="${maxPredicted}"/>
+                                            </div>
+                                            <div class="form-control-container">
+                                                <span class="form-control-label">Max %</span>
+                                                <input class="form-control-input" type="number" id="predictedToInput" value="${maxPredicted}" min="${minPredicted}" max="${maxPredicted}"/>
+                                            </div>
+                                        </div>
+                                    </div>
+                                </div>
+                            </div>` : ''}
                             <select id="dateFilter" class="filter-select">
                                 ${(this.filterOptions.date_ranges || []).map(opt => `<option value="${opt}">${opt}</option>`).join('')}
                             </select>
@@ -1177,6 +1587,13 @@ class TableManager {
                         </tbody>
                     </table>
                     <div id="loading-indicator" class="loading-overlay hidden">Loading...</div>
+                    <aside id="detail-drawer" class="detail-drawer hidden" aria-label="Project details">
+                        <div class="detail-header">
+                            <span id="detail-title" class="detail-title"></span>
+                            <button id="detail-close" class="detail-close" aria-label="Close project details">&times;</button>
+                        </div>
+                        <dl id="detail-fields" class="detail-fields"></dl>
+                    </aside>
                 </div>
                 <div class="pagination-controls">
                     <button id="prev-page" class="page-btn" aria-label="Previous page">&lt;</button>
@@ -1202,6 +1619,23 @@ class TableManager {
             this.requestUpdate();
         }, 500));
         document.getElementById('prev-page').addEventListener('click', () => this.previousPage());
+        const tableBody = document.getElementById('table-body');
+        if (tableBody) {
+            tableBody.addEventListener('click', (e) => {
+                if (e.target.closest('a')) return;
+                const row = e.target.closest('tr.table-row');
+                if (!row || !row.dataset.rowId) return;
+                const rowId = parseInt(row.dataset.rowId, 10);
+                this.selectedRow = this.selectedRow === rowId ? null : rowId;
+                this.requestUpdate();
+            });
+        }
+        document.documentElement.addEventListener('mouseleave', () => this.syncLocalState());
+        window.addEventListener('blur', () => this.syncLocalState());
+        document.getElementById('detail-close').addEventListener('click', () => {
+            this.selectedRow = null;
+            this.requestUpdate();
+        });
         document.getElementById('next-page').addEventListener('click', () => this.nextPage());
         document.getElementById('resetFilters').addEventListener('click', () => this.resetFilters());
         document.getElementById('sortFilter').addEventListener('change', (e) => {
@@ -1223,30 +1657,21 @@ class TableManager {
         this.subcategoryBtn = document.getElementById('subcategoryFilterBtn');
         this.countryBtn = document.getElementById('countryFilterBtn');
         this.stateBtn = document.getElementById('stateFilterBtn');
+        this.countryList = new VirtualOptionList(document.getElementById('countryOptionsContainer'), 'country', 'All Countries');
+        this.countryList.setOptions((this.filterOptions.countries || []).filter(opt => opt !== 'All Countries'));
+        this.subcategoryList = new VirtualOptionList(document.getElementById('subcategoryOptionsContainer'), 'subcategory', 'All Subcategories');
         this._bindDropdowns();
         this.setupRangeSlider(); 
-        this.setupMultiSelect(
-            'category',
-            document.querySelectorAll('#categoryOptionsContainer .category-option'),
-            this.selectedCategories,
-            'All Categories',
-            this.categoryBtn
-        );
+        this.syncMultiSelect('category');
         this.updateSubcategoryOptions();
-        this.setupMultiSelect(
-            'country',
-            document.querySelectorAll('#countryOptionsContainer .country-option'),
-            this.selectedCountries,
-            'All Countries',
-            this.countryBtn
-        );
-         this.setupMultiSelect(
-             'state',
-             document.querySelectorAll('#stateOptionsContainer .state-option'),
-             this.selectedStates,
-             'All States',
-             this.stateBtn
-         );
+        this.syncMultiSelect('country');
+        this.syncMultiSelect('state');
+
+        // One listener for the options of every multi-select, however many are rendered.
+        this.componentRoot.addEventListener('click', (e) => {
+            const option = e.target.closest('.multi-select-content [data-value]');
+            if (option) this.toggleOption(option.closest('.multi-select-content').dataset.type, option.dataset.value);
+        });
 
         document.body.addEventListener('click', (event) => {
             if (this.openDropdown) {
@@ -1406,6 +1831,8 @@ class TableManager {
         this.totalRows = data.total_rows;
         this.currentFilters = data.filters;
         this.currentSort = data.sort_order;
+        this.selectedRow = data.selected_row ?? null;
+        this.renderedSelectedRow = this.selectedRow;
 
         if (this.searchInput) this.searchInput.value = this.currentFilters.search || '';
         const sortSelect = document.getElementById('sortFilter');
@@ -1423,28 +1850,13 @@ class TableManager {
         this.countryBtn = this.countryBtn || document.getElementById('countryFilterBtn');
         this.stateBtn = this.stateBtn || document.getElementById('stateFilterBtn');
 
-        if (this.categoryBtn) {
-            this.setupMultiSelect(
-                'category',
-                document.querySelectorAll('#categoryOptionsContainer .category-option'),
-                this.selectedCategories, 'All Categories', this.categoryBtn
-            );
-        }
+        this.syncMultiSelect('category');
         this.updateSubcategoryOptions();
-
-        if (this.countryBtn) {
-            this.setupMultiSelect(
-                'country',
-                document.querySelectorAll('#countryOptionsContainer .country-option'),
-                this.selectedCountries, 'All Countries', this.countryBtn
-            );
-        }
-        if (this.stateBtn) {
-            this.setupMultiSelect(
-                 'state',
-                 document.querySelectorAll('#stateOptionsContainer .state-option'),
-                 this.selectedStates, 'All States', this.stateBtn
-             );
+        this.syncMultiSelect('country');
+        this.syncMultiSelect('state');
+        if ('facet_counts' in data) {
+            this.serverFacetCounts = { filtersKey: this._filtersKey(this.currentFilters), counts: data.facet_counts };
+            this.updateFacetCounts(data.facet_counts);
         }
 
         if (this.currentFilters.ranges && this.rangeSliderElements) {
@@ -1471,100 +1883,87 @@ class TableManager {
                   this.rangeSliderElements.raisedToInput.value = ranges.raised.max;
                   this.rangeSliderElements.fillSlider(this.rangeSliderElements.raisedFromSlider, this.rangeSliderElements.raisedToSlider, '#C6C6C6', '#5932EA', this.rangeSliderElements.raisedToSlider);
              }
+             if (ranges.predicted && this.rangeSliderElements.predictedFromSlider && this.rangeSliderElements.fillSlider) {
+                  this.rangeSliderElements.predictedFromSlider.value = ranges.predicted.min;
+                  this.rangeSliderElements.predictedToSlider.value = ranges.predicted.max;
+                  this.rangeSliderElements.predictedFromInput.value = ranges.predicted.min;
+                  this.rangeSliderElements.predictedToInput.value = ranges.predicted.max;
+                  this.rangeSliderElements.fillSlider(this.rangeSliderElements.predictedFromSlider, this.rangeSliderElements.predictedToSlider, '#C6C6C6', '#5932EA', this.rangeSliderElements.predictedToSlider);
+             }
         }
 
         this._hideDropdownImmediately();
         this.updatePagination(); 
     }
 
-    setupMultiSelect(type, options, selectedSet, allValue, buttonElement) {
-        if (!options || options.length === 0 || !selectedSet || !buttonElement) {
-             return;
-        }
-        const contentContainer = buttonElement.nextElementSibling;
-        if (!contentContainer || !contentContainer.classList.contains('multi-select-content')) {
-             console.warn(`setupMultiSelect (${type}): Could not find valid content container for button:`, buttonElement);
-             return;
-        }
-        const currentOptions = contentContainer.querySelectorAll(`.${type}-option`);
-
-        currentOptions.forEach(option => {
-            const newOption = option.cloneNode(true);
-            option.parentNode.replaceChild(newOption, option);
-            if (selectedSet.has(newOption.dataset.value)) {
-                 newOption.classList.add('selected');
-             } else {
-                 newOption.classList.remove('selected');
-             }
+    _multiSelect(type) {
+        return {
+            category: { selected: this.selectedCategories, allValue: 'All Categories', button: this.categoryBtn },
+            subcategory: { selected: this.selectedSubcategories, allValue: 'All Subcategories', button: this.subcategoryBtn, list: this.subcategoryList },
+            country: { selected: this.selectedCountries, allValue: 'All Countries', button: this.countryBtn, list: this.countryList },
+            state: { selected: this.selectedStates, allValue: 'All States', button: this.stateBtn },
+        }[type];
+    }
 
-             newOption.addEventListener('click', (e) => {
-                const clickedValue = e.target.dataset.value;
-                const isCurrentlySelected = e.target.classList.contains('selected');
-                const siblingOptions = Array.from(contentContainer.querySelectorAll('[data-value]')); 
-
-                if (clickedValue === allValue) {
-                    selectedSet.clear();
-                    selectedSet.add(allValue);
-                    siblingOptions.forEach(opt => opt.classList.remove('selected'));
-                    e.target.classList.add('selected');
-                } else {
-                    const allOptionElement = contentContainer.querySelector(`[data-value="${allValue}"]`);
-                    if (allOptionElement && selectedSet.has(allValue)) {
-                        selectedSet.delete(allValue);
-                        if (allOptionElement) allOptionElement.classList.remove('selected');
-                    }
+    syncMultiSelect(type) {
+        const { selected, allValue, button, list } = this._multiSelect(type);
+        if (!selected) return;
+        if (list) {
+            list.setSelected(selected);
+        } else {
+            document.querySelectorAll(`#${type}OptionsContainer .${type}-option`).forEach(option => {
+                option.classList.toggle('selected', selected.has(option.dataset.value));
+            });
+        }
+        this.updateButtonText(selected, button, allValue);
+    }
 
-                    if (isCurrentlySelected) {
-                        selectedSet.delete(clickedValue);
-                        e.target.classList.remove('selected');
-                    } else {
-                        selectedSet.add(clickedValue);
-                        e.target.classList.add('selected');
-                    }
+    toggleOption(type, value) {
+        const multiSelect = this._multiSelect(type);
+        if (!multiSelect) return;
+        const { selected, allValue } = multiSelect;
+        const wasSelected = selected.has(value);
+        if (value === allValue) {
+            selected.clear();
+            selected.add(allValue);
+        } else {
+            selected.delete(allValue);
+            if (wasSelected) selected.delete(value); else selected.add(value);
+            if (selected.size === 0) selected.add(allValue);
+        }
+        this.syncMultiSelect(type);
+
+        if (type === 'category') {
+            this.updateSubcategoryOptions();
+        } else if (type === 'subcategory' && value !== allValue && !wasSelected) {
+            const parentCategory = this.subcategoryParentMap[value];
+            if (parentCategory && !this.selectedCategories.has(parentCategory)) {
+                this.selectedCategories.delete('All Categories');
+                this.selectedCategories.add(parentCategory);
+                this.syncMultiSelect('category');
+            }
+        }
+        this.currentPage = 1;
+        this.requestUpdate();
+    }
 
-                    const hasSpecificSelection = Array.from(selectedSet).some(item => item !== allValue);
-                    if (!hasSpecificSelection && selectedSet.size === 0) { 
-                         selectedSet.clear();
-                         selectedSet.add(allValue);
-                         if (allOptionElement) allOptionElement.classList.add('selected');
-                         siblingOptions.forEach(opt => {
-                              if (opt.dataset.value !== allValue) opt.classList.remove('selected');
-                         });
-                    }
-                }
+    _filtersKey(filters) {
+        const ranges = filters.ranges || {};
+        return JSON.stringify([
+            filters.search || '', filters.categories, filters.subcategories, filters.countries, filters.states, filters.date,
+            Object.keys(ranges).sort().map(key => [key, ranges[key].min, ranges[key].max])
+        ]);
+    }
 
-                let needsUpdate = true;
-                if (type === 'category') {
-                    const subcatSelectionChanged = this.updateSubcategoryOptions();
-                } else if (type === 'subcategory') {
-                    if (clickedValue !== allValue && !isCurrentlySelected) { 
-                        const parentCategory = this.subcategoryParentMap[clickedValue];
-                        if (parentCategory && !this.selectedCategories.has(parentCategory)) {
-                             if (this.selectedCategories.has('All Categories')) {
-                                 this.selectedCategories.delete('All Categories');
-                             }
-                             this.selectedCategories.add(parentCategory);
-                             const catOptions = document.querySelectorAll('#categoryOptionsContainer .category-option');
-                             this.updateMultiSelectUI(catOptions, this.selectedCategories, this.categoryBtn, 'All Categories');
-                             this.setupMultiSelect('category', catOptions, this.selectedCategories, 'All Categories', this.categoryBtn);
-                        }
-                    }
-                }
-                this.updateButtonText(selectedSet, buttonElement, allValue);
-                if (needsUpdate) {
-                    this.currentPage = 1;
-                    this.requestUpdate();
-                }
-            });
-        });
-        this.updateButtonText(selectedSet, buttonElement, allValue);
+    updateFacetCounts(counts) {
+        this.countryList?.setCounts(counts?.countries ?? null);
+        this.subcategoryList?.setCounts(counts?.subcategories ?? null);
     }
 
     updateSubcategoryOptions() {
 
-        const subcategoryOptionsContainer = document.getElementById('subcategoryOptionsContainer');
         const subcategoryBtn = this.subcategoryBtn || document.getElementById('subcategoryFilterBtn'); 
-        if (!subcategoryOptionsContainer || !subcategoryBtn || !this.selectedSubcategories || !this.categorySubcategoryMap || !this.selectedCategories) {
+        if (!this.subcategoryList || !subcategoryBtn || !this.selectedSubcategories || !this.categorySubcategoryMap || !this.selectedCategories) {
             //console.warn("Cannot update subcategory options - missing elements or data.");
             return false;
         }
@@ -1603,17 +2002,8 @@ class TableManager {
         const sortedSubcategories = Array.from(availableSubcategories).sort((a, b) => {
             if (a === 'All Subcategories') return -1; if (b === 'All Subcategories') return 1; return a.localeCompare(b);
         });
-        subcategoryOptionsContainer.innerHTML = sortedSubcategories.map(opt =>
-            `<div class="subcategory-option ${this.selectedSubcategories.has(opt) ? 'selected' : ''}" data-value="${opt}">${opt}</div>`
-        ).join('');
-
-        this.setupMultiSelect(
-            'subcategory',
-            subcategoryOptionsContainer.querySelectorAll('.subcategory-option'), 
-            this.selectedSubcategories,
-            'All Subcategories',
-            subcategoryBtn
-        );
+        this.subcategoryList.setOptions(sortedSubcategories.filter(opt => opt !== 'All Subcategories'));
+        this.syncMultiSelect('subcategory');
         return selectionChanged;
     }
 
@@ -1640,6 +2030,10 @@ class TableManager {
         this.rangeSliderElements.raisedToSlider = document.getElementById('raisedToSlider');
         this.rangeSliderElements.raisedFromInput = document.getElementById('raisedFromInput');
         this.rangeSliderElements.raisedToInput = raisedToInput; 
+        this.rangeSliderElements.predictedFromSlider = document.getElementById('predictedFromSlider');
+        this.rangeSliderElements.predictedToSlider = document.getElementById('predictedToSlider');
+        this.rangeSliderElements.predictedFromInput = document.getElementById('predictedFromInput');
+        this.rangeSliderElements.predictedToInput = document.getElementById('predictedToInput');
 
         const fillSlider = (from, to, sliderColor, rangeColor, controlSlider) => { /* ... existing fill logic ... */
             if (!from || !to || !controlSlider) return;
@@ -1695,10 +2089,14 @@ class TableManager {
         setupSliderListeners(this.rangeSliderElements.fromSlider, this.rangeSliderElements.toSlider, this.rangeSliderElements.fromInput, this.rangeSliderElements.toInput);
         setupSliderListeners(this.rangeSliderElements.goalFromSlider, this.rangeSliderElements.goalToSlider, this.rangeSliderElements.goalFromInput, this.rangeSliderElements.goalToInput);
         setupSliderListeners(this.rangeSliderElements.raisedFromSlider, this.rangeSliderElements.raisedToSlider, this.rangeSliderElements.raisedFromInput, this.rangeSliderElements.raisedToInput);
+        if (this.rangeSliderElements.predictedFromSlider) {
+            setupSliderListeners(this.rangeSliderElements.predictedFromSlider, this.rangeSliderElements.predictedToSlider, this.rangeSliderElements.predictedFromInput, this.rangeSliderElements.predictedToInput);
+        }
 
         fillSlider(this.rangeSliderElements.fromSlider, this.rangeSliderElements.toSlider, '#C6C6C6', '#5932EA', this.rangeSliderElements.toSlider);
         fillSlider(this.rangeSliderElements.goalFromSlider, this.rangeSliderElements.goalToSlider, '#C6C6C6', '#5932EA', this.rangeSliderElements.goalToSlider);
         fillSlider(this.rangeSliderElements.raisedFromSlider, this.rangeSliderElements.raisedToSlider, '#C6C6C6', '#5932EA', this.rangeSliderElements.raisedToSlider);
+        fillSlider(this.rangeSliderElements.predictedFromSlider, this.rangeSliderElements.predictedToSlider, '#C6C6C6', '#5932EA', this.rangeSliderElements.predictedToSlider);
 
     }
 
@@ -1719,6 +2117,9 @@ class TableManager {
                  raised: { min: defaultMinRaised, max: defaultMaxRaised }
              }
          };
+        if (this.minMaxValues?.predicted) {
+            defaultFilters.ranges.predicted = { min: this.minMaxValues.predicted.min, max: this.minMaxValues.predicted.max };
+        }
         const defaultSort = 'popularity';
         const defaultPage = 1;
 
@@ -1728,13 +2129,18 @@ class TableManager {
             page: defaultPage,
             filters: JSON.parse(JSON.stringify(defaultFilters)), 
             sort_order: defaultSort,
+            selected_row: null,
+            render_timing: this.lastRenderTiming,
             _reset_trigger_timestamp: Date.now()
         };
+        this.localQueryId++;
+        this.unsyncedState = null;
         Streamlit.setComponentValue(resetStatePayload);
 
         try {
             this.currentPage = defaultPage;
             this.currentSort = defaultSort;
+            this.selectedRow = null;
             this.currentFilters = JSON.parse(JSON.stringify(defaultFilters)); 
             this.updateUIState({
                 current_page: this.currentPage,
@@ -1767,16 +2173,6 @@ class TableManager {
          }
     }
 
-    updateMultiSelectUI(options, selectedSet, buttonElement, allValue) {
-         if (!options || options.length === 0 || !selectedSet) return;
-         options.forEach(option => {
-            const isSelected = selectedSet.has(option.dataset.value);
-            option.classList.toggle('selected', isSelected);
-         });
-         this.updateButtonText(selectedSet, buttonElement, allValue);
-    }
-
-
     requestUpdate() {
         this.showLoading(true);
         this._hideDropdownImmediately();
@@ -1796,13 +2192,138 @@ class TableManager {
                     raised: { min: parseFloat(document.getElementById('raisedFromInput')?.value ?? 0), max: parseFloat(document.getElementById('raisedToInput')?.value ?? 500) }
                 }
             },
-            sort_order: this.currentSort
+            sort_order: this.currentSort,
+            selected_row: this.selectedRow ?? null,
+            // The cost of the last table render rides along with the next state
+            // change instead of costing a rerun of its own.
+            render_timing: this.lastRenderTiming
         };
+        if (document.getElementById('predictedFromInput')) {
+            state.filters.ranges.predicted = { min: parseFloat(document.getElementById('predictedFromInput').value), max: parseFloat(document.getElementById('predictedToInput').value) };
+        }
         Object.keys(state.filters.ranges).forEach(key => {
              state.filters.ranges[key].min = isNaN(state.filters.ranges[key].min) ? (this.minMaxValues[key]?.min ?? 0) : state.filters.ranges[key].min;
              state.filters.ranges[key].max = isNaN(state.filters.ranges[key].max) ? (this.minMaxValues[key]?.max ?? 1000) : state.filters.ranges[key].max;
         });
 
+        if (this.snapshot && this._coveredBySnapshot(state.filters)) {
+            // Tells the server the component still holds this snapshot.
+            state.snapshot_id = this.snapshot.id;
+            if (state.selected_row === this.renderedSelectedRow) {
+                this._serveLocally(state);
+                return;
+            }
+        }
+        this.localQueryId++;
+        this.unsyncedState = null;
+        Streamlit.setComponentValue(state);
+    }
+
+    updateClientSnapshot(snapshotId, snapshot) {
+        if (snapshot) {
+            this.snapshot = { id: snapshot.id, filters: snapshot.filters, registry: snapshot.registry, dateCutoffs: snapshot.date_cutoffs };
+            this._filterEngine().load(snapshot);
+        } else if (!snapshotId || snapshotId !== this.snapshot?.id) {
+            this.snapshot = null;
+        }
+    }
+
+    _filterEngine() {
+        if (this.filterEngine) return this.filterEngine;
+        const mainThread = () => {
+            const engine = clientFilterEngine();
+            return { load: snapshot => engine.load(snapshot), query: request => Promise.resolve(engine.query(request)) };
+        };
+        try {
+            const source = `(${clientFilterEngine.toString()})().listen(self);`;
+            const worker = new Worker(URL.createObjectURL(new Blob([source], { type: 'text/javascript' })));
+            const pending = new Map();
+            worker.onmessage = (event) => {
+                pending.get(event.data.id)?.(event.data);
+                pending.delete(event.data.id);
+            };
+            worker.onerror = (error) => {
+                // The snapshot was in the worker; pending and later requests go to the server.
+                console.warn('Filter worker failed; using the server.', error);
+                this.snapshot = null;
+                this.filterEngine = mainThread();
+                pending.forEach(resolve => resolve(null));
+                pending.clear();
+            };
+            this.filterEngine = {
+                load: snapshot => worker.postMessage({ type: 'load', snapshot }),
+                query: request => new Promise(resolve => {
+                    pending.set(request.id, resolve);
+                    worker.postMessage({ type: 'query', request });
+                })
+            };
+        } catch (error) {
+            console.warn('Web Workers unavailable; filtering the snapshot on the main thread.', error);
+            this.filterEngine = mainThread();
+        }
+        return this.filterEngine;
+    }
+
+    _coveredBySnapshot(filters) {
+        // True when every row matching `filters` is in the snapshot, i.e. the
+        // change only narrows the filters it was taken with.
+        const outer = this.snapshot.filters, registry = this.snapshot.registry;
+        if (filters.search !== outer.search) {
+            // Regex searches are left to the server's regex engine.
+            if (/[\\\\.+*?()|\\[\\]{}^$]/.test(filters.search)) return false;
+            if (!foldCase(filters.search).includes(foldCase(outer.search || ''))) return false;
+        }
+        for (const [key, [, allOption]] of Object.entries(registry.lists)) {
+            const isAll = selected => !selected || (selected.length === 1 && selected[0] === allOption);
+            if (isAll(outer[key])) continue;
+            if (isAll(filters[key])) return false;
+            const normalize = key === 'states' ? value => String(value).toLowerCase() : value => value;
+            const allowed = new Set(outer[key].map(normalize));
+            if (!filters[key].every(value => allowed.has(normalize(value)))) return false;
+        }
+        for (const [key, bounds] of Object.entries(filters.ranges || {})) {
+            const outerBounds = outer.ranges?.[key];
+            if (!outerBounds) return false;
+            if (key === 'predicted' && outerBounds.min <= 0 && outerBounds.max >= 100) continue;
+            if (bounds.min < outerBounds.min || bounds.max > outerBounds.max) return false;
+        }
+        const cutoff = preset => this.snapshot.dateCutoffs[preset] ?? -Infinity;
+        return cutoff(filters.date) >= cutoff(outer.date);
+    }
+
+    _serveLocally(state) {
+        const id = ++this.localQueryId;
+        this.unsyncedState = state;
+        this.currentFilters = state.filters;
+        this._filterEngine().query({
+            id, filters: state.filters, sort_order: state.sort_order, page: state.page, page_size: this.pageSize
+        }).then(result => {
+            if (id !== this.localQueryId) return;
+            if (!result) {
+                this.unsyncedState = null;
+                delete state.snapshot_id;
+                Streamlit.setComponentValue(state);
+                return;
+            }
+            this.currentPage = result.page;
+            this.totalRows = result.total;
+            this.unsyncedState = { ...state, page: result.page };
+            this.updateTableContent(result.rows, 'No projects match the current filters.');
+            // The server's counts still hold while only the sort or page has changed.
+            const serverCounts = this.serverFacetCounts;
+            const unchanged = serverCounts?.counts && serverCounts.filtersKey === this._filtersKey(state.filters);
+            this.updateFacetCounts(unchanged ? serverCounts.counts : result.facet_counts);
+            this.updatePagination();
+            this.adjustHeight();
+        });
+    }
+
+    syncLocalState() {
+        // Panels outside the component (export, summary) read the server's
+        // filters, so local changes are sent once focus leaves the table.
+        if (!this.unsyncedState) return;
+        const state = { ...this.unsyncedState, render_timing: this.lastRenderTiming };
+        this.unsyncedState = null;
         Streamlit.setComponentValue(state);
     }
 
@@ -1814,13 +2335,133 @@ class TableManager {
          }
      }
 
-    updateTableContent(rowsHtml) {
+    updateTableContent(rows, message) {
         if (!this.componentRoot) return;
+        // DOM writes wait for the next frame; renders arriving before it only
+        // replace the pending data, so each frame reconciles the table once.
+        const receivedAt = this.pendingRender?.receivedAt ?? performance.now();
+        this.pendingRender = { rows: rows || [], message, receivedAt };
+        if (this.renderFrame === null) {
+            this.renderFrame = requestAnimationFrame(() => this._commitTableContent());
+        }
+    }
+
+    _commitTableContent() {
+        const { rows, message, receivedAt } = this.pendingRender;
+        this.pendingRender = null;
+        this.renderFrame = null;
         const tbody = this.componentRoot.querySelector('#table-body');
         if (tbody) {
-            tbody.innerHTML = rowsHtml || '<tr><td colspan="6">Loading data or no results...</td></tr>';
+            const startedAt = performance.now();
+            const counts = this._reconcileRows(tbody, rows, message);
+            const finishedAt = performance.now();
+            this.lastRenderTiming = {
+                seq: ++this.renderSeq,
+                ms: finishedAt - receivedAt,
+                dom_ms: finishedAt - startedAt,
+                rows: rows.length,
+                ...counts
+            };
+            performance.measure('explorer:table-render', { start: receivedAt, end: finishedAt });
+        }
+        this.showLoading(false);
+    }
+
+    _reconcileRows(tbody, rows, message) {
+        // Keyed on Row ID: rows already on screen keep their <tr> (and its hover
+        // state) and only cells whose value changed are rewritten.
+        const counts = { created: 0, reused: 0, removed: 0, patched_cells: 0 };
+        const previous = this.rowNodes;
+        this.rowNodes = new Map();
+        let cursor = tbody.firstChild;
+        for (const row of rows) {
+            let tr = previous.get(row.id);
+            if (tr) {
+                previous.delete(row.id);
+                counts.reused++;
+                counts.patched_cells += this._patchRow(tr, row.cells);
+            } else {
+                tr = this._createRow(row);
+                counts.created++;
+            }
+            tr.classList.toggle('selected', this.selectedRow !== null && row.id === this.selectedRow);
+            this.rowNodes.set(row.id, tr);
+            if (tr === cursor) {
+                cursor = cursor.nextSibling;
+            } else {
+                tbody.insertBefore(tr, cursor);
+            }
+        }
+        while (cursor) {
+            const next = cursor.nextSibling;
+            if (cursor.classList?.contains('table-row')) counts.removed++;
+            cursor.remove();
+            cursor = next;
+        }
+        if (rows.length === 0) {
+            const tr = document.createElement('tr');
+            const td = document.createElement('td');
+            td.colSpan = Math.max(1, this.columns.length);
+            td.textContent = message || 'No projects match the current filters.';
+            tr.appendChild(td);
+            tbody.appendChild(tr);
+        }
+        return counts;
+    }
+
+    _createRow(row) {
+        const tr = document.createElement('tr');
+        tr.className = 'table-row';
+        tr.dataset.rowId = row.id;
+        tr.cellValues = [];
+        this.columns.forEach(() => tr.appendChild(document.createElement('td')));
+        this._patchRow(tr, row.cells);
+        return tr;
+    }
+
+    _patchRow(tr, cells) {
+        let patched = 0;
+        this.columns.forEach((column, i) => {
+            if (tr.cellValues[i] === cells[i]) return;
+            this._fillCell(tr.cells[i], column.kind, cells[i]);
+            tr.cellValues[i] = cells[i];
+            patched++;
+        });
+        return patched;
+    }
+
+    _fillCell(td, kind, value) {
+        if (kind === 'link') {
+            const link = td.firstChild || td.appendChild(document.createElement('a'));
+            link.href = value;
+            link.target = '_blank';
+            link.title = value;
+            link.textContent = value.length < 60 ? value : value.slice(0, 57) + '...';
+        } else if (kind === 'state') {
+            const badge = td.firstChild || td.appendChild(document.createElement('div'));
+            const stateClass = value === null ? 'unknown' : value.toLowerCase().replaceAll(' ', '-');
+            badge.className = `state_cell state-${stateClass}`;
+            badge.textContent = value ?? 'unknown';
+        } else {
+            td.textContent = value;
         }
-         this.showLoading(false); 
+    }
+
+    updateDetailDrawer(detail) {
+        const drawer = this.componentRoot?.querySelector('#detail-drawer');
+        if (!drawer) return;
+        drawer.classList.toggle('hidden', !detail);
+        if (!detail) return;
+        drawer.querySelector('#detail-title').textContent = detail.title;
+        const fields = drawer.querySelector('#detail-fields');
+        fields.replaceChildren(...detail.fields.flatMap(([name, value]) => {
+            const term = document.createElement('dt');
+            term.textContent = name;
+            const description = document.createElement('dd');
+            description.textContent = value;
+            return [term, description];
+        }));
+        drawer.scrollTop = 0;
     }
 
     updatePagination() {
@@ -1899,8 +2540,14 @@ function onRender(event) {
         if (!window.tableManagerInstance) {
             window.tableManagerInstance = new TableManager(data);
         } else {
-            window.tableManagerInstance.updateUIState(data);
-            window.tableManagerInstance.updateTableContent(data.rows_html);
+            const manager = window.tableManagerInstance;
+            manager.updateClientSnapshot(data.client_snapshot_id, data.client_snapshot);
+            // A rerun that started before newer local changes would undo them.
+            if (!manager.unsyncedState) {
+                manager.updateUIState(data);
+                manager.updateTableContent(data.rows, data.table_message);
+            }
+            manager.updateDetailDrawer(data.project_detail);
             window.tableManagerInstance.adjustHeight();
         }
 
@@ -1928,7 +2575,8 @@ Streamlit.events.addEventListener(Streamlit.RENDER_EVENT, onRender);
 Streamlit.setComponentReady();
 """
 
-table_component = generate_component('kickstarter_table', template=css, script=script)
+with rerun_profile.stage('build_component'):
+    table_component = generate_component('kickstarter_table', template=css, script=script)
 
 component_state_from_last_run = st.session_state.get("kickstarter_state_value", None)
 state_sent_last_run = st.session_state.get('state_sent_to_component', DEFAULT_COMPONENT_STATE)
@@ -1936,8 +2584,8 @@ state_sent_last_run = st.session_state.get('state_sent_to_component', DEFAULT_CO
 component_sent_new_state = False
 if component_state_from_last_run is not None:
     try:
-        last_run_str = json.dumps(component_state_from_last_run, sort_keys=True)
-        sent_last_run_str = json.dumps(state_sent_last_run, sort_keys=True)
+        last_run_str = component_state_json(component_state_from_last_run)
+        sent_last_run_str = component_state_json(state_sent_last_run)
         if last_run_str != sent_last_run_str:
             component_sent_new_state = True
     except TypeError as e:
@@ -1953,6 +2601,8 @@ if component_sent_new_state:
 
         st.session_state.current_page = component_state_from_last_run["page"]
         st.session_state.sort_order = component_state_from_last_run["sort_order"]
+        selected_row = component_state_from_last_run.get("selected_row")
+        st.session_state.selected_row = selected_row if isinstance(selected_row, int) else None
 
         new_filters = component_state_from_last_run["filters"]
         validated_filters = DEFAULT_FILTERS.copy()
@@ -1983,38 +2633,94 @@ if component_sent_new_state:
     else:
         print(f"Warning: Invalid structure in new component state: {component_state_from_last_run}. NOT updating session state.")
 
-if 'base_lf' not in st.session_state:
-     st.error("Base LazyFrame not found. Please reload.")
-     st.stop()
+if not resident_enabled:
+    if 'base_lf' not in st.session_state:
+         st.error("Base LazyFrame not found. Please reload.")
+         st.stop()
+    base_lf = st.session_state.base_lf
 
-filtered_lf = apply_filters_and_sort(
-    st.session_state.base_lf,
-    st.session_state.filters,
-    st.session_state.sort_order
-)
+# Every page query goes through one `query_backends` interface: the shared
+# query service, an SQL engine, or Polars over this process's data.
+query_generation = next_query_generation(st.session_state)
+query_yield_point = st.empty()
+
+def collect_query(lf: pl.LazyFrame) -> pl.DataFrame:
+    return collect_latest(lf, query_generation, query_yield_point.empty)
 
+query_backend = None
 try:
-    total_rows_result_df = filtered_lf.select(pl.len()).collect()
-    st.session_state.total_rows = total_rows_result_df.item() if total_rows_result_df is not None and not total_rows_result_df.is_empty() else 0
+    if query_socket_path:
+        query_backend = QueryServiceClient(query_socket_path)
+    elif query_backend_name != 'polars':
+        with rerun_profile.stage('query_backend'):
+            query_backend = load_backend(query_backend_name, parquet_source_path)
+    else:
+        query_backend = PolarsBackend(base_lf, resident_dataset if resident_enabled else None)
+    st.session_state.total_rows, st.session_state.current_page, df_page = query_backend.fetch_page(
+        st.session_state.filters,
+        st.session_state.sort_order,
+        st.session_state.current_page,
+        PAGE_SIZE,
+        # Neighbouring pages are found from the boundary keys of pages already seen.
+        cursors=st.session_state.page_cursors,
+        collect=collect_query,
+        stage=rerun_profile.stage,
+    )
+except QuerySuperseded:
+    st.stop()
 except Exception as e:
-    st.error(f"Error calculating total rows: {e}")
+    st.error(f"Error querying the {query_backend.name if query_backend is not None else query_backend_name} backend: {e}")
     st.session_state.total_rows = 0
+    df_page = pl.DataFrame()
 
-total_pages = math.ceil(st.session_state.total_rows / PAGE_SIZE) if PAGE_SIZE > 0 and st.session_state.total_rows > 0 else 1
-st.session_state.current_page = max(1, min(st.session_state.current_page, total_pages))
-offset = (st.session_state.current_page - 1) * PAGE_SIZE
-
-df_page = pl.DataFrame()
-
-if st.session_state.total_rows > 0 and offset < st.session_state.total_rows:
+# Option counts for the country and subcategory drop-downs, recounted only when the filters change.
+if query_backend is not None and (st.session_state.facet_counts is None or st.session_state.facet_counts["filters"] != st.session_state.filters):
     try:
-        df_page = filtered_lf.slice(offset, PAGE_SIZE).collect()
+        with rerun_profile.stage('facets'):
+            counts = query_backend.facet_counts(st.session_state.filters, collect=collect_query)
+        st.session_state.facet_counts = {"filters": copy.deepcopy(st.session_state.filters), "counts": counts} if counts is not None else None
+    except QuerySuperseded:
+        st.stop()
     except Exception as e:
-        st.error(f"Error fetching data for page {st.session_state.current_page}: {e}")
-        df_page = pl.DataFrame()
-
+        print(f"Warning: could not count the filter options, the drop-downs will show no counts: {e}")
+        st.session_state.facet_counts = None
+
+with rerun_profile.stage('render_rows') as stage:
+    table_rows, table_message = generate_table_rows_for_page(df_page)
+    stage.rows = df_page.height
+
+# Small results go to the component whole, once; it keeps serving narrower
+# filters, other sorts and other pages from them until it reports otherwise.
+client_snapshot = None
+if isinstance(query_backend, PolarsBackend) and 0 < st.session_state.total_rows <= client_side_max_rows:
+    shipped = st.session_state.client_snapshot
+    reported_snapshot_id = component_state_from_last_run.get("snapshot_id") if isinstance(component_state_from_last_run, dict) else None
+    if shipped is None or (reported_snapshot_id != shipped["id"] and shipped["filters"] != st.session_state.filters):
+        try:
+            with rerun_profile.stage('client_snapshot') as stage:
+                with query_scheduler.slot(INTERACTIVE, QUERY_TIMEOUT_SECONDS):
+                    df_snapshot = snapshot_query(base_lf, st.session_state.filters).collect(**COLLECT_OPTIONS)
+                snapshot_rows, _ = generate_table_rows_for_page(df_snapshot)
+                client_snapshot = encode_snapshot(df_snapshot, snapshot_rows, st.session_state.filters)
+                stage.rows = df_snapshot.height
+            st.session_state.client_snapshot = {"id": client_snapshot["id"], "filters": copy.deepcopy(st.session_state.filters)}
+        except Exception as e:
+            print(f"Warning: could not build a client-side snapshot, serving every change from the server: {e}")
+            st.session_state.client_snapshot = None
+else:
+    st.session_state.client_snapshot = None
 
-header_html, rows_html = generate_table_html_for_page(df_page)
+# The selected project's full record, read straight from where the index says it is stored.
+project_detail = None
+if st.session_state.selected_row is not None:
+    try:
+        with rerun_profile.stage('project_detail') as stage:
+            df_project = load_project_index(parquet_source_path).fetch(st.session_state.selected_row)
+            stage.rows = df_project.height
+        if not df_project.is_empty():
+            project_detail = project_detail_payload(df_project)
+    except Exception as e:
+        st.error(f"Error loading project {st.session_state.selected_row}: {e}")
 
 component_data_payload = {
     "current_page": st.session_state.current_page,
@@ -2022,26 +2728,36 @@ component_data_payload = {
     "total_rows": st.session_state.total_rows,
     "filters": st.session_state.filters,
     "sort_order": st.session_state.sort_order,
-    "header_html": header_html,
-    "rows_html": rows_html,
+    "columns": TABLE_COLUMNS,
+    "rows": table_rows,
+    "table_message": table_message,
     "filter_options": filter_options,
     "category_subcategory_map": category_subcategory_map,
     "min_max_values": min_max_values,
+    "selected_row": st.session_state.selected_row,
+    "project_detail": project_detail,
+    "client_snapshot": client_snapshot,
+    "client_snapshot_id": st.session_state.client_snapshot["id"] if st.session_state.client_snapshot else None,
+    "facet_counts": st.session_state.facet_counts["counts"] if st.session_state.facet_counts else None,
 }
 
 state_being_sent_this_run = {
     "page": st.session_state.current_page,
     "filters": st.session_state.filters,
     "sort_order": st.session_state.sort_order,
+    "selected_row": st.session_state.selected_row,
 }
-st.session_state.state_sent_to_component = json.loads(json.dumps(state_being_sent_this_run))
+with rerun_profile.stage('serialize_state'):
+    st.session_state.state_sent_to_component = json.loads(json.dumps(state_being_sent_this_run))
 
 
-component_return_value = table_component(
-    component_data=component_data_payload,
-    key="kickstarter_state",
-    default=None
-)
+# Streamlit serializes the payload inside the component call, so this stage covers payload serialization.
+with rerun_profile.stage('component'):
+    component_return_value = table_component(
+        component_data=component_data_payload,
+        key="kickstarter_state",
+        default=None
+    )
 
 needs_rerun = False
 if component_return_value is not None:
@@ -2052,12 +2768,14 @@ if component_return_value is not None:
             isinstance(component_return_value.get("filters"), dict)):
 
         try:
-            received_state_str = json.dumps(component_return_value, sort_keys=True)
-            sent_state_str = json.dumps(state_being_sent_this_run, sort_keys=True)
+            received_state_str = component_state_json(component_return_value)
+            sent_state_str = component_state_json(state_being_sent_this_run)
 
             if received_state_str != sent_state_str:
                 st.session_state.current_page = component_return_value["page"]
                 st.session_state.sort_order = component_return_value["sort_order"]
+                selected_row = component_return_value.get("selected_row")
+                st.session_state.selected_row = selected_row if isinstance(selected_row, int) else None
 
                 new_filters = component_return_value["filters"]
                 validated_filters = DEFAULT_FILTERS.copy()
@@ -2073,5 +2791,116 @@ if component_return_value is not None:
 
 st.session_state.kickstarter_state_value = component_return_value
 
+# The component reports its previous table render with the next state it sends;
+# the same report stays in the component value until the next one replaces it.
+render_timing = component_return_value.get("render_timing") if isinstance(component_return_value, dict) else None
+if isinstance(render_timing, dict) and isinstance(render_timing.get("ms"), (int, float)) and render_timing != st.session_state.last_render_timing:
+    st.session_state.last_render_timing = render_timing
+    rerun_profile.record('browser_render', render_timing["ms"] / 1000, render_timing.get("rows"))
+
 if needs_rerun:
-    st.rerun()
\ No newline at end of file
+    rerun_profile.finish(log=profile_log_enabled, metrics_path=metrics_path)
+    st.rerun()
+
+def render_export_status():
+    job = st.session_state.export_job
+    if job is None:
+        return
+    if job.running:
+        action = "Waiting for a query slot to export" if job.status == 'queued' else "Exporting"
+        st.caption(f"{action} {job.export_format}... {time.monotonic() - job.started_at:.0f}s")
+    elif st.session_state.export_polling:
+        # One full rerun stops the polling and swaps in the download button.
+        st.session_state.export_polling = False
+        st.rerun()
+    elif job.status == 'failed':
+        st.error(f"Export failed: {job.error}")
+    else:
+        st.download_button(
+            f"Download {job.file_name} ({job.size_bytes / 1_000_000:,.1f} MB)",
+            data=job.read,
+            file_name=job.file_name,
+            mime=job.mime,
+            on_click='ignore'
+        )
+
+with st.expander("Export results"):
+    export_format = st.radio("Format", list(EXPORT_FORMATS), horizontal=True)
+    export_job = st.session_state.export_job
+    if st.button("Export filtered projects", disabled=export_job is not None and export_job.running):
+        if export_job is not None:
+            export_job.discard()
+        try:
+            st.session_state.export_job = start_export(
+                apply_filters_and_sort(base_lf, st.session_state.filters, st.session_state.sort_order),
+                export_format,
+                export_dir
+            )
+        except Exception as e:
+            st.error(f"Error starting export: {e}")
+    export_job = st.session_state.export_job
+    # Poll a running export without rerunning the whole page.
+    st.session_state.export_polling = export_job is not None and export_job.running
+    st.fragment(render_export_status, run_every=1.0 if st.session_state.export_polling else None)()
+
+if similarity_enabled and st.session_state.selected_row is not None:
+    try:
+        with rerun_profile.stage('similar_projects') as stage:
+            similar_row_ids, similar_scores = load_similarity_index(parquet_source_path).similar_to_row(st.session_state.selected_row, k=PAGE_SIZE)
+            with query_scheduler.slot(INTERACTIVE, QUERY_TIMEOUT_SECONDS):
+                similar_df = fetch_rows(base_lf, similar_row_ids).with_columns(
+                    pl.Series('Similarity', similar_scores, dtype=pl.Float32)
+                )
+            stage.rows = similar_df.height
+        st.markdown("#### Similar projects")
+        st.dataframe(
+            similar_df.select('Project Name', 'Creator', 'Category', 'Subcategory', 'Country', 'State', 'Raw Goal', 'Raw Pledged', 'Similarity'),
+            hide_index=True
+        )
+    except StaleIndexError as e:
+        st.warning(f"{e} Similar projects are hidden until it is rebuilt with `python similar_projects.py {parquet_source_path}`.")
+    except Exception as e:
+        st.error(f"Error looking up projects similar to row {st.session_state.selected_row}: {e}")
+if os.path.exists(cube_path):
+    with st.expander("Summary dashboard"):
+        try:
+            cube = load_cube(cube_path)
+            group_by = st.selectbox("Group by", CUBE_DIMENSIONS + CUBE_TIME_DIMENSIONS)
+            with rerun_profile.stage('summary_cube') as stage:
+                summary_df = cube.query([group_by], explorer_slices(cube, st.session_state.filters)).sort(group_by)
+                stage.rows = summary_df.height
+            totals = summary_df.select(pl.col('Projects', 'Successful', 'Pledged').sum())
+            col_projects, col_rate, col_pledged = st.columns(3)
+            col_projects.metric("Projects", f"{totals['Projects'][0]:,}")
+            col_rate.metric("Success rate", f"{totals['Successful'][0] / max(totals['Projects'][0], 1):.1%}")
+            col_pledged.metric("Pledged", f"${totals['Pledged'][0]:,.0f}")
+            if summary_df.is_empty():
+                st.info("No projects match the current filters.")
+            else:
+                st.bar_chart(summary_df.select(group_by, 'Success Rate'), x=group_by, y='Success Rate')
+                st.dataframe(summary_df, hide_index=True)
+            st.caption("Aggregated from the summary cube using the category, country, state and date filters; search and range filters are not applied.")
+        except Exception as e:
+            st.error(f"Error loading summary cube from '{cube_path}': {e}")
+
+rerun_profile.finish(log=profile_log_enabled, metrics_path=metrics_path)
+
+if debug_overlay_enabled:
+    with st.expander("Rerun profile", expanded=True):
+        st.dataframe(pl.DataFrame(rerun_profile.as_dict()['stages'], schema={'stage': pl.Utf8, 'ms': pl.Float64, 'rows': pl.Int64}), hide_index=True)
+        st.caption(f"Total {rerun_profile.total_seconds * 1000:.1f} ms for this rerun.")
+        scheduler_metrics = query_scheduler.metrics()
+        st.caption(
+            f"Query scheduler: {scheduler_metrics['running']}/{scheduler_metrics['max_concurrent']} slots busy "
+            f"({scheduler_metrics['shared_slots']} shared with exports and background builds)."
+        )
+        st.dataframe(
+            pl.DataFrame({
+                'priority': list(scheduler_metrics['queued']),
+                'queued': list(scheduler_metrics['queued'].values()),
+                'admitted': [scheduler_metrics['admitted'][p] for p in scheduler_metrics['queued']],
+                'mean wait ms': [scheduler_metrics['mean_wait_ms'][p] for p in scheduler_metrics['queued']],
+                'timeouts': [scheduler_metrics['timeouts'][p] for p in scheduler_metrics['queued']],
+            }),
+            hide_index=True
+        )
@@ -0,0 +1,84 @@
+"""Check that every query backend serves the same pages as the Polars backend.
+
+Usage (from the repository root):
+
+    python -m benchmarks.backend_conformance [--data data.parquet] [--backends duckdb sqlite]
+
+Every filter case from `query_path.py` plus a few edge cases (case-insensitive
+and regex search, lower-case states, every date preset, an unknown sort order)
+is run under every sort order, for the first, second, middle and last page and
+one past the end. A backend conforms when the match count, the page served and
+the page's rows, in order and with the same dtypes, equal the Polars backend's.
+Backends whose optional package is missing are reported as skipped. The exit
+status is 1 if any backend differs.
+"""
+import argparse
+import json
+import math
+import sys
+
+from polars.testing import assert_frame_equal
+
+from benchmarks.query_path import BASE_FILTERS, FILTER_CASES
+from query_backends import BACKENDS, load_backend
+from query_engine import DATE_FILTER_DAYS, SORT_COLUMNS
+
+PAGE_SIZE = 10
+
+EDGE_CASES = {
+    'search_upper_case': {'search': 'GAME'},
+    'search_regex': {'search': 'board|card'},
+    'states_lower_case': {'states': ['successful', 'failed']},
+    'empty_result': {'categories': ['Games'], 'search': 'no project is called this'},
+    **{f"date_{preset.lower().replace(' ', '_')}": {'date': preset} for preset in DATE_FILTER_DAYS},
+}
+
+def _same_page(expected: tuple, actual: tuple) -> str | None:
+    if expected[:2] != actual[:2]:
+        return f"(total_rows, page) {expected[:2]} != {actual[:2]}"
+    # An empty page's columns are not part of the contract.
+    if expected[2].is_empty() and actual[2].is_empty():
+        return None
+    try:
+        assert_frame_equal(expected[2], actual[2])
+    except AssertionError as e:
+        return str(e).splitlines()[0]
+    return None
+
+def check_backend(reference, backend) -> list[dict]:
+    failures = []
+    for case, changes in {**FILTER_CASES, **EDGE_CASES}.items():
+        filters = {**BASE_FILTERS, **changes}
+        for sort_order in list(SORT_COLUMNS) + ['unknown']:
+            total_rows, _, _ = reference.fetch_page(filters, sort_order, 1, PAGE_SIZE)
+            last_page = max(1, math.ceil(total_rows / PAGE_SIZE))
+            for page in sorted({1, 2, max(1, last_page // 2), last_page, last_page + 1}):
+                difference = _same_page(
+                    reference.fetch_page(filters, sort_order, page, PAGE_SIZE),
+                    backend.fetch_page(filters, sort_order, page, PAGE_SIZE),
+                )
+                if difference is not None:
+                    failures.append({'case': case, 'sort_order': sort_order, 'page': page, 'difference': difference})
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default='data.parquet')
+    parser.add_argument('--backends', nargs='+', choices=[name for name in BACKENDS if name != 'polars'], default=[name for name in BACKENDS if name != 'polars'])
+    args = parser.parse_args()
+
+    reference = load_backend('polars', args.data)
+    report = {}
+    for name in args.backends:
+        try:
+            backend = load_backend(name, args.data)
+        except RuntimeError as e:
+            report[name] = {'status': 'skipped', 'reason': str(e)}
+            continue
+        failures = check_backend(reference, backend)
+        report[name] = {'status': 'failed' if failures else 'passed', 'failures': failures}
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if any(result['status'] == 'failed' for result in report.values()) else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Time each query backend over the explorer's workloads on synthetic data.
+
+Usage (from the repository root):
+
+    python -m benchmarks.backends [--rows 100000 1000000] [--backends polars duckdb sqlite]
+        [--repeat 5] [--data-dir benchmarks/data] [--output report.json]
+
+For every filter case and sort order of `query_path.py` each backend serves the
+first page and a page in the middle of the result (count included, as in an
+explorer rerun). The report has each backend's setup time (the SQLite copy is
+made on first use) and p50/p95 per workload, and names the fastest backend for
+every workload so the engine can be picked per workload. Backends whose
+optional package is missing are skipped.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import time
+
+import polars as pl
+
+from benchmarks.query_path import BASE_FILTERS, FILTER_CASES, SORT_ORDERS, _percentile
+from benchmarks.synthetic_data import ensure_dataset
+from query_backends import BACKENDS, load_backend
+
+PAGE_SIZE = 10
+DEFAULT_ROW_COUNTS = [100_000, 1_000_000]
+
+def time_backend(backend, repeat: int, filter_cases: list[str], sort_orders: list[str]) -> dict:
+    results = {}
+    for case in filter_cases:
+        filters = {**BASE_FILTERS, **FILTER_CASES[case]}
+        for sort_order in sort_orders:
+            total_rows, _, _ = backend.fetch_page(filters, sort_order, 1, PAGE_SIZE)
+            middle_page = max(1, math.ceil(total_rows / PAGE_SIZE) // 2)
+            for workload, page in (('first_page', 1), ('middle_page', middle_page)):
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    backend.fetch_page(filters, sort_order, page, PAGE_SIZE)
+                    timings.append((time.perf_counter() - start) * 1000)
+                results[f'{case}/{sort_order}/{workload}'] = {
+                    'rows': total_rows,
+                    'p50_ms': round(_percentile(timings, 50), 3),
+                    'p95_ms': round(_percentile(timings, 95), 3),
+                }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROW_COUNTS)
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=os.path.join('benchmarks', 'data'))
+    parser.add_argument('--filters', nargs='+', choices=list(FILTER_CASES), default=list(FILTER_CASES))
+    parser.add_argument('--sorts', nargs='+', choices=SORT_ORDERS, default=SORT_ORDERS)
+    parser.add_argument('--output', help="Also write the JSON report to this path.")
+    args = parser.parse_args()
+
+    report = {
+        'polars_version': pl.__version__,
+        'python_version': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'page_size': PAGE_SIZE,
+        'datasets': {},
+    }
+    for n_rows in args.rows:
+        path = ensure_dataset(n_rows, args.data_dir, args.seed)
+        dataset = {'backends': {}, 'fastest': {}}
+        for name in args.backends:
+            start = time.perf_counter()
+            try:
+                backend = load_backend(name, path)
+            except RuntimeError as e:
+                dataset['backends'][name] = {'skipped': str(e)}
+                continue
+            setup_seconds = time.perf_counter() - start
+            dataset['backends'][name] = {
+                'setup_seconds': round(setup_seconds, 3),
+                'workloads': time_backend(backend, args.repeat, args.filters, args.sorts),
+            }
+        timed = {name: result['workloads'] for name, result in dataset['backends'].items() if 'workloads' in result}
+        if timed:
+            for workload in next(iter(timed.values())):
+                dataset['fastest'][workload] = min(timed, key=lambda name: timed[name][workload]['p50_ms'])
+            dataset['fastest_count'] = {name: list(dataset['fastest'].values()).count(name) for name in timed}
+        report['datasets'][str(n_rows)] = dataset
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == '__main__':
+    main()
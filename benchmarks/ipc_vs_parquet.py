@@ -0,0 +1,94 @@
+"""Compare per-query latency and peak RSS of the parquet and Arrow IPC backends.
+
+Usage (from the repository root):
+
+    python -m benchmarks.ipc_vs_parquet data.parquet [--repeat 5]
+
+The IPC copy is written next to the parquet file on first use. Each backend runs
+in its own subprocess so that peak RSS is measured independently.
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+import polars as pl
+
+from query_engine import apply_filters_and_sort, scan_source, write_ipc_store
+
+PAGE_SIZE = 10
+
+BASE_FILTERS = {
+    'search': '',
+    'categories': ['All Categories'],
+    'subcategories': ['All Subcategories'],
+    'countries': ['All Countries'],
+    'states': ['All States'],
+    'date': 'All Time',
+    'ranges': {
+        'pledged': {'min': 0, 'max': float('inf')},
+        'goal': {'min': 0, 'max': float('inf')},
+        'raised': {'min': 0, 'max': float('inf')},
+    },
+}
+
+WORKLOADS = [
+    ('default', {}, 'popularity'),
+    ('newest', {}, 'newest'),
+    ('category', {'categories': ['Games', 'Technology']}, 'mostfunded'),
+    ('country_state', {'countries': ['United States'], 'states': ['Successful']}, 'mostbacked'),
+    ('search', {'search': 'game'}, 'popularity'),
+    ('last_5_years', {'date': 'Last 5 Years'}, 'enddate'),
+]
+
+def run_workloads(path: str, repeat: int) -> dict:
+    base_lf = scan_source(path)
+    results = {}
+    for name, overrides, sort_order in WORKLOADS:
+        filters = {**BASE_FILTERS, **overrides}
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            filtered_lf = apply_filters_and_sort(base_lf, filters, sort_order)
+            total_rows = filtered_lf.select(pl.len()).collect().item()
+            filtered_lf.slice(0, PAGE_SIZE).collect()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            'rows': total_rows,
+            'median_ms': round(statistics.median(timings), 2),
+            'max_ms': round(max(timings), 2),
+        }
+    # ru_maxrss is reported in KiB on Linux.
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {'source': path, 'peak_rss_mb': round(peak_rss_mb, 1), 'queries': results}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('parquet_path', nargs='?', default='data.parquet')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_workloads(args.parquet_path, args.repeat)))
+        return
+
+    ipc_path = os.path.splitext(args.parquet_path)[0] + '.arrow'
+    if not os.path.exists(ipc_path):
+        write_ipc_store(args.parquet_path, ipc_path)
+
+    report = {}
+    for backend, path in (('parquet', args.parquet_path), ('ipc', ipc_path)):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.ipc_vs_parquet', path, '--repeat', str(args.repeat), '--worker'],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        report[backend] = json.loads(output)
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""Run the explorer query path in out-of-core mode over a dataset 3x the memory ceiling.
+
+Usage (from the repository root):
+
+    python -m benchmarks.larger_than_memory [--memory-limit 2GB] [--factor 3]
+        [--data-dir benchmarks/data] [--output report.json]
+
+The memory ceiling defaults to the host's physical memory. A synthetic dataset
+whose in-memory size is `--factor` times the ceiling is generated once (see
+`synthetic_data.py`) and reused by later runs. A worker process then runs with
+`EXPLORER_OUT_OF_CORE=1` and `EXPLORER_MEMORY_LIMIT` set to the ceiling and
+goes through the explorer's queries: counts, first, keyset-next, middle and
+last pages under several sorts, and a sorted export of every row and column.
+
+The worker's resident memory is sampled throughout and it is killed if it
+goes over the ceiling. The run passes when every step completes under the
+ceiling; the exit status is 1 otherwise. The report has each step's latency,
+peak RSS and the most disk the spilled sort runs used.
+"""
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Before polars: the worker's streaming engine takes its memory budget from here.
+import out_of_core
+import polars as pl
+
+from benchmarks.query_path import BASE_FILTERS
+from benchmarks.synthetic_data import _load_vocabularies, ensure_dataset, generate_chunk
+from query_engine import COLLECT_OPTIONS, ROW_ID_COLUMN, PageCursors, apply_filters_and_sort, count_query, fetch_page, scan_source
+
+PAGE_SIZE = 10
+SAMPLE_ROWS = 100_000
+SAMPLE_INTERVAL_SECONDS = 0.05
+
+def _rss_bytes(pid: int) -> int | None:
+    try:
+        with open(f'/proc/{pid}/status', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def _directory_bytes(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def bytes_per_row(seed: int, metadata_path: str = 'filter_metadata.json') -> float:
+    # In-memory size of a plain collect, Row ID included.
+    sample = generate_chunk(0, SAMPLE_ROWS, seed, *_load_vocabularies(metadata_path))
+    return sample.estimated_size() / SAMPLE_ROWS + 4
+
+def run_steps(path: str, export_dir: str) -> dict:
+    lf = scan_source(path)
+    steps = {}
+
+    def step(name: str, run):
+        start = time.perf_counter()
+        rows = run()
+        steps[name] = {'rows': rows, 'ms': round((time.perf_counter() - start) * 1000, 1)}
+        # Progress goes to stderr so a killed run still shows how far it got.
+        print(f"{name}: {steps[name]}", file=sys.stderr, flush=True)
+
+    def page(filters: dict, sort_order: str, page_number: int, cursors: PageCursors | None = None):
+        _, _, df_page = fetch_page(lf, filters, sort_order, page_number, PAGE_SIZE, cursors)
+        return df_page.height
+
+    step('count_all', lambda: count_query(lf, BASE_FILTERS).collect(**COLLECT_OPTIONS).item())
+    step('count_search', lambda: count_query(lf, {**BASE_FILTERS, 'search': 'game'}).collect(**COLLECT_OPTIONS).item())
+    total_rows = steps['count_all']['rows']
+    last_page = max(1, math.ceil(total_rows / PAGE_SIZE))
+    cursors = PageCursors()
+    step('first_page_popularity', lambda: page(BASE_FILTERS, 'popularity', 1, cursors))
+    step('next_page_popularity', lambda: page(BASE_FILTERS, 'popularity', 2, cursors))
+    step('middle_page_newest', lambda: page(BASE_FILTERS, 'newest', last_page // 2))
+    step('last_page_mostfunded', lambda: page(BASE_FILTERS, 'mostfunded', last_page))
+    step('filtered_page_mostbacked', lambda: page({**BASE_FILTERS, 'categories': ['Games']}, 'mostbacked', 1))
+
+    export_path = os.path.join(export_dir, 'sorted_export.parquet')
+    def export():
+        apply_filters_and_sort(lf, BASE_FILTERS, 'mostfunded').select(pl.exclude(ROW_ID_COLUMN)).sink_parquet(export_path, **COLLECT_OPTIONS)
+        return pl.scan_parquet(export_path).select(pl.len()).collect().item()
+    step('sorted_export', export)
+    return steps
+
+def run_worker(path: str, memory_limit: int, spill_dir: str) -> dict:
+    env = dict(os.environ, EXPLORER_OUT_OF_CORE='1', EXPLORER_MEMORY_LIMIT=str(memory_limit), EXPLORER_SPILL_DIR=spill_dir)
+    worker = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.larger_than_memory', '--worker', path],
+        env=env, stdout=subprocess.PIPE, text=True,
+    )
+    peak_rss = peak_spill = 0
+    exceeded = False
+    last_spill_sample = 0.0
+    while worker.poll() is None:
+        peak_rss = max(peak_rss, _rss_bytes(worker.pid) or 0)
+        if peak_rss > memory_limit:
+            exceeded = True
+            worker.kill()
+            break
+        if time.monotonic() - last_spill_sample > 0.5:
+            peak_spill = max(peak_spill, _directory_bytes(spill_dir))
+            last_spill_sample = time.monotonic()
+        time.sleep(SAMPLE_INTERVAL_SECONDS)
+    output, _ = worker.communicate()
+    result = {
+        'passed': worker.returncode == 0 and not exceeded,
+        'exceeded_memory_limit': exceeded,
+        'exit_code': worker.returncode,
+        'peak_rss_mb': round(peak_rss / 1e6, 1),
+        'peak_spill_mb': round(peak_spill / 1e6, 1),
+    }
+    if worker.returncode == 0 and output.strip():
+        result['steps'] = json.loads(output)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--memory-limit', help="Memory ceiling, e.g. 2GB (default: physical memory).")
+    parser.add_argument('--factor', type=float, default=3.0, help="Dataset size as a multiple of the ceiling.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=os.path.join('benchmarks', 'data'))
+    parser.add_argument('--output', help="Also write the JSON report to this path.")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(args.worker))) as export_dir:
+            print(json.dumps(run_steps(args.worker, export_dir)))
+        return
+
+    memory_limit = out_of_core.parse_size(args.memory_limit) if args.memory_limit else out_of_core.physical_memory_bytes()
+    row_bytes = bytes_per_row(args.seed)
+    n_rows = math.ceil(args.factor * memory_limit / row_bytes)
+    print(f"Generating {n_rows:,} rows (~{n_rows * row_bytes / 1e9:.1f} GB in memory) for a {memory_limit / 1e9:.1f} GB ceiling...", file=sys.stderr)
+    path = ensure_dataset(n_rows, args.data_dir, args.seed)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    spill_dir = tempfile.mkdtemp(prefix='explorer-spill-', dir=args.data_dir)
+    try:
+        result = run_worker(path, memory_limit, spill_dir)
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    report = {
+        'polars_version': pl.__version__,
+        'cpu_count': os.cpu_count(),
+        'memory_limit_mb': round(memory_limit / 1e6, 1),
+        'spill_budget_mb': out_of_core.spill_budget_mb(memory_limit),
+        'dataset_rows': n_rows,
+        'dataset_memory_mb': round(n_rows * row_bytes / 1e6, 1),
+        'dataset_file_mb': round(os.path.getsize(path) / 1e6, 1),
+        **result,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    print(text)
+    sys.exit(0 if report['passed'] else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+"""Concurrent-session load test for the Data Explorer page.
+
+Usage (from the repository root):
+
+    python -m benchmarks.load_test [--data data.parquet] [--sessions 1 4 16] [--think-ms 0]
+        [--transitions recorded.json] [--url ws://localhost:8501] [--output report.json]
+
+Each simulated session speaks Streamlit's websocket protocol the way a browser
+tab does: it requests a script run, waits for the run to finish, and sends the
+next component state as the table component's widget value. The server
+therefore goes through the real rerun logic, including the component state
+comparison and the `st.rerun()` that follows a change, and every session holds
+its own `base_lf` and session state.
+
+The built-in scenario flips pages, types a search one keystroke at a time,
+drags the goal slider and changes sort order, starting from the state the
+server renders first. `--transitions` replays a JSON list of component states
+(or of {"kind": ..., "state": ...} objects) instead.
+
+By default a local server is started for the run with `streamlit run`; `--url`
+points at one that is already running. The report has per-transition and
+overall p50/p95 latency at each concurrency level and, for a server this script
+started (or `--server-pid`), the resident memory added per open session.
+"""
+import argparse
+import asyncio
+import copy
+import importlib.util
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+PAGE = 'Data_Explorer.py'
+COMPONENT_KEY = 'kickstarter_state'
+
+def _rss_mb(pid: int) -> float | None:
+    try:
+        with open(f'/proc/{pid}/status', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def default_scenario(initial_state: dict) -> list[tuple[str, dict]]:
+    state = copy.deepcopy(initial_state)
+    initial_filters = copy.deepcopy(initial_state['filters'])
+    steps = []
+
+    def step(kind: str, **changes):
+        nonlocal state
+        state = copy.deepcopy(state)
+        filter_changes = changes.pop('filters', {})
+        state.update(changes)
+        state['filters'].update(filter_changes)
+        steps.append((kind, state))
+
+    for page in (2, 3, 4, 3):
+        step('page_flip', page=page)
+    for prefix in ('g', 'ga', 'gam', 'game'):
+        step('search_keystroke', page=1, filters={'search': prefix})
+    goal_max = state['filters']['ranges']['goal']['max']
+    for fraction in (0.0001, 0.0005, 0.001, 0.005):
+        ranges = copy.deepcopy(state['filters']['ranges'])
+        ranges['goal']['min'] = round(goal_max * fraction)
+        step('slider_drag', page=1, filters={'ranges': ranges})
+    step('category_select', page=1, filters={'categories': ['Games']})
+    for sort_order in ('newest', 'mostfunded', 'mostbacked'):
+        step('sort_change', page=1, sort_order=sort_order)
+    step('reset', page=1, filters=initial_filters, sort_order=initial_state['sort_order'])
+    return steps
+
+def load_transitions(path: str) -> list[tuple[str, dict]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        recorded = json.load(f)
+    return [(entry.get('kind', 'recorded'), entry['state'] if 'state' in entry else entry) for entry in recorded]
+
+class SimulatedSession:
+    def __init__(self, url: str):
+        self.url = url
+        self.websocket = None
+        self.component_id = None
+        self.component_data = None
+
+    async def connect(self) -> None:
+        import websockets
+        self.websocket = await websockets.connect(f'{self.url}/_stcore/stream', subprotocols=['streamlit'], max_size=None)
+
+    async def close(self) -> None:
+        if self.websocket is not None:
+            await self.websocket.close()
+
+    async def run(self, component_state: dict | None = None, timeout: float = 300.0) -> tuple[float, int]:
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.page_script_hash = ''
+        if component_state is not None:
+            msg.rerun_script.widget_states.widgets.append(WidgetState(id=self.component_id, json_value=json.dumps(component_state)))
+        start = time.perf_counter()
+        await self.websocket.send(msg.SerializeToString())
+        script_runs = 0
+        while True:
+            fm = ForwardMsg()
+            fm.ParseFromString(await asyncio.wait_for(self.websocket.recv(), timeout))
+            kind = fm.WhichOneof('type')
+            if kind == 'delta' and fm.delta.WhichOneof('type') == 'new_element':
+                element = fm.delta.new_element
+                if element.WhichOneof('type') == 'component_instance' and element.component_instance.id.endswith(COMPONENT_KEY):
+                    self.component_id = element.component_instance.id
+                    self.component_data = json.loads(element.component_instance.json_args)['component_data']
+            elif kind == 'script_finished':
+                script_runs += 1
+                # A state change ends the first run early with st.rerun(); wait for the run that settles.
+                if fm.script_finished in (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR):
+                    return (time.perf_counter() - start) * 1000, script_runs
+
+    def current_state(self) -> dict:
+        return {
+            'page': self.component_data['current_page'],
+            'filters': self.component_data['filters'],
+            'sort_order': self.component_data['sort_order'],
+            'selected_row': self.component_data.get('selected_row'),
+        }
+
+async def run_session(session: SimulatedSession, scenario: list[tuple[str, dict]] | None, think_seconds: float, timeout: float, latencies: list, errors: list, loaded: asyncio.Event, all_loaded: asyncio.Event) -> None:
+    try:
+        await session.connect()
+        ms, _ = await session.run(timeout=timeout)
+        latencies.append(('initial_load', ms, 1))
+        if session.component_id is None:
+            raise RuntimeError("the table component was not rendered")
+    except Exception as e:
+        errors.append(f"initial load: {e}")
+        loaded.set()
+        return
+    loaded.set()
+    # Memory is sampled once every session has loaded, before transitions start.
+    await all_loaded.wait()
+    for kind, state in scenario or default_scenario(session.current_state()):
+        if think_seconds:
+            await asyncio.sleep(think_seconds)
+        try:
+            ms, script_runs = await session.run(state, timeout)
+            latencies.append((kind, ms, script_runs))
+        except Exception as e:
+            errors.append(f"{kind}: {e}")
+            return
+
+def _summary(values: list[float]) -> dict:
+    if len(values) == 1:
+        return {'count': 1, 'p50_ms': round(values[0], 2), 'p95_ms': round(values[0], 2)}
+    quantiles = statistics.quantiles(values, n=100, method='inclusive')
+    return {'count': len(values), 'p50_ms': round(quantiles[49], 2), 'p95_ms': round(quantiles[94], 2)}
+
+async def run_level(url: str, n_sessions: int, scenario: list[tuple[str, dict]] | None, think_seconds: float, timeout: float, server_pid: int | None) -> dict:
+    rss_before = _rss_mb(server_pid) if server_pid else None
+    latencies, errors = [], []
+    sessions = [SimulatedSession(url) for _ in range(n_sessions)]
+    loaded_events = [asyncio.Event() for _ in sessions]
+    all_loaded = asyncio.Event()
+
+    start = time.perf_counter()
+    tasks = [
+        asyncio.create_task(run_session(session, scenario, think_seconds, timeout, latencies, errors, loaded, all_loaded))
+        for session, loaded in zip(sessions, loaded_events)
+    ]
+    await asyncio.gather(*(event.wait() for event in loaded_events))
+    rss_loaded = _rss_mb(server_pid) if server_pid else None
+    all_loaded.set()
+    await asyncio.gather(*tasks)
+    wall_seconds = time.perf_counter() - start
+    for session in sessions:
+        await session.close()
+
+    by_kind = {}
+    for kind, ms, _ in latencies:
+        by_kind.setdefault(kind, []).append(ms)
+    transitions = [ms for kind, ms, _ in latencies if kind != 'initial_load']
+    report = {
+        'sessions': n_sessions,
+        'wall_seconds': round(wall_seconds, 2),
+        'transitions_per_second': round(len(transitions) / wall_seconds, 2) if wall_seconds else None,
+        'script_runs': sum(runs for _, _, runs in latencies),
+        'transition': _summary(transitions) if transitions else None,
+        'by_transition': {kind: _summary(values) for kind, values in by_kind.items()},
+        'errors': errors,
+    }
+    if rss_before is not None and rss_loaded is not None:
+        report['server_rss_mb_before'] = round(rss_before, 1)
+        report['server_rss_mb_loaded'] = round(rss_loaded, 1)
+        report['server_rss_mb_per_session'] = round((rss_loaded - rss_before) / n_sessions, 2)
+    return report
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def start_server(data_path: str | None, startup_timeout: float = 60.0) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = dict(os.environ)
+    if data_path:
+        env['EXPLORER_DATA_PATH'] = data_path
+    server = subprocess.Popen(
+        [
+            sys.executable, '-m', 'streamlit', 'run', PAGE, '--server.headless', 'true',
+            '--server.port', str(port), '--browser.gatherUsageStats', 'false',
+        ],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1) as response:
+                if response.status == 200:
+                    return server, f'ws://127.0.0.1:{port}'
+        except OSError:
+            pass
+        if server.poll() is not None:
+            break
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"Streamlit server did not become healthy on port {port}.")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', help="Data source for a server started by this script (sets EXPLORER_DATA_PATH).")
+    parser.add_argument('--url', help="Websocket base URL of a running server, e.g. ws://localhost:8501.")
+    parser.add_argument('--server-pid', type=int, help="PID of the server behind --url, for memory figures.")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--think-ms', type=float, default=0.0, help="Pause before each transition.")
+    parser.add_argument('--transitions', help="JSON list of component states to replay instead of the built-in scenario.")
+    parser.add_argument('--timeout', type=float, default=300.0, help="Per-run timeout in seconds.")
+    parser.add_argument('--output', help="Also write the JSON report to this path.")
+    args = parser.parse_args()
+
+    # Checked before a server is started; SimulatedSession imports it on connect.
+    if importlib.util.find_spec('websockets') is None:
+        sys.exit("benchmarks.load_test needs the 'websockets' package (pip install websockets).")
+
+    scenario = load_transitions(args.transitions) if args.transitions else None
+    server = None
+    if args.url:
+        url, server_pid = args.url.rstrip('/'), args.server_pid
+    else:
+        server, url = start_server(args.data)
+        server_pid = server.pid
+
+    try:
+        report = {'page': PAGE, 'url': url, 'data': args.data or os.environ.get('EXPLORER_DATA_PATH', 'data.parquet'), 'levels': []}
+        for n_sessions in args.sessions:
+            report['levels'].append(asyncio.run(run_level(url, n_sessions, scenario, args.think_ms / 1000, args.timeout, server_pid)))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""Latency, peak RSS and throughput of the explorer query path on synthetic data.
+
+Usage (from the repository root):
+
+    python -m benchmarks.query_path [--rows 100000 1000000 10000000] [--repeat 5]
+        [--data-dir benchmarks/data] [--output report.json]
+
+Synthetic datasets are generated once per row count (see `synthetic_data.py`)
+and reused by later runs. Every row count is measured in its own subprocess so
+peak RSS is independent. For each filter/sort combination the benchmark runs
+the count query, the first page's row-ID query and the row gather, the same
+collects as an explorer rerun, and reports p50/p95 latency. The JSON
+report is stable in shape, so two runs can be diffed directly.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+import polars as pl
+
+from benchmarks.synthetic_data import ensure_dataset
+from query_engine import ROW_ID_COLUMN, count_query, gather_rows, page_keys_query, scan_source
+
+PAGE_SIZE = 10
+DEFAULT_ROW_COUNTS = [100_000, 1_000_000, 10_000_000]
+
+BASE_FILTERS = {
+    'search': '',
+    'categories': ['All Categories'],
+    'subcategories': ['All Subcategories'],
+    'countries': ['All Countries'],
+    'states': ['All States'],
+    'date': 'All Time',
+    'ranges': {
+        'pledged': {'min': 0, 'max': float('inf')},
+        'goal': {'min': 0, 'max': float('inf')},
+        'raised': {'min': 0, 'max': float('inf')},
+    },
+}
+
+FILTER_CASES = {
+    'none': {},
+    'category': {'categories': ['Games']},
+    'subcategory': {'categories': ['Games'], 'subcategories': ['Tabletop Games']},
+    'country_state': {'countries': ['United States'], 'states': ['Successful']},
+    'search': {'search': 'game'},
+    'goal_range': {'ranges': {**BASE_FILTERS['ranges'], 'goal': {'min': 1000, 'max': 10000}}},
+    'last_5_years': {'date': 'Last 5 Years'},
+    'combined': {
+        'categories': ['Technology', 'Design'],
+        'countries': ['United States'],
+        'date': 'Last 10 Years',
+        'ranges': {**BASE_FILTERS['ranges'], 'raised': {'min': 100, 'max': float('inf')}},
+    },
+}
+
+SORT_ORDERS = ['popularity', 'newest', 'mostfunded', 'mostbacked', 'enddate']
+
+def _percentile(values: list[float], q: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+def run_matrix(path: str, repeat: int, filter_cases: list[str], sort_orders: list[str]) -> dict:
+    base_lf = scan_source(path)
+    total_source_rows = base_lf.select(pl.len()).collect().item()
+    results = {}
+    all_timings = []
+    for case in filter_cases:
+        filters = {**BASE_FILTERS, **FILTER_CASES[case]}
+        for sort_order in sort_orders:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                total_rows = count_query(base_lf, filters).collect().item()
+                row_ids = page_keys_query(base_lf, filters, sort_order, 0, PAGE_SIZE).collect()[ROW_ID_COLUMN].to_list()
+                gather_rows(base_lf, row_ids).collect()
+                timings.append((time.perf_counter() - start) * 1000)
+            all_timings.extend(timings)
+            results[f'{case}/{sort_order}'] = {
+                'rows': total_rows,
+                'p50_ms': round(_percentile(timings, 50), 3),
+                'p95_ms': round(_percentile(timings, 95), 3),
+            }
+    wall_seconds = sum(all_timings) / 1000
+    # ru_maxrss is reported in KiB on Linux.
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        'source': path,
+        'source_rows': total_source_rows,
+        'repeat': repeat,
+        'p50_ms': round(_percentile(all_timings, 50), 3),
+        'p95_ms': round(_percentile(all_timings, 95), 3),
+        'queries_per_second': round(len(all_timings) / wall_seconds, 2),
+        'source_rows_per_second': round(total_source_rows * len(all_timings) / wall_seconds),
+        'peak_rss_mb': round(peak_rss_mb, 1),
+        'queries': results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROW_COUNTS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=os.path.join('benchmarks', 'data'))
+    parser.add_argument('--filters', nargs='+', choices=list(FILTER_CASES), default=list(FILTER_CASES))
+    parser.add_argument('--sorts', nargs='+', choices=SORT_ORDERS, default=SORT_ORDERS)
+    parser.add_argument('--output', help="Also write the JSON report to this path.")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_matrix(args.worker, args.repeat, args.filters, args.sorts)))
+        return
+
+    report = {
+        'polars_version': pl.__version__,
+        'python_version': platform.python_version(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'page_size': PAGE_SIZE,
+        'datasets': {},
+    }
+    for n_rows in args.rows:
+        path = ensure_dataset(n_rows, args.data_dir, args.seed)
+        output = subprocess.run(
+            [
+                sys.executable, '-m', 'benchmarks.query_path', '--worker', path,
+                '--repeat', str(args.repeat), '--filters', *args.filters, '--sorts', *args.sorts,
+            ],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        report['datasets'][str(n_rows)] = json.loads(output)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Synthetic Kickstarter-shaped datasets for benchmarks.
+
+Usage (from the repository root):
+
+    python -m benchmarks.synthetic_data 1000000 synthetic_1m.parquet [--seed 0]
+
+Rows have every column the explorer reads, with categories, subcategories and
+countries taken from `filter_metadata.json`. Country and category frequencies
+are skewed, pledged amounts follow the project state and goal, and project
+names are drawn from a small vocabulary so that search filters match a
+realistic share of rows. Generation is deterministic for a given seed and row
+count, and runs in fixed-size chunks so 10M-row files fit in modest memory.
+"""
+import argparse
+import datetime
+import json
+import os
+import tempfile
+
+import numpy as np
+import polars as pl
+
+CHUNK_ROWS = 1_000_000
+STATE_WEIGHTS = {'Successful': 0.36, 'Failed': 0.50, 'Canceled': 0.10, 'Live': 0.03, 'Suspended': 0.01}
+NAME_WORDS = [
+    'game', 'board', 'card', 'album', 'film', 'documentary', 'book', 'novel', 'comic', 'art',
+    'studio', 'smart', 'watch', 'camera', 'coffee', 'kitchen', 'fashion', 'bag', 'tour', 'festival',
+    'theater', 'dance', 'photo', 'journal', 'magazine', 'design', 'lamp', 'robot', 'kit', 'garden',
+    'the', 'new', 'first', 'project', 'adventure', 'story', 'world', 'city', 'music', 'craft',
+]
+FIRST_LAUNCH = datetime.date(2009, 4, 21)
+LAST_LAUNCH = datetime.date(2025, 2, 20)
+
+def _load_vocabularies(metadata_path: str) -> tuple[list[str], dict, list[str]]:
+    with open(metadata_path, 'r', encoding='utf-8') as f:
+        metadata = json.load(f)
+    categories = [c for c in metadata['categories'] if c != 'All Categories']
+    subcategory_map = {c: metadata['category_subcategory_map'][c] for c in categories}
+    countries = [c for c in metadata['countries'] if c != 'All Countries']
+    # Country popularity follows list order under the Zipf-like weights below: the
+    # United States first, the rest in a fixed shuffled order rather than alphabetically.
+    rest = [c for c in countries if c != 'United States']
+    rest = [rest[i] for i in np.random.default_rng(0).permutation(len(rest))]
+    countries = (['United States'] if 'United States' in countries else []) + rest
+    return categories, subcategory_map, countries
+
+def _zipf_weights(n: int, exponent: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+def generate_chunk(start_row: int, n: int, seed: int, categories: list[str], subcategory_map: dict, countries: list[str]) -> pl.DataFrame:
+    rng = np.random.default_rng([seed, start_row])
+
+    category_idx = rng.choice(len(categories), size=n, p=_zipf_weights(len(categories), 0.6))
+    sub_counts = np.array([len(subcategory_map[c]) for c in categories])
+    sub_offsets = np.concatenate([[0], np.cumsum(sub_counts)[:-1]])
+    flat_subcategories = [s for c in categories for s in subcategory_map[c]]
+    subcategory_idx = sub_offsets[category_idx] + rng.integers(0, 1 << 30, size=n) % sub_counts[category_idx]
+    country_idx = rng.choice(len(countries), size=n, p=_zipf_weights(len(countries), 1.2))
+
+    states = list(STATE_WEIGHTS)
+    state_idx = rng.choice(len(states), size=n, p=np.array(list(STATE_WEIGHTS.values())))
+    goal = np.maximum(1.0, np.round(rng.lognormal(8.5, 1.4, size=n)))
+    # Successful projects end above their goal; the rest mostly fall well short.
+    successful = np.array(states)[state_idx] == 'Successful'
+    ratio = np.where(successful, 1.0 + rng.lognormal(-1.0, 1.0, size=n), rng.beta(0.6, 3.0, size=n))
+    pledged = np.round(goal * ratio, 2)
+    backers = rng.poisson(np.maximum(pledged / 75.0, 0.1)).astype(np.int64)
+
+    span_days = (LAST_LAUNCH - FIRST_LAUNCH).days
+    launch = np.datetime64(FIRST_LAUNCH, 'us') + (rng.integers(0, span_days * 86400, size=n) * 1_000_000).astype('timedelta64[us]')
+    deadline = launch + (rng.integers(1, 61, size=n) * 86400 * 1_000_000).astype('timedelta64[us]')
+
+    name_words = rng.integers(0, len(NAME_WORDS), size=(3, n))
+    return pl.DataFrame({
+        '_row': np.arange(start_row, start_row + n),
+        '_creator': rng.integers(0, max(n // 3, 1), size=n) + start_row,
+        '_word1': name_words[0], '_word2': name_words[1], '_word3': name_words[2],
+        'Country': pl.Series(countries).gather(country_idx),
+        'State': pl.Series(states).gather(state_idx),
+        'Category': pl.Series(categories).gather(category_idx),
+        'Subcategory': pl.Series(flat_subcategories).gather(subcategory_idx),
+        'Raw Pledged': pledged,
+        'Raw Goal': goal,
+        'Raw Raised': np.round(pledged / goal * 100, 2),
+        'Raw Date': launch,
+        'Raw Deadline': deadline,
+        'Backer Count': backers,
+        'Popularity Score': np.round(np.log1p(backers) / 10.0 + rng.random(size=n) * 0.1, 6),
+    }).select(
+        pl.concat_str(
+            [pl.lit(pl.Series(NAME_WORDS).str.to_titlecase().implode()).list.get(pl.col(f'_word{i}')) for i in (1, 2, 3)],
+            separator=' ',
+        ).alias('Project Name'),
+        pl.format('creator_{}', '_creator').alias('Creator'),
+        pl.format('${}', pl.col('Raw Pledged').floor().cast(pl.Int64)).alias('Pledged Amount'),
+        pl.format('https://www.kickstarter.com/projects/creator_{}/project-{}', '_creator', '_row').alias('Link'),
+        pl.exclude('_row', '_creator', '_word1', '_word2', '_word3'),
+    )
+
+def write_dataset(n_rows: int, output_path: str, seed: int = 0, metadata_path: str = 'filter_metadata.json') -> str:
+    categories, subcategory_map, countries = _load_vocabularies(metadata_path)
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_path))) as parts_dir:
+        part_paths = []
+        for start_row in range(0, n_rows, CHUNK_ROWS):
+            chunk = generate_chunk(start_row, min(CHUNK_ROWS, n_rows - start_row), seed, categories, subcategory_map, countries)
+            part_path = os.path.join(parts_dir, f'part-{len(part_paths):05d}.parquet')
+            chunk.write_parquet(part_path)
+            part_paths.append(part_path)
+        pl.scan_parquet(part_paths).sink_parquet(output_path)
+    return output_path
+
+def ensure_dataset(n_rows: int, data_dir: str, seed: int = 0, metadata_path: str = 'filter_metadata.json') -> str:
+    path = os.path.join(data_dir, f'synthetic_{n_rows}_seed{seed}.parquet')
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        write_dataset(n_rows, path, seed, metadata_path)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('rows', type=int)
+    parser.add_argument('output_path')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--metadata', default='filter_metadata.json')
+    args = parser.parse_args()
+    write_dataset(args.rows, args.output_path, args.seed, args.metadata)
+    print(f"Wrote {args.rows:,} synthetic projects to '{args.output_path}'.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Latency of single-project what-if predictions.
+
+Usage (from the repository root):
+
+    python -m benchmarks.what_if_latency [--model what_if_model.npz] [--iterations 100000]
+
+Reports p50/p95/p99 per-call latency in microseconds for random what-if inputs,
+excluding the one-off model load.
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from success_model import WHAT_IF_MODEL_PATH, load_what_if_predictor
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=WHAT_IF_MODEL_PATH)
+    parser.add_argument('--iterations', type=int, default=100_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    predictor = load_what_if_predictor(args.model)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    rng = random.Random(0)
+    inputs = [
+        (rng.uniform(100, 100_000), rng.choice(predictor.categories), rng.choice(predictor.countries), rng.randint(1, 60))
+        for _ in range(args.iterations)
+    ]
+    timings_us = []
+    for goal, category, country, duration in inputs:
+        call_start = time.perf_counter()
+        predictor.predict_one(goal, category, country, duration)
+        timings_us.append((time.perf_counter() - call_start) * 1e6)
+
+    quantiles = statistics.quantiles(timings_us, n=100)
+    print(json.dumps({
+        'iterations': args.iterations,
+        'model_load_ms': round(load_ms, 2),
+        'p50_us': round(quantiles[49], 2),
+        'p95_us': round(quantiles[94], 2),
+        'p99_us': round(quantiles[98], 2),
+        'max_us': round(max(timings_us), 2),
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Whole-result snapshots for filtering, sorting and paging in the browser.
+
+When the explorer's filters leave few enough projects, every matching row is
+shipped to the table component once, in columnar form: the display cells per
+column, and each filter and sort column as a plain array (text with few
+distinct values as labels plus codes, text sharing a prefix such as links with
+the prefix sent once, datetimes as epoch microseconds).
+The component's worker then serves further narrowing, any sort order and any
+page from the snapshot without a rerun. The snapshot's own filters tell it
+what it covers; a change outside them (a wider range, another category, a
+regex search) goes back to the server. The filter and sort registry is sent
+along, so the browser applies the same rules as `query_engine.apply_filters`.
+"""
+import os
+import uuid
+
+import polars as pl
+
+from query_engine import (
+    DATE_COLUMN, DATE_FILTER_DAYS, FACET_FILTERS, LIST_FILTER_COLUMNS, RANGE_COLUMNS, ROW_ID_COLUMN, SEARCH_COLUMNS, SORT_COLUMNS,
+    apply_filters, date_cutoff, explorer_columns
+)
+
+# Text columns with at most this many distinct values are sent as labels plus codes.
+MAX_DICTIONARY_LABELS = 1024
+# Shorter common prefixes are not worth stripping.
+MIN_SHARED_PREFIX = 8
+
+def key_columns(column_names: list[str]) -> list[str]:
+    # The columns the browser filters and sorts on.
+    wanted = (
+        SEARCH_COLUMNS + [col for col, _ in LIST_FILTER_COLUMNS.values()] + list(RANGE_COLUMNS.values())
+        + [DATE_COLUMN] + [col for col, _ in SORT_COLUMNS.values()]
+    )
+    return [col for col in dict.fromkeys(wanted) if col in column_names]
+
+def snapshot_query(lf: pl.LazyFrame, filters: dict) -> pl.LazyFrame:
+    # Rows in Row ID order, which is the order ties and unsorted results take.
+    return apply_filters(lf.select(explorer_columns(lf.collect_schema().names())), filters).sort(ROW_ID_COLUMN)
+
+def _encode_values(values: list):
+    if not all(value is None or isinstance(value, str) for value in values):
+        return values
+    codes = {}
+    encoded = [codes.setdefault(value, len(codes)) for value in values]
+    if len(codes) <= MAX_DICTIONARY_LABELS:
+        return {'labels': list(codes), 'codes': encoded}
+    prefix = os.path.commonprefix([value for value in values if value is not None])
+    if len(prefix) >= MIN_SHARED_PREFIX:
+        return {'prefix': prefix, 'values': [None if value is None else value[len(prefix):] for value in values]}
+    return values
+
+def _encode_column(series: pl.Series):
+    if series.dtype.is_temporal():
+        return series.cast(pl.Datetime('us')).dt.epoch('us').to_list()
+    if series.dtype in (pl.Utf8, pl.Categorical) or isinstance(series.dtype, pl.Enum):
+        return _encode_values(series.cast(pl.Utf8).to_list())
+    return series.to_list()
+
+def encode_snapshot(df: pl.DataFrame, rows: list[dict], filters: dict) -> dict:
+    # `rows` are the table rows for `df`, as the component renders them.
+    columns = key_columns(df.columns)
+    return {
+        'id': uuid.uuid4().hex,
+        'filters': filters,
+        'registry': {
+            'search': SEARCH_COLUMNS,
+            'lists': LIST_FILTER_COLUMNS,
+            'ranges': RANGE_COLUMNS,
+            'date': DATE_COLUMN,
+            'sorts': SORT_COLUMNS,
+            'facets': FACET_FILTERS,
+        },
+        # Cutoffs fixed when the snapshot was taken, so every date preset agrees with it.
+        'date_cutoffs': {
+            preset: pl.Series([date_cutoff(preset)], dtype=pl.Datetime('us')).dt.epoch('us')[0]
+            for preset in DATE_FILTER_DAYS
+        },
+        'float32_columns': [col for col in columns if df[col].dtype == pl.Float32],
+        'row_ids': df[ROW_ID_COLUMN].to_list(),
+        'cells': [_encode_values([row['cells'][i] for row in rows]) for i in range(len(rows[0]['cells']))] if rows else [],
+        'columns': {col: _encode_column(df[col]) for col in columns},
+    }
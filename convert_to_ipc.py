@@ -0,0 +1,8 @@
+import sys
+from query_engine import write_ipc_store
+
+if __name__ == "__main__":
+    source_path = sys.argv[1] if len(sys.argv) > 1 else "data.parquet"
+    target_path = sys.argv[2] if len(sys.argv) > 2 else "data.arrow"
+    write_ipc_store(source_path, target_path)
+    print(f"Wrote uncompressed Arrow IPC store to '{target_path}'. Set EXPLORER_DATA_PATH={target_path} to serve it.")
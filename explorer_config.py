@@ -0,0 +1,92 @@
+"""Static Data Explorer configuration, built once per process.
+
+Streamlit re-executes the page script on every interaction. The filter
+options, category map, slider bounds and default filters only change when
+`filter_metadata.json` does, and the table component's HTML only when the
+code does, so both are cached at process level: the metadata by file mtime,
+the component by its content. Cached objects are shared by every session and
+must be treated as read-only; copy them before changing anything.
+"""
+import copy
+import functools
+import json
+import os
+import tempfile
+
+import streamlit.components.v1 as components
+
+FILTER_METADATA_PATH = "filter_metadata.json"
+DEFAULT_DATE_RANGES = ['All Time', 'Last Month', 'Last 6 Months', 'Last Year', 'Last 5 Years', 'Last 10 Years']
+DEFAULT_MIN_MAX_VALUES = {
+    'pledged': {'min': 0, 'max': 1000},
+    'goal': {'min': 0, 'max': 10000},
+    'raised': {'min': 0, 'max': 500}
+}
+
+class FilterConfig:
+    def __init__(self, filter_options: dict, category_subcategory_map: dict, min_max_values: dict, default_filters: dict):
+        self.filter_options = filter_options
+        self.category_subcategory_map = category_subcategory_map
+        self.min_max_values = min_max_values
+        self.default_filters = default_filters
+
+def build_filter_config(metadata: dict, predictions_available: bool) -> FilterConfig:
+    filter_options = {
+        'categories': metadata.get('categories') or ['All Categories'],
+        'countries': metadata.get('countries') or ['All Countries'],
+        'states': metadata.get('states') or ['All States'],
+        'date_ranges': metadata.get('date_ranges', DEFAULT_DATE_RANGES),
+    }
+
+    category_subcategory_map = copy.deepcopy(metadata.get('category_subcategory_map', {'All Categories': ['All Subcategories']}))
+    if 'All Categories' not in category_subcategory_map:
+        category_subcategory_map['All Categories'] = ['All Subcategories']
+    if category_subcategory_map['All Categories'] and 'All Subcategories' not in category_subcategory_map['All Categories']:
+        category_subcategory_map['All Categories'].insert(0, 'All Subcategories')
+
+    all_subs = set(metadata.get('subcategories', ['All Subcategories']))
+    all_cats_subs = set(category_subcategory_map.get('All Categories', []))
+    missing_subs = all_subs - all_cats_subs
+    if missing_subs:
+        category_subcategory_map['All Categories'].extend(sorted(list(missing_subs)))
+        category_subcategory_map['All Categories'] = sorted(list(set(category_subcategory_map['All Categories'])), key=lambda x: (x != 'All Subcategories', x))
+
+    loaded_min_max = metadata.get('min_max_values', {})
+    min_max_values = {key: loaded_min_max.get(key, default) for key, default in DEFAULT_MIN_MAX_VALUES.items()}
+    if predictions_available:
+        min_max_values['predicted'] = {'min': 0, 'max': 100}
+
+    default_filters = {
+        'search': '',
+        'categories': ['All Categories'],
+        'subcategories': ['All Subcategories'],
+        'countries': ['All Countries'],
+        'states': ['All States'],
+        'date': 'All Time',
+        'ranges': {key: {'min': bounds['min'], 'max': bounds['max']} for key, bounds in min_max_values.items()}
+    }
+    return FilterConfig(filter_options, category_subcategory_map, min_max_values, default_filters)
+
+@functools.lru_cache(maxsize=4)
+def _load_filter_config_cached(path: str, mtime: float, predictions_available: bool) -> FilterConfig:
+    with open(path, 'r', encoding='utf-8') as f:
+        metadata = json.load(f)
+    return build_filter_config(metadata, predictions_available)
+
+def load_filter_config(path: str = FILTER_METADATA_PATH, predictions_available: bool = False) -> FilterConfig:
+    return _load_filter_config_cached(os.path.abspath(path), os.path.getmtime(path), predictions_available)
+
+@functools.lru_cache(maxsize=8)
+def _declare_html_component_cached(name: str, page_html: str):
+    component_dir = os.path.join(tempfile.gettempdir(), name)
+    os.makedirs(component_dir, exist_ok=True)
+    with open(os.path.join(component_dir, 'index.html'), 'w') as f:
+        f.write(page_html)
+    return components.declare_component(name, path=component_dir)
+
+def declare_html_component(name: str, page_html: str):
+    # Written and declared once per process and page content; rewritten if
+    # something has cleaned the temporary directory since.
+    if not os.path.exists(os.path.join(tempfile.gettempdir(), name, 'index.html')):
+        _declare_html_component_cached.cache_clear()
+    return _declare_html_component_cached(name, page_html)
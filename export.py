@@ -0,0 +1,80 @@
+"""Background CSV/Parquet export of the explorer's filtered result.
+
+The filtered LazyFrame is written with Polars' streaming sinks, so rows reach a
+temporary file in batches and peak memory does not grow with the number of
+matching projects. The sink runs on a worker thread once the query scheduler
+gives it a slot, behind any interactive page fetches; the explorer polls the
+job and offers the finished file as a download once it is complete.
+"""
+import os
+import tempfile
+import threading
+import time
+import weakref
+
+import polars as pl
+
+from query_engine import COLLECT_OPTIONS, ROW_ID_COLUMN
+from query_scheduler import EXPORT, scheduler
+
+EXPORT_FORMATS = {
+    'CSV': ('.csv', 'text/csv'),
+    'Parquet': ('.parquet', 'application/vnd.apache.parquet'),
+}
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+class ExportJob:
+    def __init__(self, lf: pl.LazyFrame, export_format: str, directory: str | None = None):
+        suffix, self.mime = EXPORT_FORMATS[export_format]
+        fd, self.path = tempfile.mkstemp(prefix='kickstarter_export_', suffix=suffix, dir=directory)
+        os.close(fd)
+        self.export_format = export_format
+        self.file_name = f"kickstarter_projects{suffix}"
+        self.status = 'queued'
+        self.error = None
+        self.size_bytes = 0
+        self.started_at = time.monotonic()
+        self.elapsed = None
+        # The file goes away with the job, e.g. when its session ends.
+        self._cleanup = weakref.finalize(self, _remove_file, self.path)
+        self._thread = threading.Thread(target=self._run, args=(lf.select(pl.exclude(ROW_ID_COLUMN)),), daemon=True)
+        self._thread.start()
+
+    def _run(self, lf: pl.LazyFrame) -> None:
+        try:
+            with scheduler.slot(EXPORT):
+                self.status = 'running'
+                if self.export_format == 'CSV':
+                    lf.sink_csv(self.path, **COLLECT_OPTIONS)
+                else:
+                    lf.sink_parquet(self.path, **COLLECT_OPTIONS)
+            self.size_bytes = os.path.getsize(self.path)
+            self.status = 'done'
+        except Exception as e:
+            self.error = str(e)
+            self.status = 'failed'
+        finally:
+            self.elapsed = time.monotonic() - self.started_at
+
+    @property
+    def running(self) -> bool:
+        return self.status in ('queued', 'running')
+
+    def read(self) -> bytes:
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def discard(self) -> None:
+        # A running sink still holds the file; it is removed when the job is collected instead.
+        if not self.running:
+            self._cleanup()
+
+def start_export(lf: pl.LazyFrame, export_format: str, directory: str | None = None) -> ExportJob:
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{export_format}'.")
+    return ExportJob(lf, export_format, directory)
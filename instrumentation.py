@@ -0,0 +1,131 @@
+"""Per-rerun stage timings for the explorer.
+
+    profile = RerunProfile()
+    with profile.stage('count') as stage:
+        total = ...
+        stage.rows = total
+    profile.finish(log=True, metrics_path='/var/lib/node_exporter/explorer.prom')
+
+A finished profile can be printed as one JSON line and is folded into
+process-wide histograms, which are written in the Prometheus text exposition
+format (suitable for node_exporter's textfile collector) so regressions show
+up on dashboards without attaching a profiler.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+
+# Histogram bucket upper bounds in seconds.
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_metrics_lock = threading.Lock()
+_stage_histograms = {}
+_stage_rows = {}
+_rerun_count = 0
+# Callables returning extra exposition lines, e.g. the query scheduler's gauges.
+_collectors = []
+
+class StageTiming:
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.rows = None
+
+class RerunProfile:
+    def __init__(self):
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.stages = []
+        self.total_seconds = None
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        timing = StageTiming(name)
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.seconds = time.perf_counter() - start
+            self.stages.append(timing)
+
+    def record(self, name: str, seconds: float, rows: int | None = None) -> None:
+        # A stage timed outside this process, e.g. the browser's table render.
+        timing = StageTiming(name)
+        timing.seconds = seconds
+        timing.rows = rows
+        self.stages.append(timing)
+
+    def as_dict(self) -> dict:
+        return {
+            'started_at': self.started_at,
+            'total_ms': round((self.total_seconds or 0.0) * 1000, 3),
+            'stages': [
+                {'stage': s.name, 'ms': round(s.seconds * 1000, 3), 'rows': s.rows}
+                for s in self.stages
+            ],
+        }
+
+    def finish(self, log: bool = False, metrics_path: str | None = None) -> None:
+        if self.total_seconds is not None:
+            return
+        self.total_seconds = time.perf_counter() - self._start
+        _record(self)
+        if log:
+            print(json.dumps({'event': 'explorer_rerun', **self.as_dict()}))
+        if metrics_path:
+            try:
+                write_metrics(metrics_path)
+            except OSError as e:
+                print(f"Warning: could not write metrics to '{metrics_path}': {e}")
+
+def _record(profile: RerunProfile) -> None:
+    global _rerun_count
+    with _metrics_lock:
+        _rerun_count += 1
+        for s in profile.stages + [StageTiming('total')]:
+            seconds = profile.total_seconds if s.name == 'total' else s.seconds
+            histogram = _stage_histograms.setdefault(s.name, {'buckets': [0] * len(STAGE_BUCKETS), 'count': 0, 'sum': 0.0})
+            for i, bound in enumerate(STAGE_BUCKETS):
+                if seconds <= bound:
+                    histogram['buckets'][i] += 1
+            histogram['count'] += 1
+            histogram['sum'] += seconds
+            if s.rows is not None:
+                _stage_rows[s.name] = s.rows
+
+def register_collector(collector) -> None:
+    _collectors.append(collector)
+
+def prometheus_text() -> str:
+    with _metrics_lock:
+        lines = [
+            "# HELP explorer_reruns_total Explorer script reruns profiled by this process.",
+            "# TYPE explorer_reruns_total counter",
+            f"explorer_reruns_total {_rerun_count}",
+            "# HELP explorer_stage_seconds Time spent in each explorer rerun stage.",
+            "# TYPE explorer_stage_seconds histogram",
+        ]
+        for name, histogram in sorted(_stage_histograms.items()):
+            for bound, count in zip(STAGE_BUCKETS, histogram['buckets']):
+                lines.append(f'explorer_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+            lines.append(f'explorer_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {histogram["count"]}')
+            lines.append(f'explorer_stage_seconds_sum{{stage="{name}"}} {histogram["sum"]:.6f}')
+            lines.append(f'explorer_stage_seconds_count{{stage="{name}"}} {histogram["count"]}')
+        lines += [
+            "# HELP explorer_stage_rows Rows produced by the most recent run of each stage.",
+            "# TYPE explorer_stage_rows gauge",
+        ]
+        for name, rows in sorted(_stage_rows.items()):
+            lines.append(f'explorer_stage_rows{{stage="{name}"}} {rows}')
+    for collector in _collectors:
+        lines += collector()
+    return "\n".join(lines) + "\n"
+
+def write_metrics(path: str) -> None:
+    # Write then rename, so a scraper never reads a half-written file.
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
@@ -0,0 +1,179 @@
+"""Pre-aggregated summary cube for the explorer dashboard.
+
+    python olap_cube.py data.parquet                # build summary_cube.parquet
+
+Projects are aggregated once over (Category, Subcategory, Country, State,
+launch month) into counts and sums of pledged, goal and backers. Queries roll
+the cube up to any subset of those dimensions and slice it by dimension values
+without touching the raw data. Dimensions are kept in memory as integer codes,
+so a roll-up is a mask plus one `np.bincount` per measure.
+"""
+import datetime
+import functools
+import os
+import sys
+
+import numpy as np
+import polars as pl
+
+from query_engine import DATE_FILTER_DAYS, scan_source
+
+CUBE_PATH = "summary_cube.parquet"
+
+DIMENSIONS = ['Category', 'Subcategory', 'Country', 'State']
+TIME_DIMENSIONS = ['Launch Year', 'Launch Month']
+MEASURES = ['Projects', 'Successful', 'Pledged', 'Goal', 'Backers']
+
+# Above this many dense group cells, roll-ups fall back to sorting keys.
+_DENSE_GROUP_LIMIT = 5_000_000
+
+# Coarser cuboids derived from the base cube when it is loaded. A query is
+# answered from the smallest cuboid that has every dimension it touches.
+ROLLUP_VIEWS = [
+    ('Category', 'Country', 'State', 'Launch Year'),
+    ('Category', 'Subcategory', 'State', 'Launch Year'),
+    ('Category', 'State', 'Launch Month'),
+]
+
+def build_cube(lf: pl.LazyFrame) -> pl.DataFrame:
+    return (
+        lf.with_columns(pl.col('Raw Date').cast(pl.Datetime, strict=False).dt.truncate('1mo').cast(pl.Date).alias('Launch Month'))
+        .group_by(*DIMENSIONS, 'Launch Month')
+        .agg(
+            pl.len().cast(pl.UInt32).alias('Projects'),
+            (pl.col('State').cast(pl.Utf8).str.to_lowercase() == 'successful').sum().cast(pl.UInt32).alias('Successful'),
+            pl.col('Raw Pledged').cast(pl.Float64).sum().alias('Pledged'),
+            pl.col('Raw Goal').cast(pl.Float64).sum().alias('Goal'),
+            pl.col('Backer Count').cast(pl.Int64).sum().alias('Backers'),
+        )
+        .with_columns(pl.col(DIMENSIONS).cast(pl.Utf8).fill_null('Unknown').cast(pl.Categorical))
+        .sort(*DIMENSIONS, 'Launch Month')
+        .collect()
+    )
+
+class _Cuboid:
+    def __init__(self, codes: dict, measures: dict):
+        self.codes = codes
+        self.measures = measures
+        self.size = len(measures['Projects'])
+
+    def rollup(self, group_by: list[str], cardinalities: list[int], mask: np.ndarray | None) -> tuple[tuple, dict]:
+        codes = [self.codes[dim] if mask is None else self.codes[dim][mask] for dim in group_by]
+        measures = {name: values if mask is None else values[mask] for name, values in self.measures.items()}
+        if not group_by:
+            return (), {name: np.array([values.sum()]) for name, values in measures.items()}
+
+        keys = np.ravel_multi_index(codes, cardinalities)
+        dense_size = int(np.prod(cardinalities))
+        if dense_size <= _DENSE_GROUP_LIMIT:
+            counts = np.bincount(keys, weights=measures['Projects'], minlength=dense_size)
+            groups = np.flatnonzero(counts)
+            sums = {name: np.bincount(keys, weights=values, minlength=dense_size)[groups] for name, values in measures.items()}
+        else:
+            groups, inverse = np.unique(keys, return_inverse=True)
+            sums = {name: np.bincount(inverse, weights=values, minlength=len(groups)) for name, values in measures.items()}
+        return np.unravel_index(groups, cardinalities), sums
+
+class SummaryCube:
+    def __init__(self, cube: pl.DataFrame):
+        codes = {}
+        self.labels = {}
+        for dim in DIMENSIONS:
+            labels = cube[dim].cast(pl.Utf8).unique().sort()
+            self.labels[dim] = labels.to_list()
+            codes[dim] = cube[dim].cast(pl.Utf8).replace_strict(labels, pl.int_range(len(labels), eager=True)).to_numpy().astype(np.int32)
+
+        # Launch months are coded as months since the earliest month; unknown dates get the last code.
+        months = cube['Launch Month']
+        month_index = (months.dt.year() * 12 + months.dt.month() - 1).to_numpy().astype(np.float64)
+        known = ~np.isnan(month_index)
+        self.first_month = int(np.nanmin(month_index)) if known.any() else 0
+        n_months = int(np.nanmax(month_index)) - self.first_month + 1 if known.any() else 0
+        codes['Launch Month'] = np.where(known, np.nan_to_num(month_index) - self.first_month, n_months).astype(np.int32)
+        self.labels['Launch Month'] = [self._month_label(i) for i in range(n_months)] + ['Unknown']
+        n_years = (self.first_month + n_months - 1) // 12 - self.first_month // 12 + 1 if n_months else 0
+        self.labels['Launch Year'] = [str(self.first_month // 12 + i) for i in range(n_years)] + ['Unknown']
+        codes['Launch Year'] = self._year_codes(codes['Launch Month'])
+
+        measures = {name: cube[name].to_numpy().astype(np.float64) for name in MEASURES}
+        self.cell_count = cube.height
+        base = _Cuboid(codes, measures)
+        self.cuboids = [base]
+        for view in ROLLUP_VIEWS:
+            view_codes, view_sums = base.rollup(list(view), [len(self.labels[dim]) for dim in view], None)
+            rolled = {dim: np.asarray(dim_codes, dtype=np.int32) for dim, dim_codes in zip(view, view_codes)}
+            if 'Launch Month' in rolled:
+                rolled['Launch Year'] = self._year_codes(rolled['Launch Month'])
+            self.cuboids.append(_Cuboid(rolled, view_sums))
+
+    def _month_label(self, code: int) -> str:
+        year, month = divmod(self.first_month + code, 12)
+        return f"{year}-{month + 1:02d}"
+
+    def _year_codes(self, month_codes: np.ndarray) -> np.ndarray:
+        unknown_month = len(self.labels['Launch Month']) - 1
+        unknown_year = len(self.labels['Launch Year']) - 1
+        return np.where(month_codes == unknown_month, unknown_year, (month_codes + self.first_month % 12) // 12).astype(np.int32)
+
+    def _mask(self, cuboid: _Cuboid, slices: dict) -> np.ndarray | None:
+        mask = None
+        for dim, values in slices.items():
+            lookup = {label: code for code, label in enumerate(self.labels[dim])}
+            wanted = np.array([lookup[v] for v in values if v in lookup], dtype=np.int32)
+            dim_mask = np.isin(cuboid.codes[dim], wanted)
+            mask = dim_mask if mask is None else mask & dim_mask
+        return mask
+
+    def query(self, group_by: list[str], slices: dict | None = None) -> pl.DataFrame:
+        # An empty list of values is a slice that matches nothing; None leaves the dimension unsliced.
+        slices = {dim: values for dim, values in (slices or {}).items() if values is not None}
+        for dim in list(group_by) + list(slices):
+            if dim not in self.labels:
+                raise KeyError(f"Unknown cube dimension '{dim}'.")
+        needed = set(group_by) | set(slices)
+        cuboid = min((c for c in self.cuboids if needed <= set(c.codes)), key=lambda c: c.size)
+        group_codes, sums = cuboid.rollup(list(group_by), [len(self.labels[dim]) for dim in group_by], self._mask(cuboid, slices))
+        columns = {
+            dim: np.asarray(self.labels[dim], dtype=object)[dim_codes].tolist()
+            for dim, dim_codes in zip(group_by, group_codes)
+        }
+        return pl.DataFrame({**columns, **sums}).with_columns(
+            pl.col('Projects', 'Successful', 'Backers').cast(pl.Int64),
+            (pl.col('Successful') / pl.col('Projects')).alias('Success Rate'),
+        )
+
+@functools.lru_cache(maxsize=1)
+def _load_cube_cached(path: str, mtime: float) -> SummaryCube:
+    return SummaryCube(pl.read_parquet(path))
+
+def load_cube(path: str = CUBE_PATH) -> SummaryCube:
+    return _load_cube_cached(os.path.abspath(path), os.path.getmtime(path))
+
+def launch_months_since(cube: SummaryCube, days: int) -> list[str]:
+    cutoff = datetime.date.today() - datetime.timedelta(days=days)
+    cutoff_label = f"{cutoff.year}-{cutoff.month:02d}"
+    return [label for label in cube.labels['Launch Month'] if label != 'Unknown' and label >= cutoff_label]
+
+def explorer_slices(cube: SummaryCube, filters: dict) -> dict:
+    # The cube is only as fine as a launch month, so date presets include the whole cutoff month.
+    slices = {}
+    for dim, key, all_value in (
+        ('Category', 'categories', 'All Categories'),
+        ('Subcategory', 'subcategories', 'All Subcategories'),
+        ('Country', 'countries', 'All Countries'),
+        ('State', 'states', 'All States'),
+    ):
+        values = filters.get(key) or [all_value]
+        if values != [all_value]:
+            slices[dim] = values
+    days = DATE_FILTER_DAYS.get(filters.get('date', 'All Time'))
+    if days is not None:
+        slices['Launch Month'] = launch_months_since(cube, days)
+    return slices
+
+if __name__ == "__main__":
+    source_path = sys.argv[1] if len(sys.argv) > 1 else os.environ.get("EXPLORER_DATA_PATH", "data.parquet")
+    target_path = sys.argv[2] if len(sys.argv) > 2 else CUBE_PATH
+    cube = build_cube(scan_source(source_path))
+    cube.write_parquet(target_path)
+    print(f"Wrote {cube.height:,} cube cells to '{target_path}'.")
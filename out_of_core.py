@@ -0,0 +1,82 @@
+"""Out-of-core mode for data sources larger than memory.
+
+    EXPLORER_OUT_OF_CORE=1 EXPLORER_MEMORY_LIMIT=4GB streamlit run Data_Explorer.py
+
+Polars' default engine materializes every column a query touches, so an
+unconstrained sort over a source bigger than RAM can exhaust the host. In
+out-of-core mode:
+
+- explorer collects, counts and export sinks run on Polars' streaming engine,
+  which reads the source in batches; counts never hold more than a batch of
+  the filter columns, whatever the source size;
+- sorts that outgrow the engine's memory budget spill sorted runs to
+  `EXPLORER_SPILL_DIR` (a temporary directory by default) and merge them back
+  from disk;
+- resident mode and the query service's in-memory copy are turned off, and
+  every query scans the source.
+
+`EXPLORER_MEMORY_LIMIT` (bytes, or a number with a KB/MB/GB suffix; the host's
+physical memory by default) is the ceiling for the whole process. The streaming
+engine is given `SPILL_BUDGET_FRACTION` of it as its spill budget, leaving the
+rest for source decoding, page assembly and Streamlit itself.
+
+Polars reads its memory budget once, when it is first imported, so this module
+must be imported before `polars` in every entry point.
+"""
+import os
+import re
+import sys
+import tempfile
+
+# Share of the memory ceiling the streaming engine may hold before it spills.
+# A full sorted export of a dataset three times the ceiling peaked at 50-90% of
+# it (`benchmarks/larger_than_memory.py`); the rest goes to decoding and merging.
+SPILL_BUDGET_FRACTION = 0.25
+# Sorted runs are sized to 1/64 of the ceiling; Polars' default buckets pushed
+# a 1 GB ceiling over its limit while merging.
+SORT_BUCKETS_PER_LIMIT = 64
+_SIZE_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+
+def parse_size(text: str) -> int:
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*', text.upper())
+    if match is None:
+        raise ValueError(f"Invalid size '{text}'; expected e.g. 2147483648, 512MB or 4GB.")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+def physical_memory_bytes() -> int:
+    # The host's RAM, or the container's cgroup limit when that is lower.
+    total = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    try:
+        with open('/sys/fs/cgroup/memory.max', 'r', encoding='utf-8') as f:
+            limit = f.read().strip()
+        if limit.isdigit():
+            total = min(total, int(limit))
+    except OSError:
+        pass
+    return total
+
+def spill_budget_mb(memory_limit: int) -> int:
+    return max(64, int(memory_limit * SPILL_BUDGET_FRACTION) >> 20)
+
+def sort_bucket_bytes(memory_limit: int) -> int:
+    return max(4 << 20, memory_limit // SORT_BUCKETS_PER_LIMIT)
+
+def polars_environment(memory_limit: int, spill_dir: str) -> dict:
+    return {
+        'POLARS_OOC_MEMORY_BUDGET_MB': str(spill_budget_mb(memory_limit)),
+        'POLARS_OOC_SPILL_DIR': spill_dir,
+        'POLARS_SORT_TARGET_BUCKET_BYTES': str(sort_bucket_bytes(memory_limit)),
+    }
+
+OUT_OF_CORE_ENABLED = os.environ.get("EXPLORER_OUT_OF_CORE", "").lower() in ("1", "true", "yes")
+MEMORY_LIMIT_BYTES = parse_size(os.environ["EXPLORER_MEMORY_LIMIT"]) if os.environ.get("EXPLORER_MEMORY_LIMIT") else physical_memory_bytes()
+SPILL_DIR = os.environ.get("EXPLORER_SPILL_DIR") or os.path.join(tempfile.gettempdir(), "explorer-spill")
+# Engine for explorer collects and sinks.
+COLLECT_ENGINE = 'streaming' if OUT_OF_CORE_ENABLED else 'auto'
+
+if OUT_OF_CORE_ENABLED:
+    if 'polars' in sys.modules:
+        print("Warning: out_of_core was imported after polars; the streaming engine keeps its default memory budget and spill directory.")
+    os.makedirs(SPILL_DIR, exist_ok=True)
+    for name, value in polars_environment(MEMORY_LIMIT_BYTES, SPILL_DIR).items():
+        os.environ.setdefault(name, value)
@@ -1,4 +1,11 @@
 import streamlit as st
+import os
+import time
+import out_of_core  # noqa: F401 - sets the streaming engine's memory budget before polars loads
+import polars as pl
+from query_engine import scan_source
+from similar_projects import StaleIndexError, fetch_rows, index_path as similar_index_path, load_index as load_similarity_index
+from success_model import MODEL_PATH, PRE_LAUNCH_FEATURES, PREDICTION_COLUMN, WHAT_IF_MODEL_PATH, load_model, load_what_if_predictor, train
 
 st.set_page_config(
     layout="wide", 
@@ -19,4 +26,91 @@ st.markdown(
     </style>
     """,
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+
+parquet_source_path = os.environ.get("EXPLORER_DATA_PATH", "data.parquet")
+
+if not os.path.exists(parquet_source_path):
+    st.error(f"Data source not found at '{parquet_source_path}'. Please ensure the file/directory exists.")
+    st.stop()
+
+if not os.path.exists(MODEL_PATH) or not os.path.exists(WHAT_IF_MODEL_PATH):
+    st.info(f"No success models found at '{MODEL_PATH}' and '{WHAT_IF_MODEL_PATH}'. Train them from '{parquet_source_path}' to enable predictions.")
+    if st.button("Train model"):
+        with st.spinner("Training success model..."):
+            train(scan_source(parquet_source_path)).save(MODEL_PATH)
+            train(scan_source(parquet_source_path), features=PRE_LAUNCH_FEATURES).save(WHAT_IF_MODEL_PATH)
+        st.rerun()
+    st.stop()
+
+try:
+    model = load_model(MODEL_PATH)
+except Exception as e:
+    st.error(f"Error loading success model from '{MODEL_PATH}': {e}")
+    st.stop()
+
+try:
+    what_if = load_what_if_predictor(WHAT_IF_MODEL_PATH)
+except Exception as e:
+    st.error(f"Error preparing what-if predictor from '{WHAT_IF_MODEL_PATH}': {e}")
+    st.stop()
+
+st.subheader("What if...")
+goal_col, category_col, country_col, duration_col = st.columns(4)
+what_if_goal = goal_col.number_input("Goal ($)", min_value=1, value=10000, step=500)
+what_if_category = category_col.selectbox("Category", what_if.categories)
+what_if_country = country_col.selectbox(
+    "Country", what_if.countries,
+    index=what_if.countries.index('United States') if 'United States' in what_if.countries else 0
+)
+what_if_duration = duration_col.slider("Campaign length (days)", min_value=1, max_value=60, value=30)
+
+start = time.perf_counter()
+what_if_probability = what_if.predict_one(what_if_goal, what_if_category, what_if_country, what_if_duration)
+what_if_elapsed_us = (time.perf_counter() - start) * 1e6
+
+base_rate = what_if.base_rate(what_if_category)
+st.metric(
+    "Predicted success",
+    f"{what_if_probability:.1%}",
+    delta=f"{what_if_probability - base_rate:+.1%} vs. {what_if_category} average" if base_rate is not None else None
+)
+st.caption(f"Evaluated in {what_if_elapsed_us:.0f} µs.")
+
+if os.path.exists(similar_index_path(parquet_source_path)):
+    try:
+        similar_index = load_similarity_index(parquet_source_path)
+        similar_row_ids, similar_scores = similar_index.search(
+            similar_index.encode_what_if(what_if_goal, what_if_category, what_if_country, what_if_duration), k=5
+        )
+        comparable = fetch_rows(scan_source(parquet_source_path), similar_row_ids).with_columns(
+            pl.Series('Similarity', similar_scores, dtype=pl.Float32)
+        )
+        st.markdown("**Comparable past projects**")
+        st.dataframe(
+            comparable.select('Project Name', 'Category', 'Country', 'State', 'Raw Goal', 'Raw Pledged', 'Backer Count', 'Similarity'),
+            hide_index=True
+        )
+    except StaleIndexError as e:
+        st.warning(f"{e} Comparable projects are hidden until it is rebuilt with `python similar_projects.py {parquet_source_path}`.")
+    except Exception as e:
+        st.error(f"Error looking up comparable projects: {e}")
+
+st.subheader("Batch scoring")
+if st.button("Score all projects"):
+    try:
+        projects = scan_source(parquet_source_path).select('Category', 'Country', 'Raw Goal', 'Raw Date', 'Raw Deadline', 'Backer Count').collect()
+        start = time.perf_counter()
+        scored = projects.with_columns(model.predict(projects))
+        elapsed = time.perf_counter() - start
+    except Exception as e:
+        st.error(f"Error scoring projects: {e}")
+        st.stop()
+
+    st.caption(f"Scored {scored.height:,} projects in {elapsed:.2f}s.")
+    st.dataframe(
+        scored.group_by('Category')
+        .agg(pl.len().alias('Projects'), pl.col(PREDICTION_COLUMN).mean().alias('Mean Predicted Success'))
+        .sort('Mean Predicted Success', descending=True),
+        hide_index=True
+    )
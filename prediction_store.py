@@ -0,0 +1,117 @@
+"""Offline 'Predicted Success' column stored next to the explorer data.
+
+    python prediction_store.py data.parquet      # (re)score projects into predictions.parquet
+
+Scores are keyed by 'Link' plus a fingerprint of the model's input columns, so
+a rerun only scores projects that are new or changed since the last run (or
+everything, when the model artifact itself changed). Rows are written in the
+same order as the data source; while the source is unchanged the explorer
+attaches the column positionally instead of joining.
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+
+import polars as pl
+
+from query_engine import scan_source
+from success_model import MODEL_PATH, PREDICTION_COLUMN, load_model
+
+PREDICTIONS_FILENAME = "predictions.parquet"
+PREDICTIONS_META_FILENAME = "predictions.json"
+FINGERPRINT_COLUMN = "Scoring Fingerprint"
+KEY_COLUMN = "Link"
+MODEL_INPUT_COLUMNS = ['Category', 'Country', 'Raw Goal', 'Raw Date', 'Raw Deadline', 'Backer Count']
+
+def predictions_paths(data_path: str) -> tuple[str, str]:
+    data_dir = os.path.dirname(os.path.abspath(data_path))
+    return os.path.join(data_dir, PREDICTIONS_FILENAME), os.path.join(data_dir, PREDICTIONS_META_FILENAME)
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _read_meta(meta_path: str) -> dict:
+    if not os.path.exists(meta_path):
+        return {}
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def score_incrementally(data_path: str, model_path: str = MODEL_PATH) -> dict:
+    predictions_path, meta_path = predictions_paths(data_path)
+    model = load_model(model_path)
+    model_sha = _file_sha256(model_path)
+
+    # Polars hashes are only stable within a Polars version; an upgrade simply
+    # makes every fingerprint miss and rescore once.
+    current = scan_source(data_path).select(
+        pl.col(KEY_COLUMN),
+        pl.struct(MODEL_INPUT_COLUMNS).hash().alias(FINGERPRINT_COLUMN),
+    ).with_row_index('_row').collect()
+
+    previous_meta = _read_meta(meta_path)
+    if os.path.exists(predictions_path) and previous_meta.get('model_sha256') == model_sha:
+        previous = (
+            pl.read_parquet(predictions_path, columns=[KEY_COLUMN, FINGERPRINT_COLUMN, PREDICTION_COLUMN])
+            .unique(subset=[KEY_COLUMN, FINGERPRINT_COLUMN], keep='first')
+        )
+        merged = current.join(previous, on=[KEY_COLUMN, FINGERPRINT_COLUMN], how='left').sort('_row')
+    else:
+        merged = current.with_columns(pl.lit(None, dtype=pl.Float32).alias(PREDICTION_COLUMN))
+
+    stale_rows = merged.filter(pl.col(PREDICTION_COLUMN).is_null())['_row']
+    if len(stale_rows) > 0:
+        stale_inputs = (
+            scan_source(data_path).select(MODEL_INPUT_COLUMNS).with_row_index('_row')
+            .filter(pl.col('_row').is_in(stale_rows.implode()))
+            .collect()
+        )
+        fresh = stale_inputs.select('_row').with_columns(model.predict(stale_inputs))
+        merged = merged.update(fresh, on='_row')
+
+    merged.select(KEY_COLUMN, FINGERPRINT_COLUMN, PREDICTION_COLUMN).write_parquet(predictions_path)
+    meta = {
+        'model_sha256': model_sha,
+        'source_path': os.path.abspath(data_path),
+        'source_mtime': os.path.getmtime(data_path),
+        'source_rows': merged.height,
+        'scored_rows': len(stale_rows),
+        'scored_at': time.time(),
+    }
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+def attach_predictions(lf: pl.LazyFrame, data_path: str) -> pl.LazyFrame:
+    predictions_path, meta_path = predictions_paths(data_path)
+    if not os.path.exists(predictions_path):
+        return lf
+    meta = _read_meta(meta_path)
+    predictions_lf = pl.scan_parquet(predictions_path)
+    source_unchanged = (
+        meta.get('source_mtime') == os.path.getmtime(data_path)
+        and meta.get('source_rows') == lf.select(pl.len()).collect().item()
+    )
+    if source_unchanged:
+        return pl.concat([lf, predictions_lf.select(PREDICTION_COLUMN)], how='horizontal')
+    print(f"Warning: '{predictions_path}' is older than '{data_path}'. Joining predictions on '{KEY_COLUMN}'; rerun prediction_store.py to refresh.")
+    return lf.join(
+        predictions_lf.select(KEY_COLUMN, PREDICTION_COLUMN).unique(subset=[KEY_COLUMN], keep='last'),
+        on=KEY_COLUMN,
+        how='left',
+        maintain_order='left',
+    )
+
+if __name__ == "__main__":
+    source_path = sys.argv[1] if len(sys.argv) > 1 else os.environ.get("EXPLORER_DATA_PATH", "data.parquet")
+    model_path = sys.argv[2] if len(sys.argv) > 2 else MODEL_PATH
+    result = score_incrementally(source_path, model_path)
+    print(f"Scored {result['scored_rows']:,} of {result['source_rows']:,} projects into '{predictions_paths(source_path)[0]}'.")
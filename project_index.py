@@ -0,0 +1,96 @@
+"""Primary-key index from a project's Row ID to where it is stored.
+
+    python project_index.py data.parquet 1234     # print one project's record
+
+Row IDs are positions in the data source, so the index only keeps the Row ID
+each parquet row group (or IPC record batch) starts at, in source order, read
+from the file footers. A lookup is one binary search to the project's (file,
+row group, offset). Only that file is opened, and a one-row slice of it makes
+Polars decode just that row group, so a project's full record, including wide
+columns the table never reads, costs the same wherever it sits in the source
+instead of a filtered scan over all of it. IPC record batches are memory-mapped
+and sliced directly.
+"""
+import argparse
+import functools
+import os
+
+import numpy as np
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from query_engine import ROW_ID_COLUMN, is_ipc_source, parquet_files
+
+class ProjectIndex:
+    def __init__(self, path: str):
+        self.ipc = is_ipc_source(path)
+        self.files = [path] if self.ipc else parquet_files(path)
+        file_numbers, group_numbers, group_rows = [], [], []
+        for file_number, file_path in enumerate(self.files):
+            for group, rows in enumerate(self._group_rows(file_path)):
+                file_numbers.append(file_number)
+                group_numbers.append(group)
+                group_rows.append(rows)
+        self.file_numbers = np.asarray(file_numbers, dtype=np.int32)
+        self.group_numbers = np.asarray(group_numbers, dtype=np.int32)
+        # Row ID of the first row of each group, then the total row count.
+        self.group_starts = np.concatenate([[0], np.cumsum(group_rows, dtype=np.int64)])
+        self.n_rows = int(self.group_starts[-1])
+        self.file_starts = [int(self.group_starts[np.searchsorted(self.file_numbers, n)]) for n in range(len(self.files))]
+
+    def _group_rows(self, file_path: str) -> list[int]:
+        if self.ipc:
+            reader = pa.ipc.open_file(pa.memory_map(file_path))
+            return [reader.get_batch(i).num_rows for i in range(reader.num_record_batches)]
+        metadata = pq.ParquetFile(file_path).metadata
+        return [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+
+    def _group(self, row_id: int) -> int | None:
+        if not 0 <= row_id < self.n_rows:
+            return None
+        return int(np.searchsorted(self.group_starts, row_id, side='right')) - 1
+
+    def locate(self, row_id: int) -> tuple[str, int, int] | None:
+        # (file, row group, offset in the row group), or None past the end.
+        group = self._group(row_id)
+        if group is None:
+            return None
+        return self.files[self.file_numbers[group]], int(self.group_numbers[group]), row_id - int(self.group_starts[group])
+
+    def fetch(self, row_id: int) -> pl.DataFrame:
+        # Every column of the source for one project, with its Row ID first; empty if unknown.
+        group = self._group(row_id)
+        if group is None:
+            return pl.DataFrame()
+        file_number = int(self.file_numbers[group])
+        if self.ipc:
+            batch = pa.ipc.open_file(pa.memory_map(self.files[file_number])).get_batch(int(self.group_numbers[group]))
+            row = pl.from_arrow(batch.slice(row_id - int(self.group_starts[group]), 1))
+        else:
+            row = pl.scan_parquet(self.files[file_number]).slice(row_id - self.file_starts[file_number], 1).collect()
+        return row.select(pl.lit(row_id, dtype=pl.get_index_type()).alias(ROW_ID_COLUMN), pl.all())
+
+@functools.lru_cache(maxsize=1)
+def _load_index_cached(path: str, mtime: float) -> ProjectIndex:
+    return ProjectIndex(path)
+
+def load_project_index(path: str) -> ProjectIndex:
+    return _load_index_cached(os.path.abspath(path), os.path.getmtime(path))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('data', help="Parquet file/directory or Arrow IPC file.")
+    parser.add_argument('row_id', type=int)
+    args = parser.parse_args()
+
+    index = load_project_index(args.data)
+    location = index.locate(args.row_id)
+    if location is None:
+        parser.error(f"Row ID {args.row_id} is out of range; '{args.data}' has {index.n_rows:,} rows.")
+    print(f"Row ID {args.row_id}: '{location[0]}', row group {location[1]}, offset {location[2]}")
+    with pl.Config(tbl_rows=-1, fmt_str_lengths=200):
+        print(index.fetch(args.row_id).transpose(include_header=True, header_name='column', column_names=['value']))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+"""Interchangeable engines behind the explorer's filter/sort/page queries.
+
+A backend takes the explorer's filter state, sort order and page and returns
+the match count and that page's rows:
+
+    backend = load_backend('duckdb', 'data.parquet')
+    total_rows, page, df_page = backend.fetch_page(filters, 'newest', 3, 10)
+
+- `polars` runs `query_engine` over a LazyFrame. This is the explorer's
+  default; it also narrows by the resident range indexes, pages by key and
+  counts the drop-down options.
+- `duckdb` runs SQL over the same parquet file with DuckDB (optional; `pip
+  install duckdb`).
+- `sqlite` copies the parquet file once into `<source>.sqlite` beside it,
+  indexed on every sort order, and runs SQL against that copy.
+
+The explorer sends every page query through this interface, including those
+to the shared query service (`query_service.QueryServiceClient`). It passes a
+`collect` that runs Polars queries in the background and drops superseded
+ones, and a `stage` that times each step.
+`EXPLORER_QUERY_BACKEND=duckdb streamlit run Data_Explorer.py` switches the
+backend. The SQL backends mirror `apply_filters` and `apply_sort`:
+case-insensitive regex search, inclusive ranges, nulls last and Row ID as the
+tie-breaker, so every backend returns the same rows in the same
+order. They read the source's own columns only; the 'Predicted Success'
+column from `prediction_store.py` is a Polars-only feature, and they page by
+offset rather than by key. `benchmarks/backend_conformance.py` checks a
+backend against Polars and `benchmarks/backends.py` times them side by side.
+"""
+import datetime
+import functools
+import os
+import re
+import sqlite3
+import threading
+from typing import Callable
+
+import polars as pl
+
+from out_of_core import MEMORY_LIMIT_BYTES, OUT_OF_CORE_ENABLED, SPILL_DIR
+from query_engine import (
+    DATE_COLUMN, LIST_FILTER_COLUMNS, RANGE_COLUMNS, ROW_ID_COLUMN, SEARCH_COLUMNS, SORT_COLUMNS,
+    PageCursors, collect_now, date_cutoff, facet_counts, facet_query, fetch_page, is_ipc_source, page_columns,
+    parquet_files, scan_source, untimed_stage
+)
+from query_scheduler import INTERACTIVE, QUERY_TIMEOUT_SECONDS, scheduler
+
+BACKENDS = ('polars', 'duckdb', 'sqlite')
+SQLITE_BATCH_ROWS = 100_000
+# Datetimes are stored in SQLite as fixed-width text, which sorts and compares
+# like the timestamps; the same text as `datetime.isoformat(' ', 'microseconds')`.
+SQLITE_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S%.6f'
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+class QueryBackend:
+    name = ''
+
+    def fetch_page(
+        self, filters: dict, sort_order: str, page: int, page_size: int, cursors: PageCursors | None = None,
+        collect: Callable[[pl.LazyFrame], pl.DataFrame] = collect_now, stage: Callable = untimed_stage,
+    ) -> tuple[int, int, pl.DataFrame]:
+        # Returns (total matching rows, the page actually served, its rows);
+        # out-of-range pages are clamped the way `query_engine.fetch_page` does.
+        # `cursors` and `collect` only apply to backends that run Polars queries.
+        raise NotImplementedError
+
+    def facet_counts(self, filters: dict, collect: Callable[[pl.LazyFrame], pl.DataFrame] = collect_now) -> dict | None:
+        # {filter key: {option: count}} for the drop-downs, or None when the backend does not count options.
+        return None
+
+class PolarsBackend(QueryBackend):
+    name = 'polars'
+
+    def __init__(self, lf: pl.LazyFrame, resident=None):
+        # `resident` is a `resident_store.ResidentDataset` whose frame `lf` is;
+        # its range indexes then answer the range sliders.
+        self.lf = lf
+        self.resident = resident
+
+    def fetch_page(
+        self, filters: dict, sort_order: str, page: int, page_size: int, cursors: PageCursors | None = None,
+        collect: Callable[[pl.LazyFrame], pl.DataFrame] = collect_now, stage: Callable = untimed_stage,
+    ) -> tuple[int, int, pl.DataFrame]:
+        narrowed = None
+        if self.resident is not None:
+            with stage('range_index') as timing:
+                narrowed = self.resident.narrow(filters, sort_order)
+                if narrowed is not None:
+                    timing.rows = narrowed[2]
+        return fetch_page(self.lf, filters, sort_order, page, page_size, cursors, collect=collect, stage=stage, narrowed=narrowed)
+
+    def facet_counts(self, filters: dict, collect: Callable[[pl.LazyFrame], pl.DataFrame] = collect_now) -> dict | None:
+        return facet_counts(collect(facet_query(self.lf, filters)))
+
+class SqlBackend(QueryBackend):
+    # Builds the same query for every SQL engine; subclasses supply the
+    # connection, the regex search condition and the value conversions.
+    table = 'projects'
+
+    def __init__(self, schema: pl.Schema):
+        self.schema = schema
+
+    def _execute(self, sql: str, params: list) -> tuple[list[tuple], list[str]]:
+        raise NotImplementedError
+
+    def _search_condition(self, column: str) -> str:
+        raise NotImplementedError
+
+    def _parameter(self, value):
+        return value
+
+    def _decode(self, df: pl.DataFrame) -> pl.DataFrame:
+        return df.cast({name: self.schema[name] for name in df.columns})
+
+    def _where(self, filters: dict) -> tuple[str, list]:
+        conditions, params = [], []
+        search_term = filters.get('search', '')
+        search_columns = [col for col in SEARCH_COLUMNS if col in self.schema]
+        if search_term and search_columns:
+            conditions.append('(' + ' OR '.join(self._search_condition(col) for col in search_columns) + ')')
+            params += [search_term] * len(search_columns)
+        for key, (col, all_option) in LIST_FILTER_COLUMNS.items():
+            values = filters.get(key, [all_option])
+            if col not in self.schema or values == [all_option]:
+                continue
+            placeholders = ', '.join('?' for _ in values)
+            if col == 'State':
+                conditions.append(f"lower(CAST({_quote(col)} AS VARCHAR)) IN ({placeholders})")
+                params += [value.lower() for value in values]
+            else:
+                conditions.append(f"{_quote(col)} IN ({placeholders})")
+                params += list(values)
+        for key, bounds in filters.get('ranges', {}).items():
+            col = RANGE_COLUMNS.get(key)
+            if col is None or col not in self.schema:
+                continue
+            if key == 'predicted':
+                # The slider is in percent and only filters once it is narrowed.
+                if bounds['min'] <= 0 and bounds['max'] >= 100:
+                    continue
+                conditions.append(f"{_quote(col)} * 100 >= ? AND {_quote(col)} * 100 <= ?")
+            else:
+                conditions.append(f"{_quote(col)} >= ? AND {_quote(col)} <= ?")
+            params += [bounds['min'], bounds['max']]
+        cutoff = date_cutoff(filters.get('date', 'All Time'))
+        if cutoff is not None and DATE_COLUMN in self.schema:
+            conditions.append(f"{_quote(DATE_COLUMN)} >= ?")
+            params.append(self._parameter(cutoff))
+        return (' WHERE ' + ' AND '.join(conditions)) if conditions else '', params
+
+    def _order_by(self, sort_order: str) -> str:
+        sort_col, sort_descending = SORT_COLUMNS.get(sort_order, SORT_COLUMNS['popularity'])
+        keys = [f"{_quote(ROW_ID_COLUMN)} ASC"]
+        if sort_col in self.schema:
+            keys.insert(0, f"{_quote(sort_col)} {'DESC' if sort_descending else 'ASC'} NULLS LAST")
+        else:
+            print(f"Warning: Sort column '{sort_col}' not found in the {self.name} backend's source.")
+        return ' ORDER BY ' + ', '.join(keys)
+
+    def count(self, filters: dict) -> int:
+        where, params = self._where(filters)
+        rows, _ = self._execute(f"SELECT count(*) FROM {self.table}{where}", params)
+        return rows[0][0]
+
+    def fetch_page(
+        self, filters: dict, sort_order: str, page: int, page_size: int, cursors: PageCursors | None = None,
+        collect: Callable[[pl.LazyFrame], pl.DataFrame] = collect_now, stage: Callable = untimed_stage,
+    ) -> tuple[int, int, pl.DataFrame]:
+        with scheduler.slot(INTERACTIVE, QUERY_TIMEOUT_SECONDS):
+            return self._fetch_page(filters, sort_order, page, page_size, stage)
+
+    def _fetch_page(self, filters: dict, sort_order: str, page: int, page_size: int, stage: Callable) -> tuple[int, int, pl.DataFrame]:
+        with stage('count') as timing:
+            total_rows = self.count(filters)
+            timing.rows = total_rows
+        total_pages = -(-total_rows // page_size) if page_size > 0 and total_rows > 0 else 1
+        page = max(1, min(page, total_pages))
+        offset = (page - 1) * page_size
+
+        columns = page_columns(self.schema.names())
+        if total_rows == 0 or offset >= total_rows:
+            return total_rows, page, pl.DataFrame(schema={col: self.schema[col] for col in columns})
+        where, params = self._where(filters)
+        select = ', '.join(_quote(col) for col in columns)
+        with stage('page') as timing:
+            rows, names = self._execute(
+                f"SELECT {select} FROM {self.table}{where}{self._order_by(sort_order)} LIMIT ? OFFSET ?",
+                params + [page_size, offset],
+            )
+            df_page = self._decode(pl.DataFrame(rows, schema=names, orient='row', infer_schema_length=None))
+            timing.rows = df_page.height
+        return total_rows, page, df_page
+
+class DuckDBBackend(SqlBackend):
+    name = 'duckdb'
+
+    def __init__(self, path: str):
+        try:
+            import duckdb
+        except ImportError:
+            raise RuntimeError("The DuckDB backend needs the 'duckdb' package (pip install duckdb).")
+        if is_ipc_source(path):
+            raise ValueError(f"The DuckDB backend reads parquet sources only, not '{path}'.")
+        super().__init__(scan_source(path).collect_schema())
+        self._connection = duckdb.connect()
+        if OUT_OF_CORE_ENABLED:
+            self._connection.execute(f"SET memory_limit = '{MEMORY_LIMIT_BYTES}B'")
+            self._connection.execute(f"SET temp_directory = '{SPILL_DIR.replace(chr(39), chr(39) * 2)}'")
+        # Row ID is the row's position across the source's files, as `scan_source` numbers it.
+        parts, offset = [], 0
+        for file_path in parquet_files(path):
+            literal = "'" + file_path.replace("'", "''") + "'"
+            parts.append(
+                f"SELECT * EXCLUDE (file_row_number), file_row_number + {offset} AS {_quote(ROW_ID_COLUMN)} "
+                f"FROM read_parquet({literal}, file_row_number = true)"
+            )
+            offset += pl.scan_parquet(file_path).select(pl.len()).collect().item()
+        self._connection.execute(f"CREATE VIEW {self.table} AS " + ' UNION ALL '.join(parts))
+
+    def _execute(self, sql: str, params: list) -> tuple[list[tuple], list[str]]:
+        # A cursor is a connection of its own, so sessions can query concurrently.
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            return rows, [column[0] for column in cursor.description]
+        finally:
+            cursor.close()
+
+    def _search_condition(self, column: str) -> str:
+        return f"regexp_matches(CAST({_quote(column)} AS VARCHAR), ?, 'i')"
+
+def _regexp(pattern: str, value) -> bool:
+    return value is not None and re.search(pattern, str(value), re.IGNORECASE) is not None
+
+def _sqlite_type(dtype: pl.DataType) -> str:
+    if dtype.is_integer():
+        return 'INTEGER'
+    if dtype.is_float():
+        return 'REAL'
+    return 'TEXT'
+
+def sqlite_store_path(path: str) -> str:
+    return os.path.splitext(os.path.abspath(path.rstrip(os.sep)))[0] + '.sqlite'
+
+def write_sqlite_store(path: str, store_path: str) -> None:
+    # Written to a temporary file and renamed, so readers never see a partial copy.
+    lf = scan_source(path)
+    schema = lf.collect_schema()
+    datetime_columns = [name for name, dtype in schema.items() if isinstance(dtype, pl.Datetime)]
+    lf = lf.with_columns(pl.col(datetime_columns).dt.strftime(SQLITE_DATETIME_FORMAT))
+    temp_path = store_path + '.tmp'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    connection = sqlite3.connect(temp_path)
+    try:
+        columns = ', '.join(f"{_quote(name)} {_sqlite_type(dtype)}" for name, dtype in schema.items())
+        connection.execute(f"CREATE TABLE {SqlBackend.table} ({columns})")
+        insert = f"INSERT INTO {SqlBackend.table} VALUES ({', '.join('?' for _ in schema)})"
+        for batch in lf.collect_batches(chunk_size=SQLITE_BATCH_ROWS):
+            connection.executemany(insert, batch.iter_rows())
+        for i, (sort_col, sort_descending) in enumerate(dict.fromkeys(SORT_COLUMNS.values())):
+            if sort_col in schema:
+                connection.execute(
+                    f"CREATE INDEX sort_{i} ON {SqlBackend.table} "
+                    f"({_quote(sort_col)} {'DESC' if sort_descending else 'ASC'}, {_quote(ROW_ID_COLUMN)})"
+                )
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(temp_path, store_path)
+
+class SQLiteBackend(SqlBackend):
+    name = 'sqlite'
+
+    def __init__(self, path: str):
+        super().__init__(scan_source(path).collect_schema())
+        self.store_path = sqlite_store_path(path)
+        if not os.path.exists(self.store_path) or os.path.getmtime(self.store_path) < os.path.getmtime(path):
+            print(f"Copying '{path}' into '{self.store_path}' for the SQLite backend...")
+            write_sqlite_store(path, self.store_path)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections belong to the thread that opened them.
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(f"file:{self.store_path}?mode=ro", uri=True)
+            connection.create_function('regexp', 2, _regexp, deterministic=True)
+            self._local.connection = connection
+        return connection
+
+    def _execute(self, sql: str, params: list) -> tuple[list[tuple], list[str]]:
+        cursor = self._connection().execute(sql, params)
+        return cursor.fetchall(), [column[0] for column in cursor.description]
+
+    def _search_condition(self, column: str) -> str:
+        return f"{_quote(column)} REGEXP ?"
+
+    def _parameter(self, value):
+        return value.isoformat(' ', 'microseconds') if isinstance(value, datetime.datetime) else value
+
+    def _decode(self, df: pl.DataFrame) -> pl.DataFrame:
+        return df.with_columns(
+            pl.col(name).str.to_datetime(SQLITE_DATETIME_FORMAT, time_unit=dtype.time_unit, time_zone=dtype.time_zone)
+            if isinstance(dtype, pl.Datetime) else pl.col(name).cast(dtype)
+            for name, dtype in self.schema.items() if name in df.columns
+        )
+
+# Sessions starting together would otherwise build the same backend at once,
+# e.g. two SQLite copies written to one temporary file.
+_load_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=4)
+def _load_backend_cached(name: str, path: str, mtime: float) -> QueryBackend:
+    if name == 'polars':
+        return PolarsBackend(scan_source(path))
+    if name == 'duckdb':
+        return DuckDBBackend(path)
+    if name == 'sqlite':
+        return SQLiteBackend(path)
+    raise ValueError(f"Unknown query backend '{name}'; expected one of {', '.join(BACKENDS)}.")
+
+def load_backend(name: str, path: str) -> QueryBackend:
+    with _load_lock:
+        return _load_backend_cached(name.lower(), os.path.abspath(path), os.path.getmtime(path))
@@ -0,0 +1,329 @@
+import contextlib
+import datetime
+import glob
+import json
+import math
+import os
+import types
+from typing import Callable
+import polars as pl
+from out_of_core import COLLECT_ENGINE, OUT_OF_CORE_ENABLED
+
+IPC_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+# Position of each project in the data source; offline indexes refer to rows by it.
+ROW_ID_COLUMN = 'Row ID'
+
+# Column registry. The table renders DISPLAY_COLUMNS, formatting cells from
+# ROW_DATA_COLUMNS where the display text is not the value itself; filters and
+# sorts read the columns below. Page and count queries project onto these, so
+# other columns in the source (long descriptions, raw payloads) are never read
+# for the table. A project's full record is read by `project_index.py`.
+DISPLAY_COLUMNS = ['Project Name', 'Creator', 'Pledged Amount', 'Link', 'Country', 'State']
+ROW_DATA_COLUMNS = ['Raw Pledged']
+SEARCH_COLUMNS = ['Project Name', 'Creator', 'Category', 'Subcategory']
+# filter key -> (column, the option that disables the filter)
+LIST_FILTER_COLUMNS = {
+    'categories': ('Category', 'All Categories'),
+    'subcategories': ('Subcategory', 'All Subcategories'),
+    'countries': ('Country', 'All Countries'),
+    'states': ('State', 'All States'),
+}
+# List filters whose drop-downs show how many projects each option matches.
+FACET_FILTERS = ['subcategories', 'countries']
+RANGE_COLUMNS = {'pledged': 'Raw Pledged', 'goal': 'Raw Goal', 'raised': 'Raw Raised', 'predicted': 'Predicted Success'}
+DATE_COLUMN = 'Raw Date'
+# date filter option -> how many days back it reaches
+DATE_FILTER_DAYS = {
+    'Last Month': 30,
+    'Last 6 Months': 182,
+    'Last Year': 365,
+    'Last 5 Years': 5 * 365,
+    'Last 10 Years': 10 * 365,
+}
+# sort_order -> (column, descending). Unknown sort orders fall back to popularity.
+SORT_COLUMNS = {
+    'popularity': ('Popularity Score', True),
+    'newest': ('Raw Date', True),
+    'oldest': ('Raw Date', False),
+    'mostfunded': ('Raw Pledged', True),
+    'mostbacked': ('Backer Count', True),
+    'enddate': ('Raw Deadline', True),
+    'predicted': ('Predicted Success', True),
+}
+# Keyword arguments for explorer collects and sinks. Common-subplan elimination
+# reads the source once, in full, for all of gather_rows' one-row slices. That
+# is the faster gather on small sources but not on ones larger than memory, so
+# out-of-core mode turns it off and lets each slice seek to its row.
+COLLECT_OPTIONS = {'engine': COLLECT_ENGINE, 'optimizations': pl.QueryOptFlags(comm_subplan_elim=not OUT_OF_CORE_ENABLED)}
+
+def page_columns(column_names: list[str]) -> list[str]:
+    wanted = [ROW_ID_COLUMN] + DISPLAY_COLUMNS + ROW_DATA_COLUMNS
+    return [col for col in dict.fromkeys(wanted) if col in column_names]
+
+def filter_columns(filters: dict, column_names: list[str]) -> list[str]:
+    wanted = []
+    if filters.get('search', ''):
+        wanted += SEARCH_COLUMNS
+    for key, (col, all_option) in LIST_FILTER_COLUMNS.items():
+        if filters.get(key, [all_option]) != [all_option]:
+            wanted.append(col)
+    for key, bounds in filters.get('ranges', {}).items():
+        # The predicted-success slider only filters once it is narrowed from 0-100.
+        if key == 'predicted' and bounds['min'] <= 0 and bounds['max'] >= 100:
+            continue
+        if key in RANGE_COLUMNS:
+            wanted.append(RANGE_COLUMNS[key])
+    if filters.get('date', 'All Time') != 'All Time':
+        wanted.append(DATE_COLUMN)
+    return [col for col in dict.fromkeys(wanted) if col in column_names]
+
+def explorer_columns(column_names: list[str]) -> list[str]:
+    # Everything the table, its filters and its sorts can touch.
+    wanted = (
+        [ROW_ID_COLUMN] + DISPLAY_COLUMNS + ROW_DATA_COLUMNS + SEARCH_COLUMNS + [col for col, _ in LIST_FILTER_COLUMNS.values()]
+        + list(RANGE_COLUMNS.values()) + [DATE_COLUMN] + [col for col, _ in SORT_COLUMNS.values()]
+    )
+    return [col for col in dict.fromkeys(wanted) if col in column_names]
+
+def is_ipc_source(path: str) -> bool:
+    return str(path).lower().endswith(IPC_EXTENSIONS)
+
+def scan_source(path: str) -> pl.LazyFrame:
+    if is_ipc_source(path):
+        # Uncompressed IPC files are memory-mapped by Polars, so every Streamlit
+        # worker reading the same file shares its pages through the OS page cache
+        # instead of decompressing its own copy the way parquet scans do.
+        return pl.scan_ipc(path, row_index_name=ROW_ID_COLUMN)
+    return pl.scan_parquet(path, row_index_name=ROW_ID_COLUMN)
+
+def parquet_files(path: str) -> list[str]:
+    # The files of a parquet source in the order Polars scans them, which is Row ID order.
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, '**', '*.parquet'), recursive=True))
+    return [path]
+
+def write_ipc_store(parquet_path: str, ipc_path: str) -> None:
+    pl.scan_parquet(parquet_path).sink_ipc(ipc_path, compression=None)
+
+def date_cutoff(date_filter: str) -> datetime.datetime | None:
+    days = DATE_FILTER_DAYS.get(date_filter)
+    return datetime.datetime.now() - datetime.timedelta(days=days) if days is not None else None
+
+def apply_filters(lf: pl.LazyFrame, filters: dict) -> pl.LazyFrame:
+    column_names = lf.collect_schema().names()
+
+    search_term = filters.get('search', '')
+    if search_term:
+        valid_search_cols = [col for col in SEARCH_COLUMNS if col in column_names]
+        if valid_search_cols:
+            search_expr = None
+            for col in valid_search_cols:
+                 current_expr = pl.col(col).cast(pl.Utf8).str.contains(f"(?i){search_term}")
+                 if search_expr is None:
+                     search_expr = current_expr
+                 else:
+                     search_expr = search_expr | current_expr
+            if search_expr is not None:
+                 lf = lf.filter(search_expr)
+
+    if 'Category' in column_names and filters['categories'] != ['All Categories']:
+        lf = lf.filter(pl.col('Category').is_in(filters['categories']))
+    if 'Subcategory' in column_names and filters['subcategories'] != ['All Subcategories']:
+        lf = lf.filter(pl.col('Subcategory').is_in(filters['subcategories']))
+    if 'Country' in column_names and filters['countries'] != ['All Countries']:
+        lf = lf.filter(pl.col('Country').is_in(filters['countries']))
+
+    if 'State' in column_names and filters['states'] != ['All States']:
+        lf = lf.filter(pl.col('State').cast(pl.Utf8).str.to_lowercase().is_in([s.lower() for s in filters['states']]))
+
+    ranges = filters.get('ranges', {})
+    if 'Raw Pledged' in column_names and 'pledged' in ranges:
+        min_p, max_p = ranges['pledged']['min'], ranges['pledged']['max']
+        lf = lf.filter((pl.col('Raw Pledged') >= min_p) & (pl.col('Raw Pledged') <= max_p))
+    if 'Raw Goal' in column_names and 'goal' in ranges:
+        min_g, max_g = ranges['goal']['min'], ranges['goal']['max']
+        lf = lf.filter((pl.col('Raw Goal') >= min_g) & (pl.col('Raw Goal') <= max_g))
+    if 'Raw Raised' in column_names and 'raised' in ranges:
+        min_r, max_r = ranges['raised']['min'], ranges['raised']['max']
+        lf = lf.filter((pl.col('Raw Raised') >= min_r) & (pl.col('Raw Raised') <= max_r))
+    if 'Predicted Success' in column_names and 'predicted' in ranges:
+        # The slider is in percent. Projects without a score yet are kept until the range is narrowed.
+        min_s, max_s = ranges['predicted']['min'], ranges['predicted']['max']
+        if min_s > 0 or max_s < 100:
+            lf = lf.filter((pl.col('Predicted Success') * 100 >= min_s) & (pl.col('Predicted Success') * 100 <= max_s))
+
+    date_filter = filters.get('date', 'All Time')
+    if date_filter != 'All Time' and 'Raw Date' in column_names:
+        compare_date = date_cutoff(date_filter)
+        if compare_date:
+             lf = lf.with_columns(pl.col("Raw Date").cast(pl.Datetime, strict=False).alias("Raw Date_dt"))
+             lf = lf.filter(pl.col('Raw Date_dt') >= compare_date).drop("Raw Date_dt")
+
+    return lf
+
+def _sort_keys(lf: pl.LazyFrame, sort_order: str) -> tuple[list[str], bool] | None:
+    sort_col, sort_descending = SORT_COLUMNS.get(sort_order, SORT_COLUMNS['popularity'])
+    column_names = lf.collect_schema().names()
+    if sort_col not in column_names:
+        return None
+    # Row ID breaks ties, so every row has a fixed position and pages never overlap.
+    return [sort_col] + ([ROW_ID_COLUMN] if ROW_ID_COLUMN in column_names else []), sort_descending
+
+def apply_sort(lf: pl.LazyFrame, sort_order: str, reverse: bool = False) -> pl.LazyFrame:
+    sort_keys = _sort_keys(lf, sort_order)
+    if sort_keys is None:
+        print(f"Warning: Sort column '{SORT_COLUMNS.get(sort_order, SORT_COLUMNS['popularity'])[0]}' not found in LazyFrame.")
+        return lf
+    by, sort_descending = sort_keys
+    descending = [sort_descending, False][:len(by)]
+    if reverse:
+        descending = [not d for d in descending]
+    return lf.sort(by, descending=descending, nulls_last=not reverse)
+
+def apply_filters_and_sort(lf: pl.LazyFrame, filters: dict, sort_order: str) -> pl.LazyFrame:
+    return apply_sort(apply_filters(lf, filters), sort_order)
+
+def count_query(lf: pl.LazyFrame, filters: dict) -> pl.LazyFrame:
+    # Only the columns the active filters read; sorting does not change the count.
+    needed = filter_columns(filters, lf.collect_schema().names())
+    return apply_filters(lf.select(needed or [pl.first()]), filters).select(pl.len())
+
+def facet_query(lf: pl.LazyFrame, filters: dict) -> pl.LazyFrame:
+    # (filter, option, count) for every facet filter, each counted under all the
+    # other active filters but not its own, so a count is what ticking that
+    # option alone would match.
+    column_names = lf.collect_schema().names()
+    parts = []
+    for key in FACET_FILTERS:
+        col, all_option = LIST_FILTER_COLUMNS[key]
+        if col not in column_names:
+            continue
+        others = {**filters, key: [all_option]}
+        needed = list(dict.fromkeys(filter_columns(others, column_names) + [col]))
+        parts.append(
+            apply_filters(lf.select(needed), others).group_by(col).len()
+            .select(pl.lit(key).alias('filter'), pl.col(col).cast(pl.Utf8).alias('option'), pl.col('len').alias('count'))
+        )
+    if not parts:
+        return pl.LazyFrame(schema={'filter': pl.Utf8, 'option': pl.Utf8, 'count': pl.get_index_type()})
+    return pl.concat(parts)
+
+def facet_counts(facets_df: pl.DataFrame) -> dict:
+    # facet_query's rows as {filter key: {option: count}}.
+    counts = {key: {} for key in FACET_FILTERS}
+    for key, option, count in facets_df.iter_rows():
+        if option is not None:
+            counts[key][option] = count
+    return counts
+
+def _after_key(sort_col: str, sort_descending: bool, key: tuple) -> pl.Expr:
+    # Rows that come after `key` in the (sort column, Row ID) order, nulls last.
+    value, row_id = key
+    col, rid = pl.col(sort_col), pl.col(ROW_ID_COLUMN)
+    if value is None:
+        return col.is_null() & (rid > row_id)
+    beyond = col < value if sort_descending else col > value
+    return beyond | ((col == value) & (rid > row_id)) | col.is_null()
+
+def _before_key(sort_col: str, sort_descending: bool, key: tuple) -> pl.Expr:
+    value, row_id = key
+    col, rid = pl.col(sort_col), pl.col(ROW_ID_COLUMN)
+    if value is None:
+        return col.is_not_null() | (rid < row_id)
+    ahead = col > value if sort_descending else col < value
+    return ahead | ((col == value) & (rid < row_id))
+
+def page_keys_query(lf: pl.LazyFrame, filters: dict, sort_order: str, offset: int, page_size: int, after: tuple | None = None, before: tuple | None = None) -> pl.LazyFrame:
+    # Filter and sort only the row ID, the sort key and the filtered columns, so
+    # the text columns never go through the sort. With `after` or `before` (a
+    # (sort value, Row ID) key from a neighbouring page) the page is found by
+    # key instead of by offset, so its cost does not grow with page depth.
+    column_names = lf.collect_schema().names()
+    sort_col, sort_descending = SORT_COLUMNS.get(sort_order, SORT_COLUMNS['popularity'])
+    keys = [ROW_ID_COLUMN] + [col for col in [sort_col] + filter_columns(filters, column_names) if col in column_names]
+    keys_lf = apply_filters(lf.select(list(dict.fromkeys(keys))), filters)
+    output = [col for col in (ROW_ID_COLUMN, sort_col) if col in column_names]
+    if sort_col in column_names and after is not None:
+        return apply_sort(keys_lf.filter(_after_key(sort_col, sort_descending, after)), sort_order).select(output).head(page_size)
+    if sort_col in column_names and before is not None:
+        return apply_sort(keys_lf.filter(_before_key(sort_col, sort_descending, before)), sort_order, reverse=True).select(output).head(page_size).reverse()
+    return apply_sort(keys_lf, sort_order).select(output).slice(offset, page_size)
+
+class PageCursors:
+    # First and last (sort value, Row ID) key of each page seen for one
+    # filter/sort combination. Moving to a neighbouring page seeks from these
+    # keys; jumps to pages with no known neighbour fall back to offsets.
+    def __init__(self):
+        self.signature = None
+        self.pages = {}
+
+    def reset_if_changed(self, filters: dict, sort_order: str) -> None:
+        signature = json.dumps({'filters': filters, 'sort_order': sort_order}, sort_keys=True, default=str)
+        if signature != self.signature:
+            self.signature = signature
+            self.pages = {}
+
+    def seek(self, page: int) -> dict:
+        if page > 1 and page - 1 in self.pages:
+            return {'after': self.pages[page - 1][1]}
+        if page + 1 in self.pages:
+            return {'before': self.pages[page + 1][0]}
+        return {}
+
+    def record(self, page: int, keys_df: pl.DataFrame, sort_order: str) -> None:
+        sort_col, _ = SORT_COLUMNS.get(sort_order, SORT_COLUMNS['popularity'])
+        if keys_df.is_empty() or sort_col not in keys_df.columns or ROW_ID_COLUMN not in keys_df.columns:
+            return
+        first, last = keys_df.row(0, named=True), keys_df.row(-1, named=True)
+        self.pages[page] = ((first[sort_col], first[ROW_ID_COLUMN]), (last[sort_col], last[ROW_ID_COLUMN]))
+
+def gather_rows(lf: pl.LazyFrame, row_ids: list[int]) -> pl.LazyFrame:
+    # Row IDs are positions in the source, so each row is a one-row slice, which
+    # Polars pushes into the scan. Rows come back in the order of row_ids.
+    page_lf = lf.select(page_columns(lf.collect_schema().names()))
+    if not row_ids:
+        return page_lf.clear()
+    return pl.concat([page_lf.slice(row_id, 1) for row_id in row_ids])
+
+def collect_now(lf: pl.LazyFrame) -> pl.DataFrame:
+    return lf.collect(**COLLECT_OPTIONS)
+
+@contextlib.contextmanager
+def untimed_stage(name: str):
+    # Stand-in for `RerunProfile.stage` when nobody is timing the steps.
+    yield types.SimpleNamespace(name=name, rows=None)
+
+def fetch_page(
+    lf: pl.LazyFrame, filters: dict, sort_order: str, page: int, page_size: int, cursors: PageCursors | None = None,
+    collect: Callable[[pl.LazyFrame], pl.DataFrame] = collect_now, stage: Callable = untimed_stage,
+    narrowed: tuple[pl.LazyFrame, dict, int | None] | None = None,
+) -> tuple[int, int, pl.DataFrame]:
+    # `collect` runs each query and `stage(name)` times each step. `narrowed` is
+    # a range-index result (`range_index.narrow_query`): the count and row-ID
+    # queries then run over its rows and remaining filters, while cursors stay
+    # keyed by the full filters and the page is still gathered from `lf`.
+    query_lf, query_filters, total_rows = narrowed if narrowed is not None else (lf, filters, None)
+    with stage('count') as timing:
+        if total_rows is None:
+            total_rows = collect(count_query(query_lf, query_filters)).item()
+        timing.rows = total_rows
+
+    total_pages = math.ceil(total_rows / page_size) if page_size > 0 and total_rows > 0 else 1
+    page = max(1, min(page, total_pages))
+    offset = (page - 1) * page_size
+
+    df_page = pl.DataFrame()
+    if total_rows > 0 and offset < total_rows:
+        with stage('page_keys') as timing:
+            seek = {}
+            if cursors is not None:
+                cursors.reset_if_changed(filters, sort_order)
+                seek = cursors.seek(page)
+            keys_df = collect(page_keys_query(query_lf, query_filters, sort_order, offset, page_size, **seek))
+            if cursors is not None:
+                cursors.record(page, keys_df, sort_order)
+            timing.rows = keys_df.height
+        with stage('page') as timing:
+            df_page = collect(gather_rows(lf, keys_df[ROW_ID_COLUMN].to_list()))
+            timing.rows = df_page.height
+    return total_rows, page, df_page
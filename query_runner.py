@@ -0,0 +1,127 @@
+import threading
+import time
+from typing import Callable
+
+import polars as pl
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from query_engine import COLLECT_OPTIONS
+from query_scheduler import INTERACTIVE, QUERY_TIMEOUT_SECONDS, QueryTimeout, scheduler
+
+POLL_INTERVAL_SECONDS = 0.01
+
+# session id -> (generation, in-flight query). Only the newest generation of a
+# session is allowed to keep running; older ones are cancelled when it starts.
+_in_flight_queries = {}
+_in_flight_lock = threading.Lock()
+
+# A cancelled query keeps running until Polars notices the cancellation, and
+# Polars aborts the whole process if a background query finishes after its
+# handle was dropped. Unfinished handles are parked here, as (query, priority)
+# pairs, until they have produced a result or an error. A draining query still
+# uses Polars' threads, so it keeps its scheduler slot until then.
+_draining_queries = []
+_draining_thread = None
+
+class QuerySuperseded(Exception):
+    pass
+
+def next_query_generation(session_state) -> int:
+    session_state.query_generation = session_state.get('query_generation', 0) + 1
+    return session_state.query_generation
+
+def _current_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+def _drain_loop():
+    global _draining_thread
+    while True:
+        with _in_flight_lock:
+            if not _draining_queries:
+                _draining_thread = None
+                return
+            pending = list(_draining_queries)
+        for entry in pending:
+            query, priority = entry
+            try:
+                finished = query.fetch() is not None
+            except Exception:
+                finished = True
+            if finished:
+                with _in_flight_lock:
+                    _draining_queries.remove(entry)
+                scheduler.release(priority)
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+def _cancel(query, priority: str) -> None:
+    # Hands the query and the slot it holds over to the drain thread.
+    query.cancel()
+    with _in_flight_lock:
+        global _draining_thread
+        _draining_queries.append((query, priority))
+        if _draining_thread is None:
+            _draining_thread = threading.Thread(target=_drain_loop, name='query-drain', daemon=True)
+            _draining_thread.start()
+
+def collect_latest(lf: pl.LazyFrame, generation: int, yield_point: Callable[[], object], priority: str = INTERACTIVE, timeout: float | None = QUERY_TIMEOUT_SECONDS) -> pl.DataFrame:
+    """Collect `lf` in the background, giving up as soon as a newer query of the same session exists.
+
+    `yield_point` is called between polls. Passing a Streamlit call (e.g. a
+    placeholder's `empty`) lets Streamlit interrupt this run when the component
+    has already sent a newer state, so superseded queries are cancelled instead
+    of queueing full reruns behind them.
+
+    The collect first waits for a slot from the process-wide query scheduler.
+    `timeout` covers both the wait and the run; past it the query is cancelled
+    and `QueryTimeout` is raised. The slot is held until the query has stopped,
+    which for a cancelled query is after it drains.
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    scheduler.acquire(priority, timeout, poll=yield_point)
+    try:
+        query = lf.collect(background=True, **COLLECT_OPTIONS)
+    except BaseException:
+        scheduler.release(priority)
+        raise
+    return _collect_latest(query, generation, yield_point, priority, deadline)
+
+def _collect_latest(query, generation: int, yield_point: Callable[[], object], priority: str, deadline: float | None) -> pl.DataFrame:
+    session_id = _current_session_id()
+
+    with _in_flight_lock:
+        previous = _in_flight_queries.get(session_id)
+        superseded_by = previous[0] if previous is not None and previous[0] > generation else None
+        if superseded_by is None:
+            _in_flight_queries[session_id] = (generation, query)
+    if superseded_by is not None:
+        _cancel(query, priority)
+        raise QuerySuperseded(f"Query generation {generation} superseded by {superseded_by}.")
+    if previous is not None:
+        # Its owner notices the newer generation on its next poll and drains it.
+        previous[1].cancel()
+
+    finished = False
+    try:
+        while True:
+            df = query.fetch()
+            if df is not None:
+                finished = True
+                return df
+            with _in_flight_lock:
+                latest_generation = _in_flight_queries.get(session_id, (generation,))[0]
+            if latest_generation > generation:
+                raise QuerySuperseded(f"Query generation {generation} superseded by {latest_generation}.")
+            if deadline is not None and time.monotonic() >= deadline:
+                scheduler.record_timeout(priority)
+                raise QueryTimeout("Query cancelled after reaching its timeout.")
+            time.sleep(POLL_INTERVAL_SECONDS)
+            yield_point()
+    finally:
+        with _in_flight_lock:
+            if _in_flight_queries.get(session_id, (None, None))[1] is query:
+                del _in_flight_queries[session_id]
+        if finished:
+            scheduler.release(priority)
+        else:
+            _cancel(query, priority)
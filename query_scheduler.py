@@ -0,0 +1,195 @@
+"""Process-wide admission control for Polars collects.
+
+Every session's collect runs on Polars' one shared thread pool, so fifty
+simultaneous queries do not get fifty times the CPU; they all slow down
+together. Heavy collects therefore take a slot from a process-wide scheduler
+first:
+
+    with scheduler.slot(INTERACTIVE, timeout=30):
+        df = lf.collect()
+
+At most `EXPLORER_MAX_CONCURRENT_QUERIES` collects run at once (half the CPUs
+by default). Waiting collects are admitted by priority, interactive page
+fetches before exports before background builds, and in arrival order within a
+priority. Running collects are not preempted, so exports and background builds
+share all but one slot and a long export never holds the last slot a page fetch
+could use. With a single slot configured, an interactive collect may take one
+extra slot while an export or background build holds the only one. A collect that cannot get a slot before its timeout raises
+`QueryTimeout`. Queue depth, running collects, wait times and timeouts are
+added to the Prometheus metrics written by `instrumentation.py`.
+"""
+import contextlib
+import heapq
+import itertools
+import os
+import threading
+import time
+from typing import Callable
+
+from instrumentation import register_collector
+
+INTERACTIVE = 'interactive'
+EXPORT = 'export'
+BACKGROUND = 'background'
+PRIORITIES = {INTERACTIVE: 0, EXPORT: 1, BACKGROUND: 2}
+
+# Histogram bucket upper bounds in seconds for the time spent waiting for a slot.
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+POLL_INTERVAL_SECONDS = 0.01
+
+class QueryTimeout(Exception):
+    pass
+
+class QueryScheduler:
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max(1, max_concurrent)
+        self.shared_slots = max(1, self.max_concurrent - 1)
+        self._condition = threading.Condition()
+        self._running = 0
+        self._shared_running = 0
+        # Heap of (priority rank, arrival number, priority name) tickets.
+        self._waiting = []
+        self._arrivals = itertools.count()
+        self._stats = {
+            priority: {'admitted': 0, 'timeouts': 0, 'wait_buckets': [0] * len(WAIT_BUCKETS), 'wait_sum': 0.0}
+            for priority in PRIORITIES
+        }
+
+    def _withdraw(self, ticket: tuple) -> None:
+        if ticket in self._waiting:
+            self._waiting.remove(ticket)
+            heapq.heapify(self._waiting)
+            self._condition.notify_all()
+
+    def _has_room(self, priority: str) -> bool:
+        if priority == INTERACTIVE:
+            # Only a single slot can be filled by shared collects; a page fetch may then run beside them.
+            return self._running < self.max_concurrent + (1 if self._shared_running >= self.max_concurrent else 0)
+        return self._running < self.max_concurrent and self._shared_running < self.shared_slots
+
+    def acquire(self, priority: str = INTERACTIVE, timeout: float | None = None, poll: Callable[[], object] | None = None) -> float:
+        # Blocks until this caller holds a slot and returns the seconds it
+        # waited. `poll` is called while waiting; whatever it raises (e.g.
+        # Streamlit interrupting a stale rerun) abandons the wait.
+        ticket = (PRIORITIES[priority], next(self._arrivals), priority)
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+        try:
+            while True:
+                with self._condition:
+                    if self._waiting[0] == ticket and self._has_room(priority):
+                        heapq.heappop(self._waiting)
+                        self._running += 1
+                        if priority != INTERACTIVE:
+                            self._shared_running += 1
+                        waited = time.monotonic() - start
+                        self._record_wait(priority, waited)
+                        self._condition.notify_all()
+                        return waited
+                    if deadline is not None and time.monotonic() >= deadline:
+                        self._withdraw(ticket)
+                        self._stats[priority]['timeouts'] += 1
+                        raise QueryTimeout(f"No query slot became free within {timeout:.1f}s ({len(self._waiting)} queries waiting, {self._running} running).")
+                    wait = POLL_INTERVAL_SECONDS if poll is not None else None
+                    if deadline is not None:
+                        remaining = max(0.0, deadline - time.monotonic())
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._condition.wait(wait)
+                if poll is not None:
+                    poll()
+        except BaseException:
+            with self._condition:
+                self._withdraw(ticket)
+            raise
+
+    def release(self, priority: str = INTERACTIVE) -> None:
+        with self._condition:
+            self._running -= 1
+            if priority != INTERACTIVE:
+                self._shared_running -= 1
+            self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self, priority: str = INTERACTIVE, timeout: float | None = None, poll: Callable[[], object] | None = None):
+        waited = self.acquire(priority, timeout, poll)
+        try:
+            yield waited
+        finally:
+            self.release(priority)
+
+    def record_timeout(self, priority: str) -> None:
+        with self._condition:
+            self._stats[priority]['timeouts'] += 1
+
+    def _record_wait(self, priority: str, seconds: float) -> None:
+        stats = self._stats[priority]
+        stats['admitted'] += 1
+        stats['wait_sum'] += seconds
+        for i, bound in enumerate(WAIT_BUCKETS):
+            if seconds <= bound:
+                stats['wait_buckets'][i] += 1
+
+    def _queued(self) -> dict:
+        queued = {priority: 0 for priority in PRIORITIES}
+        for _, _, priority in self._waiting:
+            queued[priority] += 1
+        return queued
+
+    def metrics(self) -> dict:
+        with self._condition:
+            queued = self._queued()
+            return {
+                'max_concurrent': self.max_concurrent,
+                'shared_slots': self.shared_slots,
+                'running': self._running,
+                'queued': queued,
+                'admitted': {priority: stats['admitted'] for priority, stats in self._stats.items()},
+                'timeouts': {priority: stats['timeouts'] for priority, stats in self._stats.items()},
+                'mean_wait_ms': {
+                    priority: round(stats['wait_sum'] / stats['admitted'] * 1000, 3) if stats['admitted'] else 0.0
+                    for priority, stats in self._stats.items()
+                },
+            }
+
+    def prometheus_lines(self) -> list[str]:
+        with self._condition:
+            queued = self._queued()
+            lines = [
+                "# HELP explorer_query_slots Concurrent collects the scheduler admits.",
+                "# TYPE explorer_query_slots gauge",
+                f"explorer_query_slots {self.max_concurrent}",
+                "# HELP explorer_queries_running Collects currently holding a slot.",
+                "# TYPE explorer_queries_running gauge",
+                f"explorer_queries_running {self._running}",
+                "# HELP explorer_queries_queued Collects waiting for a slot.",
+                "# TYPE explorer_queries_queued gauge",
+            ]
+            lines += [f'explorer_queries_queued{{priority="{priority}"}} {count}' for priority, count in queued.items()]
+            lines += [
+                "# HELP explorer_query_timeouts_total Collects abandoned at their timeout, waiting or running.",
+                "# TYPE explorer_query_timeouts_total counter",
+            ]
+            lines += [f'explorer_query_timeouts_total{{priority="{priority}"}} {stats["timeouts"]}' for priority, stats in self._stats.items()]
+            lines += [
+                "# HELP explorer_query_wait_seconds Time collects spent waiting for a slot.",
+                "# TYPE explorer_query_wait_seconds histogram",
+            ]
+            for priority, stats in self._stats.items():
+                for bound, count in zip(WAIT_BUCKETS, stats['wait_buckets']):
+                    lines.append(f'explorer_query_wait_seconds_bucket{{priority="{priority}",le="{bound}"}} {count}')
+                lines.append(f'explorer_query_wait_seconds_bucket{{priority="{priority}",le="+Inf"}} {stats["admitted"]}')
+                lines.append(f'explorer_query_wait_seconds_sum{{priority="{priority}"}} {stats["wait_sum"]:.6f}')
+                lines.append(f'explorer_query_wait_seconds_count{{priority="{priority}"}} {stats["admitted"]}')
+        return lines
+
+def _env_float(name: str) -> float | None:
+    value = os.environ.get(name)
+    return float(value) if value else None
+
+scheduler = QueryScheduler(int(os.environ.get("EXPLORER_MAX_CONCURRENT_QUERIES") or max(1, (os.cpu_count() or 2) // 2)))
+# Seconds an interactive collect may wait for a slot and run before it is abandoned.
+QUERY_TIMEOUT_SECONDS = _env_float("EXPLORER_QUERY_TIMEOUT") or 60.0
+
+register_collector(scheduler.prometheus_lines)
@@ -0,0 +1,141 @@
+"""Shared query service for the Data Explorer.
+
+Holds the dataset in memory once and answers filter/sort/page requests over a
+Unix socket, so several Streamlit servers can share one warm copy instead of
+every session scanning the source on its own:
+
+    python query_service.py --data data.parquet --socket /tmp/crowdinsight-query.sock
+    EXPLORER_QUERY_SOCKET=/tmp/crowdinsight-query.sock streamlit run Data_Explorer.py
+
+Every message is framed as a 4-byte big-endian length followed by the payload.
+A request is one JSON frame; a response is a JSON header frame followed by the
+page rows as an Arrow IPC frame.
+"""
+import argparse
+import io
+import json
+import os
+import socket
+import socketserver
+import struct
+
+# Before polars: out-of-core mode sets the streaming engine's memory budget.
+import out_of_core
+import polars as pl
+
+from prediction_store import attach_predictions
+from query_backends import QueryBackend
+from query_engine import PageCursors, collect_now, explorer_columns, fetch_page, scan_source, untimed_stage
+from query_scheduler import INTERACTIVE, QUERY_TIMEOUT_SECONDS, QueryScheduler
+
+DEFAULT_SOCKET_PATH = "/tmp/crowdinsight-query.sock"
+
+_LENGTH = struct.Struct(">I")
+
+class QueryServiceError(Exception):
+    pass
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Query service connection closed mid-message.")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def send_frame(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(_LENGTH.pack(len(payload)) + payload)
+
+def recv_frame(sock: socket.socket) -> bytes:
+    (size,) = _LENGTH.unpack(_recv_exactly(sock, _LENGTH.size))
+    return _recv_exactly(sock, size)
+
+def _frame_to_ipc(df: pl.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    df.write_ipc(buffer)
+    return buffer.getvalue()
+
+class QueryServiceClient(QueryBackend):
+    name = "query service"
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def fetch_page(
+        self, filters: dict, sort_order: str, page: int, page_size: int, cursors: PageCursors | None = None,
+        collect=collect_now, stage=untimed_stage,
+    ) -> tuple[int, int, pl.DataFrame]:
+        # The service runs and schedules the queries itself, by offset.
+        request = {"filters": filters, "sort_order": sort_order, "page": page, "page_size": page_size}
+        with stage("query_service") as timing, socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            send_frame(sock, json.dumps(request).encode("utf-8"))
+            header = json.loads(recv_frame(sock))
+            if "error" in header:
+                raise QueryServiceError(header["error"])
+            df_page = pl.read_ipc(io.BytesIO(recv_frame(sock)))
+            timing.rows = df_page.height
+        return header["total_rows"], header["page"], df_page
+
+class _QueryRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        try:
+            request = json.loads(recv_frame(self.request))
+            with server.scheduler.slot(INTERACTIVE, QUERY_TIMEOUT_SECONDS):
+                total_rows, page, df_page = fetch_page(
+                    server.base_lf,
+                    request["filters"],
+                    request["sort_order"],
+                    int(request["page"]),
+                    int(request["page_size"]),
+                )
+        except ConnectionError:
+            return
+        except Exception as e:
+            send_frame(self.request, json.dumps({"error": f"{type(e).__name__}: {e}"}).encode("utf-8"))
+            return
+        send_frame(self.request, json.dumps({"total_rows": total_rows, "page": page}).encode("utf-8"))
+        send_frame(self.request, _frame_to_ipc(df_page))
+
+class QueryServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, base_lf: pl.LazyFrame, max_concurrent_queries: int):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _QueryRequestHandler)
+        self.base_lf = base_lf
+        # Polars parallelises each collect internally; bounding concurrent
+        # collects keeps simultaneous sessions from oversubscribing the cores.
+        self.scheduler = QueryScheduler(max_concurrent_queries)
+
+def load_dataset(data_path: str) -> pl.LazyFrame:
+    # Only the columns the explorer reads are held in memory; in out-of-core
+    # mode every request scans the source instead. Predictions are attached as
+    # in the explorer, so 'predicted' sorts and ranges give the same pages.
+    lf = attach_predictions(scan_source(data_path), data_path)
+    lf = lf.select(explorer_columns(lf.collect_schema().names()))
+    return lf if out_of_core.OUT_OF_CORE_ENABLED else lf.collect().lazy()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Data Explorer queries from one in-memory dataset.")
+    parser.add_argument("--data", default=os.environ.get("EXPLORER_DATA_PATH", "data.parquet"))
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH)
+    parser.add_argument("--max-concurrent-queries", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    args = parser.parse_args()
+
+    base_lf = load_dataset(args.data)
+    with QueryServer(args.socket, base_lf, args.max_concurrent_queries) as server:
+        print(f"Serving '{args.data}' on {args.socket}")
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(args.socket)
+
+if __name__ == "__main__":
+    main()
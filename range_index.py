@@ -0,0 +1,75 @@
+"""Sorted-array indexes for the pledged, goal and raised range sliders.
+
+For each column the index keeps the non-null values in ascending order next
+to the Row IDs they came from. A `min <= value <= max` filter is then two
+binary searches that bound a contiguous run of Row IDs. With several range
+filters active, the shortest run is checked against the other columns'
+values, so the work is proportional to the matches rather than to the table.
+The explorer uses it in resident mode: the matching rows are gathered from the
+resident frame before any other filter runs, and when no other filter is
+active the match count comes straight from the index.
+"""
+import numpy as np
+import polars as pl
+
+from query_engine import ROW_ID_COLUMN, SORT_COLUMNS, filter_columns
+
+INDEXED_RANGES = {'pledged': 'Raw Pledged', 'goal': 'Raw Goal', 'raised': 'Raw Raised'}
+# Above this share of all rows, narrowing by index costs more than it saves.
+MAX_SELECTED_FRACTION = 0.25
+
+class RangeIndex:
+    def __init__(self, frame: pl.DataFrame):
+        self.n_rows = frame.height
+        id_dtype = np.int32 if frame.height < 2**31 else np.int64
+        self.columns = {}
+        for key, col in INDEXED_RANGES.items():
+            if col not in frame.columns or not frame[col].dtype.is_numeric():
+                continue
+            # Row order values, used to check the other ranges for candidate rows. Nulls read as NaN and fail every bound.
+            series = frame[col] if frame[col].dtype in (pl.Float32, pl.Float64) else frame[col].cast(pl.Float64)
+            values = series.to_numpy()
+            present = np.flatnonzero(~np.isnan(values)).astype(id_dtype)
+            order = present[np.argsort(values[present], kind='stable')]
+            # Sorted values are kept as float64 so slider bounds are compared exactly and searched without a cast.
+            self.columns[key] = (values[order].astype(np.float64), order, values)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(sorted_values.nbytes + row_ids.nbytes for sorted_values, row_ids, _ in self.columns.values())
+
+    def span(self, key: str, low: float, high: float) -> np.ndarray:
+        sorted_values, row_ids, _ = self.columns[key]
+        start = np.searchsorted(sorted_values, low, side='left')
+        end = np.searchsorted(sorted_values, high, side='right')
+        return row_ids[start:end]
+
+    def select(self, ranges: dict) -> np.ndarray | None:
+        # Row IDs matching every indexed range, ascending; None when the
+        # ranges do not narrow the table enough to be worth it.
+        active = {key: ranges[key] for key in self.columns if key in ranges}
+        if not active:
+            return None
+        spans = {key: self.span(key, bounds['min'], bounds['max']) for key, bounds in active.items()}
+        narrowest = min(spans, key=lambda key: len(spans[key]))
+        row_ids = spans[narrowest]
+        if len(row_ids) > MAX_SELECTED_FRACTION * self.n_rows:
+            return None
+        for key, bounds in active.items():
+            if key != narrowest:
+                values = self.columns[key][2][row_ids]
+                row_ids = row_ids[(values >= bounds['min']) & (values <= bounds['max'])]
+        return np.sort(row_ids)
+
+def narrow_query(frame: pl.DataFrame, index: RangeIndex, filters: dict, sort_order: str) -> tuple[pl.LazyFrame, dict, int | None] | None:
+    # Returns the matching rows' key columns, the filters still to apply and,
+    # when nothing else filters, the exact match count.
+    row_ids = index.select(filters.get('ranges', {}))
+    if row_ids is None:
+        return None
+    remaining = {**filters, 'ranges': {key: bounds for key, bounds in filters.get('ranges', {}).items() if key not in index.columns}}
+    sort_col, _ = SORT_COLUMNS.get(sort_order, SORT_COLUMNS['popularity'])
+    remaining_columns = filter_columns(remaining, frame.columns)
+    key_columns = [col for col in dict.fromkeys([ROW_ID_COLUMN, sort_col] + remaining_columns) if col in frame.columns]
+    narrowed = frame.select(key_columns)[row_ids].lazy()
+    return narrowed, remaining, None if remaining_columns else len(row_ids)
@@ -0,0 +1,161 @@
+"""Resident mode: one compact in-memory copy of the dataset per process.
+
+    python resident_store.py data.parquet           # print the memory report
+    EXPLORER_RESIDENT=1 streamlit run Data_Explorer.py
+
+The source is loaded once and every session queries the same frame instead of
+scanning the file from its own `base_lf`. The frame is made smaller than a
+plain `collect()`:
+
+- Category, Subcategory, Country and State become `pl.Enum` columns whose
+  categories come from `filter_metadata.json` (plus any value the metadata
+  does not list), so each row stores a small integer code.
+- Float and integer columns are narrowed to the smallest type that holds
+  every value exactly; columns that would lose precision are left as they are.
+- 'Link' keeps only the part after the prefix shared by every link, and the
+  full URL is rebuilt lazily, so it is only materialized for rows that are
+  actually fetched.
+
+Sorted-array indexes over the range-slider columns (see `range_index.py`) are
+built with the frame.
+"""
+import functools
+import json
+import os
+import sys
+
+import polars as pl
+
+from prediction_store import attach_predictions, predictions_paths
+from query_engine import ROW_ID_COLUMN, scan_source
+from query_scheduler import BACKGROUND, scheduler
+from range_index import RangeIndex, narrow_query
+
+# column -> filter_metadata.json key listing its values
+ENUM_COLUMNS = {'Category': 'categories', 'Subcategory': 'subcategories', 'Country': 'countries', 'State': 'states'}
+LINK_COLUMN = 'Link'
+_INTEGER_TYPES = [(pl.Int8, 8), (pl.Int16, 16), (pl.Int32, 32), (pl.Int64, 64)]
+
+def _enum_dtype(series: pl.Series, metadata_values: list[str]) -> pl.Enum:
+    known = [v for v in metadata_values if not v.startswith('All ')]
+    extra = sorted(set(series.drop_nulls().cast(pl.Utf8).unique().to_list()) - set(known))
+    return pl.Enum(known + extra)
+
+def _narrow_numeric(series: pl.Series) -> pl.Series:
+    values = series.drop_nulls()
+    if series.dtype == pl.Float64:
+        narrowed = series.cast(pl.Float32)
+        if values.is_empty() or (narrowed.drop_nulls().cast(pl.Float64) == values).all():
+            return narrowed
+    elif series.dtype.is_signed_integer() and not values.is_empty():
+        low, high = values.min(), values.max()
+        for dtype, bits in _INTEGER_TYPES:
+            if -(1 << (bits - 1)) <= low and high < (1 << (bits - 1)):
+                return series.cast(dtype)
+    return series
+
+def _shared_prefix(series: pl.Series) -> str:
+    # The common prefix of the lexicographically smallest and largest values is
+    # shared by every value in between.
+    values = series.drop_nulls()
+    if values.is_empty():
+        return ''
+    return os.path.commonprefix([values.min(), values.max()])
+
+def compact_frame(df: pl.DataFrame, metadata: dict) -> tuple[pl.DataFrame, str]:
+    columns = []
+    link_prefix = ''
+    for name in df.columns:
+        series = df[name]
+        if name in ENUM_COLUMNS and series.dtype == pl.Utf8:
+            series = series.cast(_enum_dtype(series, metadata.get(ENUM_COLUMNS[name], [])))
+        elif name == LINK_COLUMN and series.dtype == pl.Utf8:
+            link_prefix = _shared_prefix(series)
+            series = series.str.slice(len(link_prefix))
+        elif name != ROW_ID_COLUMN and series.dtype.is_numeric():
+            series = _narrow_numeric(series)
+        columns.append(series)
+    # One chunk per column keeps row gathers (page rows, range index matches) cheap.
+    return pl.DataFrame(columns).rechunk(), link_prefix
+
+def _dtype_label(dtype: pl.DataType) -> str:
+    return f"Enum({len(dtype.categories)} categories)" if isinstance(dtype, pl.Enum) else str(dtype)
+
+class ResidentDataset:
+    def __init__(self, frame: pl.DataFrame, link_prefix: str, naive_sizes: dict):
+        self.frame = frame
+        self.link_prefix = link_prefix
+        self.naive_sizes = naive_sizes
+        self.range_index = RangeIndex(frame)
+
+    def lazy(self) -> pl.LazyFrame:
+        lf = self.frame.lazy()
+        if LINK_COLUMN in self.frame.columns:
+            lf = lf.with_columns(pl.concat_str([pl.lit(self.link_prefix), pl.col(LINK_COLUMN)]).alias(LINK_COLUMN))
+        return lf
+
+    def narrow(self, filters: dict, sort_order: str) -> tuple[pl.LazyFrame, dict, int | None] | None:
+        return narrow_query(self.frame, self.range_index, filters, sort_order)
+
+    def memory_report(self) -> dict:
+        columns = {
+            name: {
+                'naive_mb': round(self.naive_sizes[name]['bytes'] / 1e6, 2),
+                'naive_dtype': self.naive_sizes[name]['dtype'],
+                'resident_mb': round(self.frame[name].estimated_size() / 1e6, 2),
+                'resident_dtype': _dtype_label(self.frame[name].dtype),
+            }
+            for name in self.frame.columns
+        }
+        naive_bytes = sum(size['bytes'] for size in self.naive_sizes.values())
+        resident_bytes = self.frame.estimated_size()
+        return {
+            'rows': self.frame.height,
+            'naive_mb': round(naive_bytes / 1e6, 2),
+            'resident_mb': round(resident_bytes / 1e6, 2),
+            'saved_percent': round(100 * (1 - resident_bytes / naive_bytes), 1) if naive_bytes else 0.0,
+            'range_index_mb': round(self.range_index.nbytes / 1e6, 2),
+            'link_prefix': self.link_prefix,
+            'columns': columns,
+        }
+
+def _read_metadata(metadata_path: str) -> dict:
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: could not read '{metadata_path}' ({e}); enum categories will come from the data only.")
+        return {}
+
+@functools.lru_cache(maxsize=1)
+def _load_cached(path: str, mtime: float, predictions_mtime: float | None, metadata_path: str, metadata_mtime: float | None) -> ResidentDataset:
+    with scheduler.slot(BACKGROUND):
+        naive = attach_predictions(scan_source(path), path).collect()
+    naive_sizes = {name: {'bytes': naive[name].estimated_size(), 'dtype': _dtype_label(naive[name].dtype)} for name in naive.columns}
+    frame, link_prefix = compact_frame(naive, _read_metadata(metadata_path))
+    del naive
+    dataset = ResidentDataset(frame, link_prefix, naive_sizes)
+    report = dataset.memory_report()
+    print(
+        f"Resident dataset '{path}': {report['rows']:,} rows, {report['resident_mb']} MB "
+        f"(naive load {report['naive_mb']} MB, {report['saved_percent']}% smaller), "
+        f"range indexes {report['range_index_mb']} MB."
+    )
+    return dataset
+
+def _mtime(path: str) -> float | None:
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+def load_resident(path: str, metadata_path: str = 'filter_metadata.json') -> ResidentDataset:
+    return _load_cached(
+        os.path.abspath(path),
+        os.path.getmtime(path),
+        _mtime(predictions_paths(path)[0]),
+        os.path.abspath(metadata_path),
+        _mtime(metadata_path),
+    )
+
+if __name__ == "__main__":
+    source_path = sys.argv[1] if len(sys.argv) > 1 else os.environ.get("EXPLORER_DATA_PATH", "data.parquet")
+    metadata_path = sys.argv[2] if len(sys.argv) > 2 else 'filter_metadata.json'
+    print(json.dumps(load_resident(source_path, metadata_path).memory_report(), indent=2))
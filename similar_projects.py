@@ -0,0 +1,269 @@
+"""Approximate nearest-neighbour index of comparable projects.
+
+    python similar_projects.py data.parquet         # build similar_index.npz next to data.parquet
+
+Each project becomes an L2-normalised vector of standardised numeric features
+(goal, pledged, backers, duration, launch year), a one-hot category, a one-hot
+of its country among the most common ones, and optionally hashed name tokens.
+Vectors are grouped into an IVF index (k-means coarse clusters in NumPy); a
+lookup scores only the `nprobe` closest clusters, so it stays in milliseconds
+at millions of rows. Row IDs are positions in the data source, matching the
+explorer's 'Row ID' column. The index records the source's modification time
+and row count, and `load_index` raises `StaleIndexError` when either no longer
+matches, so a changed dataset never resolves neighbours to the wrong projects.
+Building takes seconds to minutes, so it only happens here, never in a rerun.
+"""
+import argparse
+import datetime
+import functools
+import os
+import threading
+
+import numpy as np
+import polars as pl
+
+from query_engine import ROW_ID_COLUMN, scan_source
+
+INDEX_FILENAME = "similar_index.npz"
+
+class StaleIndexError(Exception):
+    """The index was built from a different version of the data source."""
+
+NUMERIC_FEATURES = ['log_goal', 'log_pledged', 'log_backers', 'duration_days', 'launch_year']
+TOP_COUNTRIES = 15
+NAME_BUCKETS = 32
+CATEGORY_WEIGHT = 1.5
+COUNTRY_WEIGHT = 0.75
+NAME_WEIGHT = 0.5
+SOURCE_COLUMNS = ['Project Name', 'Category', 'Country', 'Raw Goal', 'Raw Pledged', 'Backer Count', 'Raw Date', 'Raw Deadline']
+
+def _numeric_exprs() -> list[pl.Expr]:
+    raw_date = pl.col('Raw Date').cast(pl.Datetime, strict=False)
+    return [
+        pl.col('Raw Goal').cast(pl.Float64).clip(lower_bound=0).log1p().alias('log_goal'),
+        pl.col('Raw Pledged').cast(pl.Float64).clip(lower_bound=0).log1p().alias('log_pledged'),
+        pl.col('Backer Count').cast(pl.Float64).clip(lower_bound=0).log1p().alias('log_backers'),
+        (pl.col('Raw Deadline').cast(pl.Datetime, strict=False) - raw_date).dt.total_seconds().truediv(86400.0).alias('duration_days'),
+        raw_date.dt.year().cast(pl.Float64).alias('launch_year'),
+    ]
+
+def _vocab_index(col: str, vocabulary: list[str]) -> pl.Expr:
+    return (
+        pl.col(col).cast(pl.Utf8)
+        .replace_strict(vocabulary, list(range(len(vocabulary))), default=len(vocabulary), return_dtype=pl.Int32)
+        .alias(f'{col}_idx')
+    )
+
+def _one_hot(indices: np.ndarray, width: int) -> np.ndarray:
+    block = np.zeros((len(indices), width), dtype=np.float32)
+    block[np.arange(len(indices)), indices] = 1.0
+    return block
+
+def _name_block(frame: pl.DataFrame) -> np.ndarray:
+    block = np.zeros((frame.height, NAME_BUCKETS), dtype=np.float32)
+    if 'Project Name' not in frame.columns:
+        return block
+    tokens = (
+        frame.select(
+            pl.int_range(pl.len(), dtype=pl.Int64).alias('_row'),
+            pl.col('Project Name').cast(pl.Utf8).str.to_lowercase().str.extract_all(r'[a-z0-9]+').alias('_token'),
+        )
+        .explode('_token')
+        .drop_nulls('_token')
+        .select('_row', (pl.col('_token').hash() % NAME_BUCKETS).cast(pl.Int64).alias('_bucket'))
+    )
+    np.add.at(block, (tokens['_row'].to_numpy(), tokens['_bucket'].to_numpy()), 1.0)
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    return np.divide(block, norms, out=block, where=norms > 0)
+
+class SimilarityIndex:
+    def __init__(self, centroids, offsets, row_ids, vectors, means, stds, categories, countries, use_names, source_mtime=float('nan'), source_rows=-1):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.row_ids = np.asarray(row_ids, dtype=np.int64)
+        self.vectors = np.asarray(vectors, dtype=np.float32)
+        self.means = np.asarray(means, dtype=np.float64)
+        self.stds = np.asarray(stds, dtype=np.float64)
+        self.categories = [str(c) for c in categories]
+        self.countries = [str(c) for c in countries]
+        self.use_names = bool(use_names)
+        self.source_mtime = float(source_mtime)
+        self.source_rows = int(source_rows)
+        self._positions = None
+
+    def matches_source(self, data_path: str) -> bool:
+        return (
+            self.source_mtime == os.path.getmtime(data_path)
+            and self.source_rows == scan_source(data_path).select(pl.len()).collect().item()
+        )
+
+    def encode(self, frame: pl.DataFrame) -> np.ndarray:
+        encoded = frame.lazy().select(
+            *_numeric_exprs(), _vocab_index('Category', self.categories), _vocab_index('Country', self.countries)
+        ).collect()
+        numeric = encoded.select(NUMERIC_FEATURES).to_numpy().astype(np.float64)
+        numeric = np.nan_to_num((numeric - self.means) / self.stds, nan=0.0).astype(np.float32)
+        blocks = [
+            numeric,
+            CATEGORY_WEIGHT * _one_hot(encoded['Category_idx'].to_numpy(), len(self.categories) + 1),
+            COUNTRY_WEIGHT * _one_hot(encoded['Country_idx'].to_numpy(), len(self.countries) + 1),
+        ]
+        if self.use_names:
+            blocks.append(NAME_WEIGHT * _name_block(frame))
+        vectors = np.hstack(blocks)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+    def encode_what_if(self, goal: float, category: str, country: str, duration_days: float) -> np.ndarray:
+        launch = datetime.datetime.now()
+        frame = pl.DataFrame(
+            {
+                'Category': [category], 'Country': [country], 'Raw Goal': [float(goal)],
+                'Raw Pledged': [None], 'Backer Count': [None],
+                'Raw Date': [launch], 'Raw Deadline': [launch + datetime.timedelta(days=duration_days)],
+            },
+            schema_overrides={'Raw Pledged': pl.Float64, 'Backer Count': pl.Int64},
+        )
+        return self.encode(frame)[0]
+
+    def search(self, vector: np.ndarray, k: int = 10, nprobe: int = 8, exclude_row: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        nprobe = min(nprobe, len(self.centroids))
+        centroid_scores = self.centroids @ vector
+        probed = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        spans = [np.arange(self.offsets[c], self.offsets[c + 1]) for c in probed]
+        candidates = np.concatenate(spans) if spans else np.empty(0, dtype=np.int64)
+        if exclude_row is not None:
+            candidates = candidates[self.row_ids[candidates] != exclude_row]
+        if len(candidates) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        scores = self.vectors[candidates] @ vector
+        top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return self.row_ids[candidates[top]], scores[top]
+
+    def similar_to_row(self, row_id: int, k: int = 10, nprobe: int = 8) -> tuple[np.ndarray, np.ndarray]:
+        if self._positions is None:
+            positions = np.empty(len(self.row_ids), dtype=np.int64)
+            positions[self.row_ids] = np.arange(len(self.row_ids))
+            self._positions = positions
+        if not 0 <= row_id < len(self._positions):
+            raise KeyError(f"Row {row_id} is not in the similarity index.")
+        return self.search(self.vectors[self._positions[row_id]], k=k, nprobe=nprobe, exclude_row=row_id)
+
+    def save(self, path: str) -> None:
+        # Write then rename, so a reader never loads a half-written index.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                centroids=self.centroids, offsets=self.offsets, row_ids=self.row_ids, vectors=self.vectors,
+                means=self.means, stds=self.stds,
+                categories=np.asarray(self.categories, dtype=str), countries=np.asarray(self.countries, dtype=str),
+                use_names=np.array(self.use_names),
+                source_mtime=np.array(self.source_mtime), source_rows=np.array(self.source_rows),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SimilarityIndex":
+        with np.load(path, allow_pickle=False) as artifact:
+            return cls(**{name: artifact[name] for name in artifact.files})
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk_size):
+        assignments[start:start + chunk_size] = np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+    return assignments
+
+def build_index(lf: pl.LazyFrame, use_names: bool = True, n_lists: int | None = None, iterations: int = 10, seed: int = 0) -> SimilarityIndex:
+    frame = lf.select(SOURCE_COLUMNS).collect()
+    if frame.height == 0:
+        raise ValueError("No projects to index.")
+
+    raw_numeric = frame.select(_numeric_exprs()).to_numpy().astype(np.float64)
+    means = np.nan_to_num(np.nanmean(raw_numeric, axis=0))
+    stds = np.nan_to_num(np.nanstd(raw_numeric, axis=0), nan=1.0)
+    stds[stds == 0] = 1.0
+    categories = frame['Category'].cast(pl.Utf8).drop_nulls().unique().sort().to_list()
+    countries = (
+        frame['Country'].cast(pl.Utf8).drop_nulls().value_counts(sort=True).head(TOP_COUNTRIES)['Country'].to_list()
+    )
+
+    index = SimilarityIndex(
+        centroids=np.empty((0, 0)), offsets=[0], row_ids=[], vectors=np.empty((0, 0)),
+        means=means, stds=stds, categories=categories, countries=countries, use_names=use_names,
+    )
+    vectors = index.encode(frame)
+
+    # Spherical k-means on a sample for the coarse quantizer, then assign every row.
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    n_lists = n_lists or int(min(4096, max(1, round(np.sqrt(n)))))
+    sample = vectors[rng.choice(n, size=min(n, n_lists * 64), replace=False)]
+    centroids = sample[rng.choice(len(sample), size=min(n_lists, len(sample)), replace=False)].copy()
+    for _ in range(iterations):
+        sample_assignments = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, sample_assignments, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty clusters keep their previous centroid.
+        centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1.0), centroids)
+
+    assignments = _assign(vectors, centroids)
+    order = np.argsort(assignments, kind='stable')
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=len(centroids)))])
+
+    index.centroids = centroids.astype(np.float32)
+    index.offsets = offsets.astype(np.int64)
+    index.row_ids = order.astype(np.int64)
+    index.vectors = vectors[order]
+    return index
+
+def index_path(data_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(data_path)), INDEX_FILENAME)
+
+def build_source_index(data_path: str, use_names: bool = True) -> SimilarityIndex:
+    source_mtime = os.path.getmtime(data_path)
+    index = build_index(scan_source(data_path), use_names=use_names)
+    index.source_mtime = source_mtime
+    index.source_rows = len(index.row_ids)
+    return index
+
+_load_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _load_index_cached(path: str, mtime: float, data_path: str, source_mtime: float) -> SimilarityIndex | None:
+    index = SimilarityIndex.load(path)
+    if index.matches_source(data_path):
+        return index
+    print(f"Warning: '{path}' was built from an older '{data_path}'. Rebuild it with `python similar_projects.py {data_path}`.")
+    return None
+
+def load_index(data_path: str) -> SimilarityIndex:
+    # Keyed by both modification times, so the source check runs once per
+    # change to either file rather than on every rerun; the lock keeps
+    # concurrent sessions from each loading their own copy.
+    path = index_path(data_path)
+    with _load_lock:
+        index = _load_index_cached(path, os.path.getmtime(path), os.path.abspath(data_path), os.path.getmtime(data_path))
+    if index is None:
+        raise StaleIndexError(f"The similar-projects index at '{path}' is out of date with '{data_path}'.")
+    return index
+
+def fetch_rows(lf: pl.LazyFrame, row_ids: np.ndarray) -> pl.DataFrame:
+    rows = lf.filter(pl.col(ROW_ID_COLUMN).is_in(pl.Series(row_ids.tolist(), dtype=pl.get_index_type()).implode())).collect()
+    # Return rows in the order they were ranked.
+    rank = pl.DataFrame({ROW_ID_COLUMN: pl.Series(row_ids.tolist(), dtype=rows.schema[ROW_ID_COLUMN]), '_rank': range(len(row_ids))})
+    return rows.join(rank, on=ROW_ID_COLUMN).sort('_rank').drop('_rank')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the similar-projects index.")
+    parser.add_argument('data_path', nargs='?', default=os.environ.get("EXPLORER_DATA_PATH", "data.parquet"))
+    parser.add_argument('--output', help="Index path (default: similar_index.npz next to the data source).")
+    parser.add_argument('--no-names', action='store_true', help="Leave hashed project-name tokens out of the vectors.")
+    args = parser.parse_args()
+    output = args.output or index_path(args.data_path)
+    built = build_source_index(args.data_path, use_names=not args.no_names)
+    built.save(output)
+    print(f"Indexed {len(built.row_ids):,} projects into {len(built.centroids):,} lists at '{output}'.")
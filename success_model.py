@@ -0,0 +1,221 @@
+"""Project success classifier behind the AI Prediction page.
+
+A logistic regression over goal, duration, backers, category and country,
+trained with NumPy on finished projects from `data.parquet`. Categories and
+countries are learned as per-value weights (equivalent to one-hot encoding)
+and looked up by index at prediction time, so batch scoring is a handful of
+vectorised Polars/NumPy operations:
+
+    python success_model.py data.parquet            # train and save success_model.npz and what_if_model.npz
+
+`WhatIfPredictor` is the single-project path for interactive what-if edits: it
+unpacks the model into plain Python floats and dicts once, so each evaluation is
+a few arithmetic operations instead of a Polars/NumPy round trip. A what-if
+project has not launched, so it is scored by a separate pre-launch model trained
+without the backer count, which would otherwise dominate the score.
+"""
+import functools
+import math
+import os
+import sys
+
+import numpy as np
+import polars as pl
+
+from query_engine import scan_source
+
+MODEL_PATH = "success_model.npz"
+WHAT_IF_MODEL_PATH = "what_if_model.npz"
+PREDICTION_COLUMN = "Predicted Success"
+
+NUMERIC_FEATURES = ['log_goal', 'duration_days', 'log_backers']
+PRE_LAUNCH_FEATURES = ['log_goal', 'duration_days']
+FINISHED_STATES = ['successful', 'failed', 'canceled', 'suspended']
+
+def _numeric_feature_exprs(features: list[str]) -> list[pl.Expr]:
+    exprs = [
+        pl.col('Raw Goal').cast(pl.Float64).clip(lower_bound=0).log1p().alias('log_goal'),
+        (pl.col('Raw Deadline').cast(pl.Datetime, strict=False) - pl.col('Raw Date').cast(pl.Datetime, strict=False))
+            .dt.total_seconds().truediv(86400.0).alias('duration_days'),
+        pl.col('Backer Count').cast(pl.Float64).clip(lower_bound=0).log1p().alias('log_backers'),
+    ]
+    return [expr for expr in exprs if expr.meta.output_name() in features]
+
+def _index_expr(col: str, vocabulary: np.ndarray) -> pl.Expr:
+    # Unseen values map to the trailing "unknown" slot, whose weight stays 0.
+    return (
+        pl.col(col).cast(pl.Utf8)
+        .replace_strict(vocabulary.tolist(), list(range(len(vocabulary))), default=len(vocabulary), return_dtype=pl.Int32)
+        .alias(f'{col}_idx')
+    )
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30.0, 30.0)))
+
+class SuccessModel:
+    def __init__(self, weights, bias, category_weights, country_weights, means, stds, categories, countries, category_base_rates=None, features=None):
+        self.features = [str(f) for f in features] if features is not None else list(NUMERIC_FEATURES)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.category_weights = np.asarray(category_weights, dtype=np.float64)
+        self.country_weights = np.asarray(country_weights, dtype=np.float64)
+        self.means = np.asarray(means, dtype=np.float64)
+        self.stds = np.asarray(stds, dtype=np.float64)
+        self.categories = np.asarray(categories, dtype=str)
+        self.countries = np.asarray(countries, dtype=str)
+        self.category_base_rates = np.asarray(
+            category_base_rates if category_base_rates is not None else np.full(len(self.categories), np.nan),
+            dtype=np.float64,
+        )
+
+    def _encode(self, frame: pl.DataFrame | pl.LazyFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        encoded = frame.lazy().select(
+            *_numeric_feature_exprs(self.features),
+            _index_expr('Category', self.categories),
+            _index_expr('Country', self.countries),
+        ).collect()
+        numeric = encoded.select(self.features).to_numpy().astype(np.float64)
+        # Missing values become the training mean, i.e. 0 once standardised.
+        numeric = np.nan_to_num((numeric - self.means) / self.stds, nan=0.0)
+        return numeric, encoded['Category_idx'].to_numpy(), encoded['Country_idx'].to_numpy()
+
+    def _logits(self, numeric, category_idx, country_idx) -> np.ndarray:
+        return self.bias + numeric @ self.weights + self.category_weights[category_idx] + self.country_weights[country_idx]
+
+    def predict(self, frame: pl.DataFrame | pl.LazyFrame) -> pl.Series:
+        probabilities = _sigmoid(self._logits(*self._encode(frame)))
+        return pl.Series(PREDICTION_COLUMN, probabilities, dtype=pl.Float32)
+
+    def save(self, path: str = MODEL_PATH) -> None:
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                weights=self.weights, bias=np.array(self.bias),
+                category_weights=self.category_weights, country_weights=self.country_weights,
+                means=self.means, stds=self.stds,
+                categories=self.categories, countries=self.countries,
+                category_base_rates=self.category_base_rates,
+                features=np.asarray(self.features, dtype=str),
+            )
+
+    @classmethod
+    def load(cls, path: str = MODEL_PATH) -> "SuccessModel":
+        with np.load(path, allow_pickle=False) as artifact:
+            return cls(**{name: artifact[name] for name in artifact.files})
+
+def train(lf: pl.LazyFrame, epochs: int = 300, learning_rate: float = 0.05, l2: float = 1e-4, features: list[str] = NUMERIC_FEATURES) -> SuccessModel:
+    finished = lf.filter(pl.col('State').cast(pl.Utf8).str.to_lowercase().is_in(FINISHED_STATES))
+    vocabularies = finished.select(
+        pl.col('Category').cast(pl.Utf8).drop_nulls().unique().sort().implode(),
+        pl.col('Country').cast(pl.Utf8).drop_nulls().unique().sort().implode(),
+    ).collect()
+    categories = np.asarray(vocabularies['Category'][0].to_list(), dtype=str)
+    countries = np.asarray(vocabularies['Country'][0].to_list(), dtype=str)
+
+    labels = finished.select(
+        (pl.col('State').cast(pl.Utf8).str.to_lowercase() == 'successful').cast(pl.Float64)
+    ).collect().to_series().to_numpy()
+    if len(labels) == 0:
+        raise ValueError("No finished projects to train on.")
+
+    raw_numeric = finished.select(_numeric_feature_exprs(features)).collect().to_numpy().astype(np.float64)
+    means = np.nan_to_num(np.nanmean(raw_numeric, axis=0))
+    stds = np.nan_to_num(np.nanstd(raw_numeric, axis=0), nan=1.0)
+    stds[stds == 0] = 1.0
+
+    model = SuccessModel(
+        weights=np.zeros(len(features)), bias=0.0,
+        category_weights=np.zeros(len(categories) + 1), country_weights=np.zeros(len(countries) + 1),
+        means=means, stds=stds, categories=categories, countries=countries, features=features,
+    )
+    numeric, category_idx, country_idx = model._encode(finished)
+    category_counts = np.bincount(category_idx, minlength=len(categories) + 1)[:-1]
+    category_successes = np.bincount(category_idx, weights=labels, minlength=len(categories) + 1)[:-1]
+    model.category_base_rates = np.divide(
+        category_successes, category_counts, out=np.full(len(categories), np.nan), where=category_counts > 0
+    )
+
+    # Full-batch Adam; the categorical gradients are per-index sums via bincount,
+    # so the one-hot design matrix is never materialised.
+    n = len(labels)
+    params = [model.weights, np.array([model.bias]), model.category_weights, model.country_weights]
+    first_moments = [np.zeros_like(p) for p in params]
+    second_moments = [np.zeros_like(p) for p in params]
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    for step in range(1, epochs + 1):
+        model.bias = params[1][0]
+        error = _sigmoid(model._logits(numeric, category_idx, country_idx)) - labels
+        grads = [
+            numeric.T @ error / n + l2 * params[0],
+            np.array([error.mean()]),
+            np.bincount(category_idx, weights=error, minlength=len(params[2])) / n + l2 * params[2],
+            np.bincount(country_idx, weights=error, minlength=len(params[3])) / n + l2 * params[3],
+        ]
+        for param, grad, m, v in zip(params, grads, first_moments, second_moments):
+            m *= beta1
+            m += (1 - beta1) * grad
+            v *= beta2
+            v += (1 - beta2) * grad ** 2
+            param -= learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+    model.bias = params[1][0]
+    return model
+
+@functools.lru_cache(maxsize=1)
+def _load_model_cached(path: str, mtime: float) -> SuccessModel:
+    return SuccessModel.load(path)
+
+def load_model(path: str = MODEL_PATH) -> SuccessModel:
+    # Keyed by mtime so a retrained artifact is picked up without a restart,
+    # while every rerun and session in the process shares one loaded model.
+    return _load_model_cached(os.path.abspath(path), os.path.getmtime(path))
+
+def predict(frame: pl.DataFrame | pl.LazyFrame, model_path: str = MODEL_PATH) -> pl.Series:
+    return load_model(model_path).predict(frame)
+
+class WhatIfPredictor:
+    def __init__(self, model: SuccessModel):
+        if model.features != PRE_LAUNCH_FEATURES:
+            raise ValueError(f"What-if predictions need a pre-launch model over {PRE_LAUNCH_FEATURES}, got {model.features}.")
+        self.bias = model.bias
+        self.weights = model.weights.tolist()
+        self.means = model.means.tolist()
+        self.stds = model.stds.tolist()
+        self.categories = model.categories.tolist()
+        self.countries = model.countries.tolist()
+        self.category_weights = dict(zip(self.categories, model.category_weights[:-1].tolist()))
+        self.country_weights = dict(zip(self.countries, model.country_weights[:-1].tolist()))
+        self.category_base_rates = {
+            category: rate for category, rate in zip(self.categories, model.category_base_rates.tolist()) if not math.isnan(rate)
+        }
+
+    def predict_one(self, goal: float, category: str, country: str, duration_days: float) -> float:
+        w_goal, w_duration = self.weights
+        m_goal, m_duration = self.means
+        s_goal, s_duration = self.stds
+        z = (
+            self.bias
+            + w_goal * (math.log1p(max(goal, 0.0)) - m_goal) / s_goal
+            + w_duration * (duration_days - m_duration) / s_duration
+            + self.category_weights.get(category, 0.0)
+            + self.country_weights.get(country, 0.0)
+        )
+        z = min(max(z, -30.0), 30.0)
+        return 1.0 / (1.0 + math.exp(-z))
+
+    def base_rate(self, category: str) -> float | None:
+        return self.category_base_rates.get(category)
+
+@functools.lru_cache(maxsize=1)
+def _load_what_if_cached(path: str, mtime: float) -> WhatIfPredictor:
+    return WhatIfPredictor(_load_model_cached(path, mtime))
+
+def load_what_if_predictor(path: str = WHAT_IF_MODEL_PATH) -> WhatIfPredictor:
+    return _load_what_if_cached(os.path.abspath(path), os.path.getmtime(path))
+
+if __name__ == "__main__":
+    source_path = sys.argv[1] if len(sys.argv) > 1 else os.environ.get("EXPLORER_DATA_PATH", "data.parquet")
+    target_path = sys.argv[2] if len(sys.argv) > 2 else MODEL_PATH
+    what_if_path = sys.argv[3] if len(sys.argv) > 3 else WHAT_IF_MODEL_PATH
+    train(scan_source(source_path)).save(target_path)
+    train(scan_source(source_path), features=PRE_LAUNCH_FEATURES).save(what_if_path)
+    print(f"Saved success models trained on '{source_path}' to '{target_path}' and '{what_if_path}'.")
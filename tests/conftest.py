@@ -0,0 +1,16 @@
+import os
+
+import polars as pl
+import pytest
+
+from benchmarks.synthetic_data import _load_vocabularies, generate_chunk
+
+METADATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'filter_metadata.json')
+
+def synthetic_projects(n_rows: int, seed: int = 0) -> pl.DataFrame:
+    categories, subcategory_map, countries = _load_vocabularies(METADATA_PATH)
+    return generate_chunk(0, n_rows, seed, categories, subcategory_map, countries)
+
+@pytest.fixture(scope='session')
+def projects() -> pl.DataFrame:
+    return synthetic_projects(20_000)
@@ -0,0 +1,172 @@
+import ast
+import json
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import polars as pl
+import pytest
+
+from client_snapshot import encode_snapshot, snapshot_query
+from conftest import synthetic_projects
+from query_engine import ROW_ID_COLUMN, SORT_COLUMNS, facet_counts, facet_query, fetch_page, scan_source
+
+EXPLORER_PATH = os.path.join(os.path.dirname(__file__), '..', 'Data_Explorer.py')
+PAGE_SIZE = 10
+
+DEFAULT_FILTERS = {
+    'search': '',
+    'categories': ['All Categories'],
+    'subcategories': ['All Subcategories'],
+    'countries': ['All Countries'],
+    'states': ['All States'],
+    'date': 'All Time',
+    'ranges': {
+        'pledged': {'min': 0, 'max': float('inf')},
+        'goal': {'min': 0, 'max': float('inf')},
+        'raised': {'min': 0, 'max': float('inf')},
+        'predicted': {'min': 0, 'max': 100},
+    },
+}
+
+# Names whose case folding differs between engines if the browser's search is not a literal, case-insensitive match.
+TRICKY_NAMES = ['Café Straße', 'İstanbul Kitchen', 'STRASSE Board', 'Kelvin K Lamp', 'ǅemal Dance', 'Ǆ Journal', 'Œuvre Art', 'Σίσυφος Game', 'Loſt Forest']
+
+def _with(**changes) -> dict:
+    filters = json.loads(json.dumps(DEFAULT_FILTERS))
+    for key, value in changes.items():
+        if key == 'ranges':
+            filters['ranges'].update(value)
+        else:
+            filters[key] = value
+    return filters
+
+# (snapshot filters, narrower filters the browser is expected to serve itself)
+CASES = {
+    'search': (_with(), _with(search='board')),
+    'search_upper_case': (_with(), _with(search='BOARD')),
+    'search_narrows_search': (_with(search='game'), _with(search='board game')),
+    'search_accent': (_with(), _with(search='é')),
+    'search_sharp_s': (_with(), _with(search='straße')),
+    'search_ss': (_with(), _with(search='ss')),
+    'search_dotted_i': (_with(), _with(search='istanbul')),
+    'search_kelvin': (_with(), _with(search='k lamp')),
+    'search_titlecase_digraph': (_with(), _with(search='ǆ')),
+    'search_sigma': (_with(), _with(search='σίσυφοσ')),
+    'search_final_sigma': (_with(), _with(search='ΣΊΣΥΦΟΣ')),
+    'search_narrows_folded_search': (_with(search='σίσυφος'), _with(search='ΣΊΣΥΦΟΣ game')),
+    'search_long_s': (_with(), _with(search='lost')),
+    'search_space': (_with(), _with(search=' ')),
+    'category': (_with(), _with(categories=['Games', 'Music'])),
+    'states_lower_case': (_with(), _with(states=['successful'])),
+    'country_subset': (_with(countries=['United States', 'Canada']), _with(countries=['Canada'])),
+    'goal_range': (_with(), _with(ranges={'goal': {'min': 1000, 'max': 10000}})),
+    'pledged_inside_pledged': (
+        _with(ranges={'pledged': {'min': 100, 'max': 50000}}), _with(ranges={'pledged': {'min': 250.5, 'max': 20000}})
+    ),
+    'predicted': (_with(), _with(ranges={'predicted': {'min': 30, 'max': 60}})),
+    'date': (_with(), _with(date='Last 5 Years')),
+    'combined': (
+        _with(), _with(search='the', categories=['Games', 'Technology', 'Art'], ranges={'raised': {'min': 50, 'max': 300}})
+    ),
+}
+
+# Changes the browser must send to the server instead.
+NOT_COVERED = {
+    'regex': (_with(), _with(search='board|card')),
+    'wider_search': (_with(search='game'), _with(search='gam')),
+    'other_category': (_with(categories=['Games']), _with(categories=['Music'])),
+    'all_categories': (_with(categories=['Games']), _with()),
+    'wider_range': (
+        _with(ranges={'pledged': {'min': 100, 'max': 50000}}), _with(ranges={'pledged': {'min': 0, 'max': 50000}})
+    ),
+    'longer_date': (_with(date='Last 5 Years'), _with()),
+    'wider_search_after_fold': (_with(search='σίσυφος'), _with(search='σίσυφ')),
+}
+
+def _page_source() -> str:
+    with open(EXPLORER_PATH, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and 'function clientFilterEngine()' in node.value:
+            return node.value
+    raise AssertionError("The table component's page source was not found in Data_Explorer.py.")
+
+def _extract(source: str, start: str, end: str) -> str:
+    begin = source.index(start)
+    return source[begin:source.index(end, begin) + len(end)]
+
+def _run_browser_code(snapshot: dict, requests: list[dict]) -> list[dict]:
+    page = _page_source()
+    engine = _extract(page, 'function clientFilterEngine() {', '\nconst foldCase = clientFilterEngine().foldCase;\n')
+    covered = _extract(page, '    _coveredBySnapshot(filters) {', '\n    }\n')
+    # Object literals are valid JavaScript, and the payload may hold Infinity as the component's JSON does not.
+    script = f"""
+{engine}
+const snapshot = {json.dumps(snapshot)};
+const component = {{
+    snapshot: {{ id: snapshot.id, filters: snapshot.filters, registry: snapshot.registry, dateCutoffs: snapshot.date_cutoffs }},
+{covered}
+}};
+const engine = clientFilterEngine();
+engine.load(JSON.parse(JSON.stringify(snapshot)));
+const results = {json.dumps(requests)}.map(request => ({{
+    covered: component._coveredBySnapshot(request.filters),
+    result: engine.query(request),
+}}));
+console.log(JSON.stringify(results));
+""".replace('NaN', 'null')
+    completed = subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+@pytest.fixture(scope='module')
+def source_lf(tmp_path_factory):
+    projects = synthetic_projects(400, seed=5)
+    names = projects['Project Name'].to_list()
+    for i, name in enumerate(TRICKY_NAMES):
+        names[i * 7] = name
+    rng = np.random.default_rng(5)
+    projects = projects.with_columns(
+        pl.Series('Project Name', names),
+        pl.Series('Predicted Success', rng.random(projects.height), dtype=pl.Float32),
+    )
+    path = str(tmp_path_factory.mktemp('snapshot') / 'data.parquet')
+    projects.write_parquet(path)
+    return scan_source(path)
+
+def _snapshot(lf: pl.LazyFrame, filters: dict) -> dict:
+    df = snapshot_query(lf, filters).collect()
+    assert not df.is_empty()
+    # The rendered cells are not under test; one cell per row identifies it.
+    return encode_snapshot(df, [{'cells': [str(row_id)]} for row_id in df[ROW_ID_COLUMN]], filters)
+
+def _requests(filters: dict) -> list[dict]:
+    return [
+        {'id': i, 'filters': filters, 'sort_order': sort_order, 'page': page, 'page_size': PAGE_SIZE}
+        for i, (sort_order, page) in enumerate((s, p) for s in SORT_COLUMNS for p in (1, 2))
+    ]
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="needs Node.js to run the component's filter code")
+@pytest.mark.parametrize('case', list(CASES))
+def test_browser_serves_the_same_rows_as_apply_filters(source_lf, case):
+    outer, filters = CASES[case]
+    requests = _requests(filters)
+    results = _run_browser_code(_snapshot(source_lf, outer), requests)
+
+    expected_facets = facet_counts(facet_query(source_lf, filters).collect())
+    for request, local in zip(requests, results):
+        assert local['covered'], "the browser should serve this narrowing itself"
+        total_rows, page, df_page = fetch_page(source_lf, filters, request['sort_order'], request['page'], PAGE_SIZE)
+        result = local['result']
+        assert (result['total'], result['page']) == (total_rows, page), request['sort_order']
+        assert [row['id'] for row in result['rows']] == (df_page[ROW_ID_COLUMN].to_list() if not df_page.is_empty() else [])
+        for key, counts in result['facet_counts'].items():
+            assert counts == {option: count for option, count in expected_facets[key].items()}, key
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="needs Node.js to run the component's filter code")
+@pytest.mark.parametrize('case', list(NOT_COVERED))
+def test_browser_sends_wider_or_regex_filters_to_the_server(source_lf, case):
+    outer, filters = NOT_COVERED[case]
+    [local] = _run_browser_code(_snapshot(source_lf, outer), _requests(filters)[:1])
+    assert not local['covered']
@@ -0,0 +1,41 @@
+import datetime
+
+import polars as pl
+import pytest
+
+from conftest import synthetic_projects
+from olap_cube import SummaryCube, build_cube, explorer_slices
+from query_engine import apply_filters
+
+BASE_FILTERS = {
+    'search': '',
+    'categories': ['All Categories'],
+    'subcategories': ['All Subcategories'],
+    'countries': ['All Countries'],
+    'states': ['All States'],
+    'date': 'All Time',
+    'ranges': {},
+}
+
+@pytest.fixture(scope='module')
+def older_projects() -> pl.DataFrame:
+    # Launched more than a year ago, with every tenth launch date missing.
+    cutoff = datetime.datetime.now() - datetime.timedelta(days=400)
+    projects = synthetic_projects(2000, seed=3).filter(pl.col('Raw Date') < cutoff)
+    return projects.with_columns(
+        pl.when(pl.int_range(pl.len()) % 10 == 0).then(None).otherwise(pl.col('Raw Date')).alias('Raw Date')
+    )
+
+def _cube_totals(projects: pl.DataFrame, filters: dict, group_by: list[str]) -> int:
+    cube = SummaryCube(build_cube(projects.lazy()))
+    return cube.query(group_by, explorer_slices(cube, filters))['Projects'].sum()
+
+@pytest.mark.parametrize('group_by', [[], ['Category'], ['Launch Month']])
+def test_date_preset_matching_no_months_matches_no_projects(older_projects, group_by):
+    filters = {**BASE_FILTERS, 'date': 'Last Year'}
+    assert older_projects['Raw Date'].null_count() > 0
+    assert apply_filters(older_projects.lazy(), filters).select(pl.len()).collect().item() == 0
+    assert _cube_totals(older_projects, filters, group_by) == 0
+
+def test_all_time_includes_undated_projects(older_projects):
+    assert _cube_totals(older_projects, BASE_FILTERS, ['Launch Month']) == older_projects.height
@@ -0,0 +1,38 @@
+import pytest
+
+from query_scheduler import BACKGROUND, EXPORT, INTERACTIVE, QueryScheduler, QueryTimeout
+
+@pytest.mark.parametrize('max_concurrent', [1, 2, 4])
+def test_export_never_takes_the_last_interactive_slot(max_concurrent):
+    scheduler = QueryScheduler(max_concurrent)
+    held = 0
+    while True:
+        try:
+            scheduler.acquire(EXPORT, timeout=0.05)
+        except QueryTimeout:
+            break
+        held += 1
+    assert held == max(1, max_concurrent - 1)
+    with pytest.raises(QueryTimeout):
+        scheduler.acquire(BACKGROUND, timeout=0.05)
+    assert scheduler.acquire(INTERACTIVE, timeout=0.05) == pytest.approx(0.0, abs=0.05)
+
+def test_release_frees_a_shared_slot():
+    scheduler = QueryScheduler(2)
+    with scheduler.slot(EXPORT):
+        with pytest.raises(QueryTimeout):
+            scheduler.acquire(EXPORT, timeout=0.05)
+    with scheduler.slot(EXPORT, timeout=0.05):
+        assert scheduler.metrics()['running'] == 1
+    assert scheduler.metrics()['running'] == 0
+
+def test_single_slot_admits_one_interactive_collect_when_nothing_else_runs():
+    scheduler = QueryScheduler(1)
+    with scheduler.slot(INTERACTIVE):
+        with pytest.raises(QueryTimeout):
+            scheduler.acquire(INTERACTIVE, timeout=0.05)
+    with scheduler.slot(EXPORT):
+        with scheduler.slot(INTERACTIVE, timeout=0.05):
+            assert scheduler.metrics()['running'] == 2
+            with pytest.raises(QueryTimeout):
+                scheduler.acquire(INTERACTIVE, timeout=0.05)
@@ -0,0 +1,47 @@
+import os
+import threading
+
+import pytest
+
+from conftest import synthetic_projects
+from prediction_store import attach_predictions, score_incrementally
+from query_engine import ROW_ID_COLUMN, fetch_page, scan_source
+from query_service import QueryServer, QueryServiceClient, load_dataset
+from success_model import train
+
+FILTERS = {
+    'search': '',
+    'categories': ['All Categories'],
+    'subcategories': ['All Subcategories'],
+    'countries': ['All Countries'],
+    'states': ['All States'],
+    'date': 'All Time',
+    'ranges': {'predicted': {'min': 40, 'max': 100}},
+}
+
+@pytest.fixture
+def scored_source(tmp_path):
+    data_path = str(tmp_path / 'data.parquet')
+    model_path = str(tmp_path / 'model.npz')
+    projects = synthetic_projects(2_000)
+    projects.write_parquet(data_path)
+    train(projects.lazy(), epochs=20).save(model_path)
+    score_incrementally(data_path, model_path)
+    return data_path
+
+def test_service_sorts_and_filters_by_predicted_success(scored_source, tmp_path):
+    in_process = fetch_page(attach_predictions(scan_source(scored_source), scored_source), FILTERS, 'predicted', 2, 10)
+    assert 0 < in_process[0] < 2_000
+
+    socket_path = str(tmp_path / 'query.sock')
+    with QueryServer(socket_path, load_dataset(scored_source), 2) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            served = QueryServiceClient(socket_path).fetch_page(FILTERS, 'predicted', 2, 10)
+        finally:
+            server.shutdown()
+            os.unlink(socket_path)
+
+    assert served[:2] == in_process[:2]
+    assert served[2][ROW_ID_COLUMN].to_list() == in_process[2][ROW_ID_COLUMN].to_list()
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from conftest import synthetic_projects
+from similar_projects import StaleIndexError, build_source_index, index_path, load_index
+
+def _write_source(path, n_rows, seed):
+    synthetic_projects(n_rows, seed).write_parquet(path)
+
+def test_index_lives_next_to_its_source(tmp_path):
+    assert index_path(str(tmp_path / 'data.parquet')) == str(tmp_path / 'similar_index.npz')
+
+def test_stale_index_is_reported_not_rebuilt(tmp_path):
+    data_path = str(tmp_path / 'data.parquet')
+    _write_source(data_path, 500, seed=0)
+    build_source_index(data_path, use_names=False).save(index_path(data_path))
+    assert load_index(data_path).source_rows == 500
+
+    _write_source(data_path, 800, seed=1)
+    os.utime(data_path, (os.path.getmtime(data_path) + 10, os.path.getmtime(data_path) + 10))
+    index_mtime = os.path.getmtime(index_path(data_path))
+    with pytest.raises(StaleIndexError):
+        load_index(data_path)
+    assert os.path.getmtime(index_path(data_path)) == index_mtime
+
+    build_source_index(data_path, use_names=False).save(index_path(data_path))
+    index = load_index(data_path)
+    assert index.source_rows == 800
+    assert index.source_mtime == pytest.approx(os.path.getmtime(data_path))
+    assert sorted(index.row_ids.tolist()) == list(range(800))
+
+def test_save_leaves_no_temporary_file(tmp_path):
+    data_path = str(tmp_path / 'data.parquet')
+    _write_source(data_path, 200, seed=2)
+    build_source_index(data_path, use_names=False).save(index_path(data_path))
+    assert sorted(os.listdir(tmp_path)) == ['data.parquet', 'similar_index.npz']
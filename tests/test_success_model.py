@@ -0,0 +1,23 @@
+import polars as pl
+import pytest
+
+from success_model import FINISHED_STATES, PRE_LAUNCH_FEATURES, SuccessModel, WhatIfPredictor, train
+
+def test_what_if_scores_typical_project_near_base_rate(projects):
+    finished = projects.filter(pl.col('State').str.to_lowercase().is_in(FINISHED_STATES))
+    base_rate = (finished['State'] == 'Successful').mean()
+    predictor = WhatIfPredictor(train(projects.lazy(), features=PRE_LAUNCH_FEATURES))
+
+    category = finished['Category'].mode()[0]
+    for goal in (500, 5_000, 50_000):
+        probability = predictor.predict_one(goal, category, 'United States', 30)
+        assert abs(probability - base_rate) < 0.1
+
+def test_what_if_rejects_model_trained_on_backers(projects):
+    with pytest.raises(ValueError):
+        WhatIfPredictor(train(projects.lazy(), epochs=5))
+
+def test_saved_model_keeps_its_features(projects, tmp_path):
+    model = train(projects.lazy(), epochs=5, features=PRE_LAUNCH_FEATURES)
+    model.save(str(tmp_path / 'model.npz'))
+    assert SuccessModel.load(str(tmp_path / 'model.npz')).features == PRE_LAUNCH_FEATURES